@@ -6,15 +6,17 @@ import plotly.graph_objects as go
 from datetime import datetime
 from pathlib import Path
 import sys
-import json
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from scripts.email_alerts import send_crash_alerts
+from services import pipeline_jobs
+from services.data_service import get_data_service
 
-# Paths
-DATA_DIR = Path(__file__).parent.parent / 'data' / 'processed'
-RESULTS_FILE = Path(__file__).parent.parent / 'pipeline_results.json'
+JOB_POLL_SECONDS = 2
+
+# Shared by every session and page; reloads an output only when it changed
+service = get_data_service()
 
 st.set_page_config(
     page_title="🌙 Astro Finance ML",
@@ -46,54 +48,69 @@ st.markdown('<div class="main-header"><h1 class="hero-title">🌙 Astro Finance
 with st.sidebar:
     st.markdown("### ⚙️ Control Panel")
     
-    if st.button("🔄 Run Full Pipeline", use_container_width=True):
-        st.info("Running pipeline... Check console for progress")
-        import subprocess
-        result = subprocess.run([sys.executable, "scripts/orchestrate.py"], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            st.success("✅ Pipeline completed!")
+    job = pipeline_jobs.latest_job()
+    running = job is not None and job['state'] in pipeline_jobs.ACTIVE_STATES
+    
+    # Runs in the background: the session stays responsive and other sessions share the job
+    if st.button("🔄 Run Full Pipeline", use_container_width=True, disabled=running):
+        job = pipeline_jobs.start_pipeline()
+        if not job['started']:
+            st.info(f"Pipeline already running (job {job['id']})")
+        running = True
+    
+    # Polls only while a job is running; the finished state triggers one full rerun
+    @st.fragment(run_every=JOB_POLL_SECONDS if running else None)
+    def pipeline_job_status():
+        job = pipeline_jobs.latest_job()
+        if job is None:
+            return
+        if job['state'] in pipeline_jobs.ACTIVE_STATES:
+            st.session_state['pipeline_job_running'] = job['id']
+            done = ", ".join(job['stages']) or "starting"
+            st.info(f"⏳ Pipeline running (job {job['id']}): {done}")
+            st.code("\n".join(pipeline_jobs.tail_log(job['id'], 8)), language=None)
+        elif st.session_state.pop('pipeline_job_running', None) == job['id']:
+            # Just finished: rerun the page (new outputs are picked up) and stop polling
             st.rerun()
-        else:
-            st.error(f"❌ Pipeline failed: {result.stderr}")
+        elif job['state'] != 'succeeded':
+            st.error(f"❌ Job {job['id']} {job['state']} (exit code {job.get('returncode')})")
+            with st.expander("Log"):
+                st.code("\n".join(pipeline_jobs.tail_log(job['id'], 40)), language=None)
+    
+    pipeline_job_status()
     
     st.markdown("---")
     
     # Check pipeline status
-    if RESULTS_FILE.exists():
-        with open(RESULTS_FILE, 'r') as f:
-            results = json.load(f)
-        
+    results = service.pipeline_results()
+    if results:
         if results['success']:
             st.success("✅ Pipeline: SUCCESS")
         else:
             st.error("❌ Pipeline: FAILED")
         
         st.caption(f"Last run: {results['timestamp'][:10]}")
+        if results.get('cache_hits'):
+            st.caption(f"{len(results['cache_hits'])}/{len(results['stages'])} stages up to date, not rerun")
+
+    reads = service.stats['hits'] + service.stats['loads']
+    if reads:
+        st.caption(f"Data cache: {service.stats['hits'] / reads:.0%} of {reads:,} reads served from memory")
 
 # Main content
 st.markdown("---")
 
-# Load data
-@st.cache_data(ttl=300)
+# Load data (one shared copy per server process, parsed once per pipeline output version)
 def load_data():
     data = {}
     
-    # Events
-    events_file = DATA_DIR / 'planetary_events_calendar.csv'
-    if events_file.exists():
-        data['events'] = pd.read_csv(events_file)
-    
-    # Predictions
-    pred_file = DATA_DIR / 'predictions_future_90d.csv'
-    if pred_file.exists():
-        data['predictions'] = pd.read_csv(pred_file)
-    
-    # Outlook
-    outlook_file = DATA_DIR / 'market_outlook_2025.json'
-    if outlook_file.exists():
-        with open(outlook_file, 'r') as f:
-            data['outlook'] = json.load(f)
+    # Events and predictions (memory-mapped Arrow IPC published by the pipeline) and the outlook
+    for key, accessor in [('events', service.events), ('predictions', service.predictions),
+                          ('outlook', lambda: service.outlook(2025))]:
+        try:
+            data[key] = accessor()
+        except FileNotFoundError:
+            pass
     
     return data
 
@@ -7,12 +7,14 @@ import plotly.express as px
 from datetime import datetime, timedelta
 import sys
 from pathlib import Path
-import json
 import numpy as np
 import hashlib
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from services.data_service import get_data_service
+from services.quote_service import get_quote_service
+
 # Page config
 st.set_page_config(
     page_title="🌙 Astro Finance ML - AI Stock Market Crash Predictor", 
@@ -150,8 +152,7 @@ st.markdown("---")
 def calculate_crash_score():
     """Calculate current crash risk score based on active planetary aspects"""
     try:
-        events_df = pd.read_csv('planetary_events_calendar.csv')
-        events_df['date'] = pd.to_datetime(events_df['date'])
+        events_df = get_data_service().events()
         
         today = datetime.now()
         upcoming = events_df[
@@ -189,8 +190,7 @@ def calculate_crash_score():
 def get_next_major_event():
     """Get next CRITICAL or HIGH severity event with countdown"""
     try:
-        events_df = pd.read_csv('planetary_events_calendar.csv')
-        events_df['date'] = pd.to_datetime(events_df['date'])
+        events_df = get_data_service().events()
         
         today = datetime.now()
         future_events = events_df[events_df['date'] > today]
@@ -294,17 +294,14 @@ def save_email_subscriber(email):
 def get_stock_prediction(symbol):
     """Get prediction for specific stock"""
     try:
-        import yfinance as yf
+        # Shared quote cache (prefetch a whole watchlist with get_quotes first)
+        quote = get_quote_service().get_quote(symbol)
         
-        # Get stock data
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period="30d")
-        
-        if hist.empty:
+        if quote is None:
             return None
         
-        current_price = float(hist['Close'].iloc[-1])
-        change_30d = ((current_price - float(hist['Close'].iloc[0])) / float(hist['Close'].iloc[0])) * 100
+        current_price = quote['price']
+        change_30d = quote['change']
         
         # Combine with crash score for prediction
         crash_score, _, _ = calculate_crash_score()
@@ -533,6 +530,7 @@ if page == "🏠 Dashboard":
         watchlist_preview = st.session_state.watchlist
     
     watchlist_cols = st.columns(len(watchlist_preview))
+    get_quote_service().get_quotes(watchlist_preview)
     
     for idx, symbol in enumerate(watchlist_preview):
         with watchlist_cols[idx]:
@@ -576,6 +574,7 @@ elif page == "📌 My Watchlist":
     
     # Display watchlist with predictions
     if st.session_state.watchlist:
+        get_quote_service().get_quotes(st.session_state.watchlist)
         for symbol in st.session_state.watchlist:
             pred = get_stock_prediction(symbol)
             
@@ -643,8 +642,7 @@ elif page == "⏱️ Crash Countdown":
     st.markdown("---")
     
     try:
-        events_df = pd.read_csv('planetary_events_calendar.csv')
-        events_df['date'] = pd.to_datetime(events_df['date'])
+        events_df = get_data_service().events()
         
         today = datetime.now()
         future_events = events_df[events_df['date'] > today]
@@ -719,8 +717,7 @@ elif page == "🔮 Future Predictions":
         st.warning("⚠️ Free users get 7-day predictions. Upgrade to Premium for 90-day forecasts!")
     
     try:
-        predictions_df = pd.read_csv('predictions_future_90d.csv')
-        predictions_df['date'] = pd.to_datetime(predictions_df['date'])
+        predictions_df = get_data_service().predictions()
         
         # Limit to 7 days for free users
         if not st.session_state.is_premium:
@@ -752,8 +749,12 @@ elif page == "🔮 Future Predictions":
             line=dict(color='#667eea', width=3)
         ))
         
-        upper_band = predictions_df['predicted_price'] * (1 + predictions_df['confidence'] * 0.1)
-        lower_band = predictions_df['predicted_price'] * (1 - predictions_df['confidence'] * 0.1)
+        if {'p05', 'p95'}.issubset(predictions_df.columns):
+            # Monte Carlo 90% band
+            upper_band, lower_band = predictions_df['p95'], predictions_df['p05']
+        else:
+            upper_band = predictions_df['predicted_price'] * (1 + predictions_df['confidence'] * 0.1)
+            lower_band = predictions_df['predicted_price'] * (1 - predictions_df['confidence'] * 0.1)
         
         fig.add_trace(go.Scatter(
             x=predictions_df['date'], y=upper_band,
@@ -1100,8 +1101,7 @@ elif page == "📅 2025 Outlook":
     st.header("📅 2025 Market Outlook")
     
     try:
-        with open('market_outlook_2025.json', 'r') as f:
-            outlook = json.load(f)
+        outlook = get_data_service().outlook(2025)
         
         st.success("✅ 2025 outlook loaded!")
         st.info("See full outlook details in previous version")
@@ -2,10 +2,14 @@
 import streamlit as st
 from datetime import datetime, timedelta
 from utils.data_loader import DataLoader
+from services.data_service import get_data_service
 
-@st.cache_data(ttl=60)
 def get_cached_crash_score():
-    """Get cached crash score"""
+    """Get cached crash score (recomputed when the events are republished or the day changes)"""
+    return _cached_crash_score(get_data_service().version('planetary_events'), datetime.now().date())
+
+@st.cache_data(max_entries=8)
+def _cached_crash_score(events_version, day):
     return calculate_crash_score()
 
 def calculate_crash_score():
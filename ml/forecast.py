@@ -0,0 +1,129 @@
+# ml/forecast.py - Vectorized Monte Carlo price paths conditioned on model probabilities
+import numpy as np
+import pandas as pd
+from statistics import NormalDist
+import logging
+
+logger = logging.getLogger(__name__)
+
+HORIZON_DAYS = 90
+N_PATHS = 10_000
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+PROBABILITY_HORIZON = 5     # trading days the model's P(up) refers to (djia_fwd_direction_5d)
+PROBABILITY_CLIP = (0.02, 0.98)
+VOL_LOOKBACK = 252          # trading days of history behind the base volatility/drift
+SIGNAL_HALF_LIFE = 10       # trading days over which the carried (market-driven) drift level decays halfway to the base drift
+
+# Volatility multiplier on trading days near a calendar event, by severity
+EVENT_VOL_MULTIPLIER = {'CRITICAL': 2.0, 'HIGH': 1.5, 'MEDIUM': 1.2, 'LOW': 1.1}
+EVENT_WINDOW_DAYS = 2       # calendar days either side of the event
+
+
+def base_volatility(closes, lookback: int = VOL_LOOKBACK) -> float:
+    """Daily log-return standard deviation over the most recent ``lookback`` closes"""
+    closes = np.asarray(closes, dtype=float)[-(lookback + 1):]
+    return float(np.diff(np.log(closes)).std(ddof=1))
+
+
+def base_drift(closes, lookback: int = VOL_LOOKBACK) -> float:
+    """Mean daily log return over the most recent ``lookback`` closes"""
+    closes = np.asarray(closes, dtype=float)[-(lookback + 1):]
+    return float(np.diff(np.log(closes)).mean())
+
+
+def signal_weights(days: int, half_life: float = SIGNAL_HALF_LIFE) -> np.ndarray:
+    """Weight of the carried drift level on each forecast day (1 on day one, halving every half_life)"""
+    return 0.5 ** (np.arange(days) / half_life)
+
+
+def event_vol_multiplier(dates, events: pd.DataFrame, window_days: int = EVENT_WINDOW_DAYS) -> np.ndarray:
+    """Per-day volatility multiplier: strongest event severity within ``window_days`` of each date"""
+    dates = pd.DatetimeIndex(dates).normalize()
+    if events is None or events.empty:
+        return np.ones(len(dates))
+    event_days = pd.to_datetime(events['date']).dt.normalize().values
+    factors = events['severity'].map(EVENT_VOL_MULTIPLIER).fillna(1.0).values
+    # (days × events) distance matrix: 90 × a few hundred at most
+    near = np.abs((dates.values[:, None] - event_days[None, :]) / np.timedelta64(1, 'D')) <= window_days
+    return np.where(near, factors[None, :], 1.0).max(axis=1, initial=1.0)
+
+
+def implied_drift(probability, vol, horizon: int = PROBABILITY_HORIZON) -> np.ndarray:
+    """
+    Daily log drift at which P(``horizon``-day return > 0) equals the model probability
+
+    With i.i.d. N(mu, vol²) daily log returns, P(up over h days) = Φ(mu·√h / vol),
+    so mu = vol · Φ⁻¹(p) / √h.
+    """
+    p = np.clip(np.asarray(probability, dtype=float), *PROBABILITY_CLIP)
+    z = np.vectorize(NormalDist().inv_cdf)(p)
+    return np.asarray(vol) * z / np.sqrt(horizon)
+
+
+def simulate_paths(last_price: float, drift, vol, n_paths: int = N_PATHS, seed: int = 42) -> np.ndarray:
+    """
+    Price paths as a (n_paths × days) array
+
+    Each day's log return is drawn from N(drift[t], vol[t]²); one normal
+    draw for the whole block and a cumulative sum along days, no Python loop.
+    """
+    drift = np.asarray(drift, dtype=float)
+    vol = np.broadcast_to(np.asarray(vol, dtype=float), drift.shape)
+    rng = np.random.default_rng(seed)
+    # Daily log returns, then cumulative log price relative to today, all in one buffer
+    paths = rng.standard_normal((n_paths, len(drift)))
+    paths *= vol
+    paths += drift
+    np.cumsum(paths, axis=1, out=paths)
+    np.exp(paths, out=paths)
+    paths *= last_price
+    return paths
+
+
+def quantile_bands(paths: np.ndarray, quantiles=QUANTILES) -> dict:
+    """{'p05': (days,), ...} price quantiles across paths for every day"""
+    values = np.quantile(paths, quantiles, axis=0)
+    return {f"p{round(q * 100):02d}": row for q, row in zip(quantiles, values)}
+
+
+def forecast_frame(dates, last_price: float, probability, vol, drift: float = 0.0,
+                   n_paths: int = N_PATHS, seed: int = 42) -> pd.DataFrame:
+    """
+    Daily forecast table from simulated paths
+
+    Args:
+        dates: Forecast trading days
+        last_price: Latest close
+        probability: Model P(up) per day (scalar or one value per date)
+        vol: Daily log-return volatility per day (scalar or per date)
+        drift: Base daily log drift the carried signal level decays towards
+
+    Returns:
+        date, predicted_price (median path), probability_up, direction,
+        confidence, quantile bands p05..p95 and prob_above_last (share of
+        paths above the latest close)
+    """
+    probability = np.broadcast_to(np.asarray(probability, dtype=float), (len(dates),))
+    vol = np.broadcast_to(np.asarray(vol, dtype=float), (len(dates),))
+
+    # The level shared by all days reflects the market state carried from the last bar, which
+    # says little about day 60: it fades towards the base drift. Day-to-day differences come
+    # from each day's own (ephemeris) features and are kept at full weight.
+    z = implied_drift(probability, 1.0, horizon=1)     # Φ⁻¹(p) per day
+    level = z.mean()
+    scale = vol / np.sqrt(PROBABILITY_HORIZON)
+    weights = signal_weights(len(dates))
+    daily_drift = drift + weights * (scale * level - drift) + scale * (z - level)
+    paths = simulate_paths(last_price, daily_drift, vol, n_paths, seed)
+    bands = quantile_bands(paths)
+
+    df = pd.DataFrame({
+        'date': pd.DatetimeIndex(dates),
+        'predicted_price': bands['p50'],
+        'probability_up': probability,
+        'direction': np.where(probability > 0.5, 'UP', 'DOWN'),
+        'confidence': np.maximum(probability, 1 - probability),
+        **{name: values for name, values in bands.items() if name != 'p50'},
+        'prob_above_last': (paths > last_price).mean(axis=0),
+    })
+    return df
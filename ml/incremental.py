@@ -0,0 +1,99 @@
+# ml/incremental.py - Warm-start model updates on data newer than the last training run
+import pandas as pd
+import logging
+
+from ml.walk_forward import _fold_metrics
+from ml.xgb_training import quantized_dmatrix, fit_booster, to_classifier
+
+logger = logging.getLogger(__name__)
+
+UPDATE_ROUNDS = 20          # boosting rounds appended per update
+FINE_TUNE_EPOCHS = 3
+FINE_TUNE_LR = 1e-4
+MIN_NEW_ROWS = 30           # below this there is nothing meaningful to validate on
+VALIDATION_FRACTION = 0.2   # most recent share of the new rows held out for the promotion gate
+LOOKBACK_DAYS = 90          # history loaded before the new rows (LSTM context, forward-fill seed)
+
+
+def split_new_rows(dates, trained_through):
+    """
+    Index ranges (update_start, val_start, end) of rows newer than the training window
+
+    The most recent VALIDATION_FRACTION of the new rows is held out so the
+    current and updated models are compared on data neither has seen.
+    Returns None when there are fewer than MIN_NEW_ROWS new rows.
+    """
+    dates = pd.to_datetime(pd.Series(dates))
+    update_start = int((dates <= pd.Timestamp(trained_through)).sum())
+    n_new = len(dates) - update_start
+    if n_new < MIN_NEW_ROWS:
+        return None
+    val_start = len(dates) - max(1, int(n_new * VALIDATION_FRACTION))
+    return update_start, val_start, len(dates)
+
+
+def _score(metrics: dict) -> float:
+    """Promotion criterion: validation log loss (1 - accuracy for single-class windows)"""
+    return metrics.get('log_loss', 1.0 - metrics['accuracy'])
+
+
+def update_xgboost(model, X, y, update_start: int, val_start: int, end: int,
+                   params: dict = None, rounds: int = UPDATE_ROUNDS) -> dict:
+    """
+    Append boosting rounds fitted on the new rows only
+
+    Returns:
+        {'model': candidate XGBClassifier, 'current': metrics, 'candidate': metrics, 'promote': bool}
+    """
+    X_val, y_val = X[val_start:end], y[val_start:end]
+    current = _fold_metrics(y_val, model.predict_proba(X_val)[:, 1])
+
+    dupdate = quantized_dmatrix(X, y, update_start, val_start)
+    booster = fit_booster(dupdate, {**(params or {}), 'n_estimators': rounds},
+                          xgb_model=model.get_booster())
+    candidate_model = to_classifier(booster)
+    candidate = _fold_metrics(y_val, candidate_model.predict_proba(X_val)[:, 1])
+
+    return {
+        'model': candidate_model,
+        'current': current,
+        'candidate': candidate,
+        'promote': _score(candidate) <= _score(current),
+    }
+
+
+def update_lstm(model, X_scaled, y, update_start: int, val_start: int, end: int, timesteps: int,
+                batch_size: int = 32, epochs: int = FINE_TUNE_EPOCHS) -> dict:
+    """
+    Fine-tune the LSTM in place on windows ending in the new rows
+
+    Windows start ``timesteps`` rows earlier so the first new rows get their
+    full context. The caller keeps the saved model if ``promote`` is False.
+    """
+    import tensorflow as tf
+    from ml.tf_dataset import window_dataset
+    from ml.windowing import window_targets
+
+    context_start = max(update_start - timesteps, 0)
+    val_context = max(val_start - timesteps, 0)
+    y_val = window_targets(y[val_context:end], timesteps)
+
+    def validate():
+        val_ds = window_dataset(X_scaled[val_context:end], None, timesteps, batch_size)
+        return _fold_metrics(y_val, model.predict(val_ds, verbose=0).flatten())
+
+    current = validate()
+
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=FINE_TUNE_LR),
+                  loss='binary_crossentropy', metrics=['accuracy'])
+    model.fit(window_dataset(X_scaled[context_start:val_start], y[context_start:val_start],
+                             timesteps, batch_size),
+              epochs=epochs, verbose=0)
+    candidate = validate()
+
+    return {
+        'model': model,
+        'current': current,
+        'candidate': candidate,
+        'promote': _score(candidate) <= _score(current),
+    }
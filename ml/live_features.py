@@ -0,0 +1,300 @@
+# ml/live_features.py - Incremental feature vectors for live bars, in training column order
+import numpy as np
+import pandas as pd
+from collections import deque
+import logging
+import re
+
+from utils.feature_store import read_features, feature_schema, select_feature_columns
+
+logger = logging.getLogger(__name__)
+
+# Mirrors scripts/compute_features.py
+PLANETS = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+ASPECTS = {'conjunction': 0, 'sextile': 60, 'square': 90, 'trine': 120, 'quincunx': 150, 'opposition': 180}
+ASPECT_ORB = 6.0
+RETRO_PLANETS = ['mercury', 'venus', 'mars', 'jupiter', 'saturn']
+INNER_PLANETS = ['mercury', 'venus']
+OUTER_PLANETS = ['mars', 'jupiter', 'saturn']
+BAR_COLS = ['open', 'high', 'low', 'close', 'volume']
+MACD_SPANS = {'fast': 12, 'slow': 26, 'signal': 9}
+BB_WINDOW = 20
+MOTION_WINDOW = 7
+
+BOOTSTRAP_DAYS = 400        # feature store history replayed to warm up rolling/EMA state
+
+_PLANET = '|'.join(PLANETS)
+_COLUMN_KINDS = [
+    ('bar', re.compile(r'^(open|high|low|close|volume)$')),
+    ('ephemeris', re.compile(rf'^(?:(?:{_PLANET})_(?:longitude|latitude|declination)|moon_phase)$')),
+    ('return', re.compile(r'^([a-z]+)_return_(\d+)d$')),
+    ('rolling', re.compile(r'^(close|volume)_(mean|std)_(\d+)d$')),
+    ('rsi', re.compile(r'^rsi_(\d+)_([a-z]+)$')),
+    ('macd', re.compile(r'^(macd|macd_signal|macd_hist)_([a-z]+)$')),
+    ('bb', re.compile(r'^bb_position_([a-z]+)$')),
+    ('aspect', re.compile(rf'^({_PLANET})_({_PLANET})_({"|".join(ASPECTS)})$')),
+    ('motion', re.compile(rf'^({_PLANET})_(retrograde|velocity|retro_duration|velocity_max_7d|velocity_min_7d)$')),
+    ('retro_total', re.compile(r'^(retrograde_count|inner_planets_retro|outer_planets_retro)$')),
+]
+
+
+def classify_column(col: str):
+    """(kind, regex groups) of a feature column; ('carried', ()) when it cannot be derived live"""
+    for kind, pattern in _COLUMN_KINDS:
+        match = pattern.match(col)
+        if match:
+            return kind, match.groups()
+    return 'carried', ()
+
+
+def _normalize_motion(delta: float) -> float:
+    return (delta + 180) % 360 - 180
+
+
+class _SymbolState:
+    """Rolling price state of one symbol (closes, volumes, RSI gains/losses, MACD EMAs)"""
+
+    def __init__(self, window: int, rsi_window: int):
+        self.closes = deque(maxlen=window)
+        self.volumes = deque(maxlen=window)
+        self.gains = deque(maxlen=rsi_window)
+        self.losses = deque(maxlen=rsi_window)
+        # pandas ewm(adjust=True) as running weighted sums: value = num / den
+        self.ema = {name: [0.0, 0.0] for name in MACD_SPANS}
+
+    def _ema_step(self, name: str, x: float) -> float:
+        decay = 1 - 2 / (MACD_SPANS[name] + 1)
+        state = self.ema[name]
+        state[0] = x + decay * state[0]
+        state[1] = 1 + decay * state[1]
+        return state[0] / state[1]
+
+    def push(self, bar: dict):
+        close = float(bar['close'])
+        delta = close - self.closes[-1] if self.closes else np.nan
+        # compute_features: delta.where(delta > 0, 0), so the first row counts as 0
+        self.gains.append(delta if delta > 0 else 0.0)
+        self.losses.append(-delta if delta < 0 else 0.0)
+        self.closes.append(close)
+        self.volumes.append(float(bar['volume']))
+
+        macd = self._ema_step('fast', close) - self._ema_step('slow', close)
+        signal = self._ema_step('signal', macd)
+        self.macd = {'macd': macd, 'macd_signal': signal, 'macd_hist': macd - signal}
+
+    def rolling(self, series: str, stat: str, window: int) -> float:
+        values = self.closes if series == 'close' else self.volumes
+        if len(values) < window:
+            return np.nan
+        tail = np.fromiter(values, float, len(values))[-window:]
+        return tail.mean() if stat == 'mean' else tail.std(ddof=1)
+
+    def pct_return(self, days: int) -> float:
+        if len(self.closes) <= days:
+            return np.nan
+        return self.closes[-1] / self.closes[-1 - days] - 1
+
+    def rsi(self, period: int) -> float:
+        if len(self.gains) < period:
+            return np.nan
+        gain = np.fromiter(self.gains, float, len(self.gains))[-period:].mean()
+        loss = np.fromiter(self.losses, float, len(self.losses))[-period:].mean()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return float(100 - 100 / (1 + np.float64(gain) / loss))
+
+    def bb_position(self) -> float:
+        mean = self.rolling('close', 'mean', BB_WINDOW)
+        std = self.rolling('close', 'std', BB_WINDOW)
+        return (self.closes[-1] - (mean - 2 * std)) / (4 * std)
+
+
+class LiveFeatureAssembler:
+    """
+    Keeps the rolling state behind every trained feature column and emits
+    the model input for each new bar
+
+    Rows are processed exactly as compute_features.py + training see them:
+    per-symbol indicators are only computed on that symbol's rows, motion
+    features are differences between consecutive rows, and every column is
+    forward-filled from earlier rows before the remaining gaps become 0.
+    Columns that cannot be derived from a bar and the ephemeris are carried
+    from the last stored row.
+    """
+
+    def __init__(self, feature_cols: list):
+        self.feature_cols = list(feature_cols)
+        self.date = None
+        self.symbol_order = []      # symbols of the last stored date, in stored row order
+        self._last = np.full(len(self.feature_cols), np.nan)
+        self._symbols = {}
+
+        self._plan = {}
+        for i, col in enumerate(self.feature_cols):
+            kind, groups = classify_column(col)
+            self._plan.setdefault(kind, []).append((i, col, groups))
+        if self._plan.get('carried'):
+            logger.warning(f"⚠️  {len(self._plan['carried'])} columns cannot be derived live and are carried: "
+                           f"{[col for _, col, _ in self._plan['carried']]}")
+
+        windows = [int(g[2]) for _, _, g in self._plan.get('rolling', [])]
+        windows += [int(g[1]) + 1 for _, _, g in self._plan.get('return', [])]
+        self._price_window = max(windows + [BB_WINDOW])
+        self._rsi_window = max([int(g[0]) for _, _, g in self._plan.get('rsi', [])] + [1])
+
+        # Motion state per planet: previous longitude, retrograde run length, recent velocities
+        self._longitude = {}
+        self._retro_run = dict.fromkeys(PLANETS, 0)
+        self._velocities = {p: deque(maxlen=MOTION_WINDOW) for p in PLANETS}
+
+    @property
+    def vector(self) -> np.ndarray:
+        """Current feature vector (1, n_features) float32, as training fills it"""
+        return np.nan_to_num(self._last, nan=0.0).astype(np.float32)[None, :]
+
+    def _symbol_state(self, symbol: str) -> _SymbolState:
+        if symbol not in self._symbols:
+            self._symbols[symbol] = _SymbolState(self._price_window, self._rsi_window)
+        return self._symbols[symbol]
+
+    def _advance(self, symbol: str, bar: dict, ephemeris: dict) -> np.ndarray:
+        """Values the new row itself defines (NaN where training leaves the row empty)"""
+        row = np.full(len(self.feature_cols), np.nan)
+        key = symbol.lower()
+        plan = self._plan
+
+        for i, col, _ in plan.get('bar', []):
+            row[i] = bar.get(col, np.nan)
+
+        if bar.get('close') is not None and not np.isnan(bar['close']):
+            state = self._symbol_state(key)
+            state.push(bar)
+            for i, _, (sym, days) in plan.get('return', []):
+                if sym == key:
+                    row[i] = state.pct_return(int(days))
+            for i, _, (series, stat, window) in plan.get('rolling', []):
+                row[i] = state.rolling(series, stat, int(window))
+            for i, _, (period, sym) in plan.get('rsi', []):
+                if sym == key:
+                    row[i] = state.rsi(int(period))
+            for i, _, (name, sym) in plan.get('macd', []):
+                if sym == key:
+                    row[i] = state.macd[name]
+            for i, _, (sym,) in plan.get('bb', []):
+                if sym == key:
+                    row[i] = state.bb_position()
+
+        if ephemeris is None:
+            return row
+
+        for i, col, _ in plan.get('ephemeris', []):
+            row[i] = ephemeris.get(col, np.nan)
+
+        for i, _, (p1, p2, aspect) in plan.get('aspect', []):
+            lon1 = ephemeris.get(f'{p1}_longitude', np.nan)
+            lon2 = ephemeris.get(f'{p2}_longitude', np.nan)
+            diff = np.abs(lon1 - lon2) % 360
+            row[i] = float(np.abs(min(diff, 360 - diff) - ASPECTS[aspect]) <= ASPECT_ORB)
+
+        motion = {}
+        for planet in PLANETS:
+            lon = ephemeris.get(f'{planet}_longitude')
+            if lon is None:
+                continue
+            previous = self._longitude.get(planet)
+            velocity = 0.0 if previous is None else _normalize_motion(lon - previous)
+            self._longitude[planet] = lon
+            retrograde = velocity < 0
+            self._retro_run[planet] = self._retro_run[planet] + 1 if retrograde else 0
+            self._velocities[planet].append(velocity)
+            recent = self._velocities[planet]
+            full = len(recent) == MOTION_WINDOW
+            motion[planet] = {
+                'retrograde': float(retrograde),
+                'velocity': velocity,
+                'retro_duration': float(self._retro_run[planet]),
+                'velocity_max_7d': max(recent) if full else np.nan,
+                'velocity_min_7d': min(recent) if full else np.nan,
+            }
+
+        for i, _, (planet, name) in plan.get('motion', []):
+            if planet in motion:
+                row[i] = motion[planet][name]
+
+        groups = {'retrograde_count': RETRO_PLANETS, 'inner_planets_retro': INNER_PLANETS,
+                  'outer_planets_retro': OUTER_PLANETS}
+        for i, col, _ in plan.get('retro_total', []):
+            if all(p in motion for p in groups[col]):
+                row[i] = sum(motion[p]['retrograde'] for p in groups[col])
+
+        return row
+
+    def update(self, symbol: str, bar: dict, ephemeris: dict = None, date=None) -> np.ndarray:
+        """
+        Advance the state by one bar and return its feature vector
+
+        Args:
+            symbol: Symbol of the bar ('DJIA', 'DXY', 'GOLD')
+            bar: open/high/low/close/volume
+            ephemeris: Planetary columns for the bar's date (``*_longitude``,
+                ``*_latitude``, ``*_declination``, ``moon_phase``); None keeps
+                the previous positions
+            date: Bar date (informational)
+
+        Returns:
+            (1, n_features) float32 vector in ``feature_cols`` order
+        """
+        row = self._advance(symbol, bar, ephemeris)
+        filled = ~np.isnan(row)
+        self._last[filled] = row[filled]
+        if date is not None:
+            self.date = pd.Timestamp(date)
+        return self.vector
+
+    def prime(self, df: pd.DataFrame):
+        """
+        Warm up from stored feature rows (date order, as training reads them)
+
+        Price state is rebuilt by replaying the bars; motion state follows the
+        stored longitudes. The fill state is then set to the stored row values
+        so carried columns start from exactly what training saw, and the last
+        date's symbol order is kept for replaying future dates.
+        """
+        lon_cols = [col for col in df.columns if col.endswith('_longitude')]
+        eph_cols = lon_cols + [col for _, col, _ in self._plan.get('ephemeris', []) if col in df.columns]
+        eph_cols = list(dict.fromkeys(eph_cols))
+
+        bar_cols = [col for col in BAR_COLS if col in df.columns]
+        bars = df[bar_cols].to_dict('records') if bar_cols else [{}] * len(df)
+        ephemeris = df[eph_cols].to_dict('records')
+        for symbol, bar, eph in zip(df['symbol'].astype(str), bars, ephemeris):
+            self._advance(symbol, bar, eph)
+
+        stored = df.reindex(columns=self.feature_cols).ffill()
+        self._last = stored.iloc[-1].to_numpy(dtype=float, copy=True)
+        self.date = pd.Timestamp(df['date'].iloc[-1])
+        last_rows = df['date'] == df['date'].iloc[-1]
+        self.symbol_order = list(dict.fromkeys(df.loc[last_rows, 'symbol'].astype(str)))
+
+        # Planets without stored longitudes: resume their retrograde runs from the stored durations
+        for planet in PLANETS:
+            col = f'{planet}_retro_duration'
+            if planet not in self._longitude and col in stored.columns and pd.notna(stored[col].iloc[-1]):
+                self._retro_run[planet] = int(stored[col].iloc[-1])
+
+        logger.info(f"✓ Live features primed on {len(df):,} rows through {self.date.date()}")
+        return self
+
+    @classmethod
+    def from_feature_store(cls, feature_cols: list = None, lookback_days: int = BOOTSTRAP_DAYS, end_date=None):
+        """Assembler warmed up on the last ``lookback_days`` of the feature store"""
+        schema = feature_schema()
+        feature_cols = feature_cols or select_feature_columns(schema)
+        if end_date is None:
+            end_date = read_features(['date'])['date'].max()
+        start_date = pd.Timestamp(end_date) - pd.Timedelta(days=lookback_days)
+
+        extra = [col for col in BAR_COLS + [f'{p}_longitude' for p in PLANETS] + ['symbol']
+                 if col in schema.names]
+        columns = list(dict.fromkeys(feature_cols + extra))
+        df = read_features(columns, start_date, end_date)
+        return cls(feature_cols).prime(df)
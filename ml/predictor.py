@@ -1,19 +1,139 @@
 # ml/predictor.py - Main Prediction Engine
 from utils.cache_manager import load_ml_models
+from ml.xgb_training import training_matrix, load_cached_symbols
+from utils.feature_store import feature_store_version
 import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMESTEPS = 30
+
+
+def locate_rows(row_symbols, row_dates, symbols, dates) -> np.ndarray:
+    """
+    Index of the latest feature row at or before each requested (symbol, date)
+
+    One searchsorted per distinct symbol; -1 where the symbol is unknown or
+    the date precedes its history.
+    """
+    symbols = np.asarray(symbols).astype(str)
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    rows = np.full(len(symbols), -1, dtype=np.int64)
+
+    for symbol in np.unique(symbols):
+        symbol_rows = np.flatnonzero(row_symbols == symbol)
+        if len(symbol_rows) == 0:
+            continue
+        mask = symbols == symbol
+        pos = np.searchsorted(row_dates[symbol_rows], dates[mask], side='right') - 1
+        rows[mask] = np.where(pos >= 0, symbol_rows[np.maximum(pos, 0)], -1)
+
+    return rows
+
 
 class MarketPredictor:
     """Main prediction engine"""
-    
-    def __init__(self):
-        self.models = load_ml_models()
-    
+
+    def __init__(self, models=None):
+        self.models = models or load_ml_models()
+        self._matrix = None
+        self._matrix_version = None
+
     def predict(self, features):
         """Generate prediction"""
         xgb_pred = self.models['xgboost'].predict_proba(features)[0, 1]
         return xgb_pred
-    
-    def predict_stock(self, symbol):
-        """Predict specific stock"""
-        # Implementation here
-        pass
+
+    def _feature_matrix(self):
+        """
+        Training-order feature matrix (memory-mapped from the cache) + row lookup arrays
+
+        Reloaded whenever the feature store version changes, so a long-lived
+        predictor scores the latest rows without a new model version.
+        """
+        store_version = feature_store_version()
+        if self._matrix is None or self._matrix_version != store_version:
+            X, _, dates, feature_cols, key = training_matrix()
+            model_cols = self.models.feature_cols or feature_cols
+            if model_cols != feature_cols:
+                # Registered model was trained on a different column order/subset
+                missing = [col for col in model_cols if col not in feature_cols]
+                if missing:
+                    raise ValueError(
+                        f"Model version {getattr(self.models, 'version', None) or 'legacy'} uses {len(missing)} column(s) "
+                        f"missing from the feature store: {', '.join(missing)}; retrain the models "
+                        f"or rebuild the features with the same selection")
+                position = {col: i for i, col in enumerate(feature_cols)}
+                X = X[:, [position[col] for col in model_cols]]
+            self._matrix = (X, dates.astype('datetime64[ns]'), load_cached_symbols(key))
+            self._matrix_version = store_version
+        return self._matrix
+
+    def _lstm_proba(self, X, rows, timesteps) -> np.ndarray:
+        """LSTM probability for each row: one predict call over the gathered windows"""
+        valid = rows >= timesteps
+        proba = np.full(len(rows), np.nan)
+        if not valid.any():
+            return proba
+        # Window for row r is the `timesteps` rows before it, as in training
+        window_rows = rows[valid][:, None] - timesteps + np.arange(timesteps)[None, :]
+        windows = self.models.scaler.transform(X[window_rows.ravel()])
+        windows = windows.reshape(len(window_rows), timesteps, X.shape[1]).astype(np.float32)
+        # Already a single batch: predict_on_batch skips predict()'s per-call dataset setup
+        proba[valid] = np.asarray(self.models.lstm.predict_on_batch(windows)).flatten()
+        return proba
+
+    def predict_batch(self, requests) -> pd.DataFrame:
+        """
+        Score many (symbol, date) requests with one call per model
+
+        Feature rows are gathered from the feature store with a vectorized
+        as-of lookup (latest row on or before each date), then scored by a
+        single XGBoost predict_proba and a single LSTM predict.
+
+        Args:
+            requests: DataFrame with 'symbol' and 'date' columns, or an
+                iterable of (symbol, date) pairs
+
+        Returns:
+            One row per request: symbol, date, feature_date, xgb_proba,
+            lstm_proba, ensemble_proba, signal
+        """
+        if not isinstance(requests, pd.DataFrame):
+            requests = pd.DataFrame(list(requests), columns=['symbol', 'date'])
+        requests = requests[['symbol', 'date']].reset_index(drop=True)
+        requests['date'] = pd.to_datetime(requests['date'])
+
+        X, row_dates, row_symbols = self._feature_matrix()
+        rows = locate_rows(row_symbols, row_dates, requests['symbol'].values, requests['date'].values)
+        found = rows >= 0
+
+        xgb_proba = np.full(len(rows), np.nan)
+        if found.any():
+            xgb_proba[found] = self.models.xgboost.predict_proba(X[rows[found]])[:, 1]
+
+        try:
+            timesteps = self.models.metadata.get('lstm_timesteps', DEFAULT_TIMESTEPS)
+            lstm_proba = self._lstm_proba(X, np.where(found, rows, -1), timesteps)
+        except Exception as e:
+            logger.warning(f"⚠️  LSTM unavailable, scoring with XGBoost only: {e}")
+            lstm_proba = np.full(len(rows), np.nan)
+
+        result = requests.assign(
+            feature_date=pd.to_datetime(np.where(found, row_dates[np.maximum(rows, 0)], np.datetime64('NaT'))),
+            xgb_proba=xgb_proba,
+            lstm_proba=lstm_proba,
+        )
+        result['ensemble_proba'] = result[['xgb_proba', 'lstm_proba']].mean(axis=1, skipna=True)
+        result['signal'] = np.select(
+            [result['ensemble_proba'] > 0.5, result['ensemble_proba'] <= 0.5],
+            ['UP', 'DOWN'], default='N/A'
+        )
+        return result
+
+    def predict_stock(self, symbol, date=None):
+        """Predict specific stock (latest available row when no date is given)"""
+        date = pd.Timestamp(date) if date is not None else pd.Timestamp.today().normalize()
+        return self.predict_batch([(symbol, date)]).iloc[0].to_dict()
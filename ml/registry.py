@@ -0,0 +1,203 @@
+# ml/registry.py - Versioned model registry with a lazily loaded, process-wide active model
+import joblib
+from pathlib import Path
+from datetime import datetime
+from functools import cached_property, lru_cache
+import json
+import logging
+import os
+import shutil
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+MODEL_DIR = PROJECT_ROOT / 'models'
+REGISTRY_DIR = MODEL_DIR / 'registry'
+
+ACTIVE_NAME = 'ACTIVE'
+METADATA_NAME = 'metadata.json'
+
+# Artifact name -> file inside a version directory
+ARTIFACT_FILES = {
+    'xgboost': 'xgboost_model.ubj',
+    'lstm': 'lstm_model.h5',
+    'scaler': 'lstm_scaler.pkl',
+}
+
+# Fixed paths written before the registry existed (used while it is empty)
+LEGACY_FILES = {
+    'xgboost': MODEL_DIR / 'xgboost_model.pkl',
+    'lstm': MODEL_DIR / 'lstm_model.h5',
+    'scaler': MODEL_DIR / 'lstm_scaler.pkl',
+}
+
+
+def list_versions(root=REGISTRY_DIR) -> list:
+    """Registered versions, oldest first"""
+    root = Path(root)
+    if not root.exists():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / METADATA_NAME).exists())
+
+
+def active_version(root=REGISTRY_DIR) -> str:
+    """Version the ACTIVE pointer names (None while the registry is empty)"""
+    active_file = Path(root) / ACTIVE_NAME
+    if not active_file.exists():
+        return None
+    return active_file.read_text().strip() or None
+
+
+def set_active(version: str, root=REGISTRY_DIR):
+    """Point ACTIVE at a registered version (atomic rename: readers never see a partial write)"""
+    root = Path(root)
+    if version not in list_versions(root):
+        raise ValueError(f"Unknown model version: {version}")
+    tmp_path = root / f".{ACTIVE_NAME}.{uuid.uuid4().hex}.tmp"
+    tmp_path.write_text(version)
+    os.replace(tmp_path, root / ACTIVE_NAME)
+    logger.info(f"✓ Active model version: {version}")
+
+
+def load_metadata(version: str = None, root=REGISTRY_DIR) -> dict:
+    """Metadata of a version (default: active; None if the registry is empty)"""
+    version = version or active_version(root)
+    if version is None:
+        return None
+    with open(Path(root) / version / METADATA_NAME, 'r') as f:
+        return json.load(f)
+
+
+def _allocate_version(root: Path) -> Path:
+    """Create the next vNNNN directory; mkdir is the lock between concurrent writers"""
+    root.mkdir(parents=True, exist_ok=True)
+    existing = [int(p.name[1:]) for p in root.iterdir() if p.name[:1] == 'v' and p.name[1:].isdigit()]
+    number = max(existing, default=0) + 1
+    while True:
+        directory = root / f"v{number:04d}"
+        try:
+            directory.mkdir()
+            return directory
+        except FileExistsError:
+            number += 1
+
+
+def register_models(metadata: dict, xgboost=None, lstm=None, scaler=None,
+                    activate: bool = True, root=REGISTRY_DIR) -> str:
+    """
+    Store a new model version and (by default) make it active
+
+    Artifacts that are not passed are carried over from the currently
+    active version (hard-linked when possible), so a partial update such
+    as a promoted XGBoost with an unchanged LSTM is still a complete version.
+
+    Args:
+        metadata: feature_cols, target_col, training window, metrics, params, ...
+        xgboost: XGBClassifier (saved in XGBoost's native UBJSON format)
+        lstm: Keras model
+        scaler: Fitted LSTM input scaler
+
+    Returns:
+        New version name
+    """
+    root = Path(root)
+    parent = active_version(root)
+    directory = _allocate_version(root)
+
+    if xgboost is not None:
+        xgboost.save_model(directory / ARTIFACT_FILES['xgboost'])
+    if lstm is not None:
+        lstm.save(directory / ARTIFACT_FILES['lstm'])
+    if scaler is not None:
+        joblib.dump(scaler, directory / ARTIFACT_FILES['scaler'])
+
+    for name, file_name in ARTIFACT_FILES.items():
+        target = directory / file_name
+        if target.exists() or parent is None:
+            continue
+        source = root / parent / file_name
+        if source.exists():
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+
+    metadata = {
+        **metadata,
+        'version': directory.name,
+        'parent': parent,
+        'created_at': datetime.now().isoformat(),
+        'artifacts': sorted(name for name, f in ARTIFACT_FILES.items() if (directory / f).exists()),
+    }
+    with open(directory / METADATA_NAME, 'w') as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+    logger.info(f"✓ Registered model version {directory.name}")
+    if activate:
+        set_active(directory.name, root)
+    return directory.name
+
+
+class ModelBundle:
+    """One model version; each artifact is loaded on first access and then kept"""
+
+    def __init__(self, version: str = None, root=REGISTRY_DIR):
+        self.version = version
+        self.root = Path(root)
+
+    def path(self, name: str) -> Path:
+        """Artifact file of this version (legacy fixed path for the pre-registry bundle)"""
+        if self.version is None:
+            return LEGACY_FILES[name]
+        return self.root / self.version / ARTIFACT_FILES[name]
+
+    @cached_property
+    def metadata(self) -> dict:
+        return load_metadata(self.version, self.root) if self.version else {}
+
+    @property
+    def feature_cols(self) -> list:
+        return self.metadata.get('feature_cols')
+
+    @cached_property
+    def xgboost(self):
+        if self.version is None:
+            return joblib.load(self.path('xgboost'))
+        import xgboost as xgb
+        model = xgb.XGBClassifier()
+        model.load_model(self.path('xgboost'))
+        return model
+
+    @cached_property
+    def lstm(self):
+        import tensorflow as tf
+        return tf.keras.models.load_model(self.path('lstm'), compile=False)
+
+    @cached_property
+    def scaler(self):
+        # Scaler statistics are mapped read-only instead of copied
+        return joblib.load(self.path('scaler'), mmap_mode='r')
+
+    def __getitem__(self, name: str):
+        return getattr(self, name)
+
+    def __repr__(self):
+        return f"ModelBundle({self.version or 'legacy'})"
+
+
+@lru_cache(maxsize=4)
+def _bundle(version: str, root: str) -> ModelBundle:
+    return ModelBundle(version, root)
+
+
+def get_models(version: str = None, root=REGISTRY_DIR) -> ModelBundle:
+    """
+    Process-wide bundle for a version (default: the active one)
+
+    Every caller in the process shares the same instance, so each model is
+    read from disk once. Re-activating another version is picked up on the
+    next call because the ACTIVE pointer is resolved every time.
+    """
+    return _bundle(version or active_version(root), str(root))
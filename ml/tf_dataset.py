@@ -0,0 +1,109 @@
+# ml/tf_dataset.py - Streaming tf.data input pipelines for LSTM training
+import numpy as np
+import tensorflow as tf
+
+from ml.windowing import sliding_windows, window_targets
+from utils.feature_store import forward_filled
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+def _block_shuffled_indices(n_windows: int, shuffle_block: int, seed: int) -> tf.data.Dataset:
+    """Window start indices, shuffled only inside consecutive time blocks"""
+    indices = tf.data.Dataset.range(n_windows)
+    if not shuffle_block:
+        return indices
+    return (
+        indices
+        .batch(shuffle_block)
+        .map(lambda block: tf.random.shuffle(block, seed=seed), num_parallel_calls=AUTOTUNE)
+        .unbatch()
+    )
+
+
+def window_dataset(X, y=None, timesteps: int = 30, batch_size: int = 32,
+                   shuffle_block: int = None, seed: int = 42) -> tf.data.Dataset:
+    """
+    Batched (timesteps, features) windows gathered on the fly from a 2-D matrix
+
+    The matrix is held once; each batch is assembled from window start indices
+    with a parallel gather and prefetched, so the sequence tensor is never
+    materialized. Window ``i`` covers ``X[i:i + timesteps]`` and is labelled
+    with ``y[i + timesteps]``, matching ml.windowing.sliding_windows.
+
+    Args:
+        X: Scaled feature matrix (rows in time order)
+        y: Targets aligned with X rows (None for inference)
+        timesteps: Window length
+        batch_size: Windows per batch
+        shuffle_block: Shuffle windows within blocks of this many windows (None = keep order)
+        seed: Shuffle seed
+    """
+    X = tf.constant(np.asarray(X, dtype=np.float32))
+    n_windows = max(int(X.shape[0]) - timesteps, 0)
+    offsets = tf.range(timesteps, dtype=tf.int64)
+
+    if y is not None:
+        y = tf.constant(np.asarray(y, dtype=np.float32))
+
+    def gather(starts):
+        rows = starts[:, None] + offsets[None, :]
+        windows = tf.gather(X, rows)
+        if y is None:
+            return windows
+        return windows, tf.gather(y, starts + timesteps)
+
+    return (
+        _block_shuffled_indices(n_windows, shuffle_block, seed)
+        .batch(batch_size)
+        .map(gather, num_parallel_calls=AUTOTUNE, deterministic=shuffle_block is None)
+        .prefetch(AUTOTUNE)
+    )
+
+
+def feature_store_window_dataset(chunks, feature_cols: list, target_col: str, scaler,
+                                 timesteps: int = 30, batch_size: int = 32,
+                                 shuffle_block: int = None, seed: int = 42) -> tf.data.Dataset:
+    """
+    Windowed dataset streamed from feature-store chunks (never fully in RAM)
+
+    ``chunks`` is a zero-argument callable returning an iterator of date-ordered
+    DataFrames (e.g. ``lambda: iter_feature_chunks(columns, ...)``) so every
+    epoch re-reads from disk. The last ``timesteps`` rows of each chunk are
+    carried into the next so windows spanning a chunk boundary are kept, and
+    forward-fill continues across chunks like the in-memory path.
+    """
+    n_features = len(feature_cols)
+
+    def generate():
+        rng = np.random.default_rng(seed)
+        carry_X = np.empty((0, n_features), dtype=np.float32)
+        carry_y = np.empty((0,), dtype=np.float32)
+
+        for df in forward_filled(chunks(), feature_cols):
+            X_chunk = scaler.transform(df[feature_cols].fillna(0).values).astype(np.float32)
+            y_chunk = df[target_col].fillna(0).values.astype(np.float32)
+
+            X_all = np.concatenate([carry_X, X_chunk])
+            y_all = np.concatenate([carry_y, y_chunk])
+            windows = sliding_windows(X_all, timesteps)
+            targets = window_targets(y_all, timesteps)
+
+            order = np.arange(len(windows))
+            if shuffle_block:
+                # Each chunk is a contiguous time block: shuffle inside it only
+                for start in range(0, len(order), shuffle_block):
+                    rng.shuffle(order[start:start + shuffle_block])
+
+            for start in range(0, len(order), batch_size):
+                idx = order[start:start + batch_size]
+                yield windows[idx], targets[idx]
+
+            carry_X = X_all[-timesteps:]
+            carry_y = y_all[-timesteps:]
+
+    signature = (
+        tf.TensorSpec(shape=(None, timesteps, n_features), dtype=tf.float32),
+        tf.TensorSpec(shape=(None,), dtype=tf.float32),
+    )
+    return tf.data.Dataset.from_generator(generate, output_signature=signature).prefetch(AUTOTUNE)
@@ -0,0 +1,215 @@
+# ml/tuning.py - Parallel hyperparameter search with successive-halving pruning
+import numpy as np
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+import math
+import multiprocessing as mp
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from ml.walk_forward import _init_worker, _run_fold, threads_per_worker
+from ml.xgb_training import XGB_PARAMS
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+TUNING_DIR = PROJECT_ROOT / 'models' / 'tuning'
+TRIALS_FILE = TUNING_DIR / 'trials.jsonl'
+BEST_PARAMS_FILE = TUNING_DIR / 'best_params.json'
+
+# name -> (kind, low, high) or ('choice', options)
+SEARCH_SPACES = {
+    'xgboost': {
+        'max_depth': ('int', 3, 8),
+        'learning_rate': ('log', 0.01, 0.3),
+        'subsample': ('float', 0.6, 1.0),
+        'colsample_bytree': ('float', 0.5, 1.0),
+        'min_child_weight': ('log', 1.0, 20.0),
+        'reg_lambda': ('log', 0.1, 10.0),
+    },
+    'lstm': {
+        'units': ('choice', [[32, 16], [64, 32], [128, 64]]),
+        'dropout': ('float', 0.1, 0.4),
+        'learning_rate': ('log', 1e-4, 3e-3),
+    },
+}
+
+# Resource grown between rungs: (parameter, smallest budget, largest budget)
+BUDGETS = {
+    'xgboost': ('n_estimators', 50, 450),
+    'lstm': ('epochs', 3, 27),
+}
+
+# Fixed settings carried into every trial
+BASE_PARAMS = {
+    'xgboost': {'random_state': XGB_PARAMS['random_state']},
+    'lstm': {},
+}
+
+
+def sample_params(space: dict, rng: np.random.Generator) -> dict:
+    """Draw one configuration from a search space"""
+    params = {}
+    for name, spec in space.items():
+        kind = spec[0]
+        if kind == 'int':
+            params[name] = int(rng.integers(spec[1], spec[2] + 1))
+        elif kind == 'float':
+            params[name] = float(rng.uniform(spec[1], spec[2]))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(spec[1]), np.log(spec[2]))))
+        elif kind == 'choice':
+            params[name] = spec[1][int(rng.integers(len(spec[1])))]
+        else:
+            raise ValueError(f"Unknown search dimension type: {kind}")
+    return params
+
+
+def rung_budgets(min_budget: int, max_budget: int, eta: int = 3) -> list:
+    """Geometric budget ladder min, min·eta, ... up to max"""
+    budgets = [min_budget]
+    while budgets[-1] * eta <= max_budget:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+
+def trial_score(fold_results: list) -> float:
+    """Mean validation log loss over folds (1 - accuracy when a fold is single-class)"""
+    losses = [r.get('log_loss', 1.0 - r['accuracy']) for r in fold_results]
+    return float(np.mean(losses))
+
+
+def append_trials(records: list, path=TRIALS_FILE):
+    """Append trial records to the JSON-lines results store"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        for record in records:
+            f.write(json.dumps(record) + '\n')
+
+
+def load_trials(path=TRIALS_FILE, study: str = None) -> list:
+    """Read trial records, optionally for one study"""
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, 'r') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [r for r in records if study is None or r['study'] == study]
+
+
+def load_best_params(model_name: str, path=BEST_PARAMS_FILE) -> dict:
+    """Best parameters found for a model (empty if it was never tuned)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f).get(model_name, {}).get('params', {})
+
+
+def _save_best(model_name: str, best: dict, path=BEST_PARAMS_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    current = {}
+    if path.exists():
+        with open(path, 'r') as f:
+            current = json.load(f)
+    current[model_name] = best
+    with open(path, 'w') as f:
+        json.dump(current, f, indent=2)
+
+
+def run_search(X, y, folds: list, model_name: str = 'xgboost', n_trials: int = 27, eta: int = 3,
+               n_workers: int = None, seed: int = 42, cache_key: str = None,
+               trials_file=TRIALS_FILE, best_file=BEST_PARAMS_FILE) -> dict:
+    """
+    Random search over walk-forward folds with successive halving
+
+    Every trial is evaluated on all folds at the smallest budget; only the
+    best 1/eta (by mean fold log loss) advance to the next rung with eta
+    times the budget, until the full budget. Each (trial, fold) fit runs in
+    a shared process pool, so XGBoost workers reuse their binned fold
+    matrices across trials and rungs.
+
+    Args:
+        X, y: Unscaled feature matrix and targets (rows in time order)
+        folds: Output of walk_forward_folds
+        model_name: 'xgboost' or 'lstm'
+        n_trials: Configurations sampled for the first rung
+        eta: Halving rate
+        n_workers: Worker processes (default: CPU count)
+        seed: Sampling seed
+        cache_key: Key from ml.xgb_training.training_matrix (workers memory-map it)
+
+    Returns:
+        Best (trial, budget) seen on any rung: {'study', 'trial', 'params', 'score', 'accuracy'}
+    """
+    budget_param, min_budget, max_budget = BUDGETS[model_name]
+    budgets = rung_budgets(min_budget, max_budget, eta)
+    rng = np.random.default_rng(seed)
+    study = f"{model_name}-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+    trials = {i: {**BASE_PARAMS[model_name], **sample_params(SEARCH_SPACES[model_name], rng)}
+              for i in range(n_trials)}
+    alive = list(trials)
+
+    n_workers = n_workers or os.cpu_count() or 1
+    threads = threads_per_worker(n_workers)
+    worker_args = (None, None, threads, cache_key) if cache_key else (np.asarray(X), np.asarray(y), threads)
+
+    logger.info(f"Search {study}: {n_trials} trials, rungs {budget_param}={budgets}, "
+                f"{len(folds)} folds on {n_workers} workers × {threads} threads")
+
+    best = None
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context('spawn'),
+                             initializer=_init_worker, initargs=worker_args) as pool:
+        for rung, budget in enumerate(budgets):
+            futures = {
+                (trial_id, fold_id): pool.submit(
+                    _run_fold, model_name, fold_id, fold, {**trials[trial_id], budget_param: budget}
+                )
+                for trial_id in alive for fold_id, fold in enumerate(folds)
+            }
+
+            records = []
+            for trial_id in alive:
+                fold_results = [futures[(trial_id, fold_id)].result() for fold_id in range(len(folds))]
+                records.append({
+                    'study': study,
+                    'trial': trial_id,
+                    'rung': rung,
+                    'budget': {budget_param: budget},
+                    'params': trials[trial_id],
+                    'score': trial_score(fold_results),
+                    'accuracy': float(np.mean([r['accuracy'] for r in fold_results])),
+                    'fit_seconds': round(sum(r['fit_seconds'] for r in fold_results), 3),
+                    'timestamp': datetime.now().isoformat(),
+                })
+
+            records.sort(key=lambda r: r['score'])
+            last_rung = rung == len(budgets) - 1
+            n_keep = len(records) if last_rung else max(1, math.floor(len(records) / eta))
+            for i, record in enumerate(records):
+                record['status'] = 'completed' if last_rung else ('promoted' if i < n_keep else 'pruned')
+            append_trials(records, trials_file)
+
+            alive = [r['trial'] for r in records[:n_keep]]
+            if best is None or records[0]['score'] < best['score']:
+                best = records[0]
+            logger.info(f"  ✓ Rung {rung} ({budget_param}={budget}): best log loss {records[0]['score']:.4f} "
+                        f"(trial {records[0]['trial']}), {len(records) - n_keep} pruned")
+
+    result = {
+        'study': study,
+        'trial': best['trial'],
+        'params': {**best['params'], **best['budget']},
+        'score': best['score'],
+        'accuracy': best['accuracy'],
+        'timestamp': best['timestamp'],
+    }
+    _save_best(model_name, result, best_file)
+    return result
@@ -0,0 +1,208 @@
+# ml/walk_forward.py - Parallel walk-forward evaluation across time-series folds
+import numpy as np
+import os
+import time
+import logging
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.model_selection import TimeSeriesSplit
+from sklearn.metrics import accuracy_score, roc_auc_score, log_loss
+
+from ml.xgb_training import XGB_PARAMS as DEFAULT_XGB_PARAMS
+
+logger = logging.getLogger(__name__)
+
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+# Set once per worker process by _init_worker
+_X = None
+_y = None
+_THREADS = 1
+_CACHE_KEY = None
+
+
+def walk_forward_folds(n_samples: int, n_folds: int = 5, mode: str = 'expanding',
+                       test_size: int = None, max_train_size: int = None) -> list:
+    """
+    Train/test index ranges for walk-forward evaluation
+
+    ``expanding`` folds grow the training window from the start of history;
+    ``rolling`` folds keep it at ``max_train_size`` rows (default: one test
+    window per fold of history before the first test window).
+    """
+    if mode not in ('expanding', 'rolling'):
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+
+    if mode == 'rolling' and max_train_size is None:
+        max_train_size = n_samples // (n_folds + 1)
+
+    splitter = TimeSeriesSplit(
+        n_splits=n_folds,
+        test_size=test_size,
+        max_train_size=max_train_size if mode == 'rolling' else None
+    )
+    return [
+        (int(train_idx[0]), int(train_idx[-1]) + 1, int(test_idx[0]), int(test_idx[-1]) + 1)
+        for train_idx, test_idx in splitter.split(np.empty(n_samples))
+    ]
+
+
+def threads_per_worker(n_workers: int) -> int:
+    """Split the machine's cores evenly so workers don't oversubscribe"""
+    return max(1, (os.cpu_count() or 1) // max(1, n_workers))
+
+
+def _init_worker(X, y, threads, cache_key=None):
+    """Receive (or memory-map) the feature matrix once per worker and cap native thread pools"""
+    global _X, _y, _THREADS, _CACHE_KEY
+    if cache_key is not None:
+        from ml.xgb_training import load_cached_matrix
+        X, y, _, _ = load_cached_matrix(cache_key)
+    _X, _y, _THREADS, _CACHE_KEY = X, y, threads, cache_key or 'worker'
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+
+def _fold_metrics(y_true, proba) -> dict:
+    """Classification metrics for one fold"""
+    pred = (proba > 0.5).astype(int)
+    metrics = {'accuracy': float(accuracy_score(y_true, pred))}
+    if len(np.unique(y_true)) > 1:
+        metrics['roc_auc'] = float(roc_auc_score(y_true, proba))
+        metrics['log_loss'] = float(log_loss(y_true, np.clip(proba, 1e-7, 1 - 1e-7)))
+    return metrics
+
+
+def _fit_xgboost_fold(train_start, train_end, test_start, test_end, params):
+    """Fit XGBoost on one fold inside a worker"""
+    from threadpoolctl import threadpool_limits
+    from ml.xgb_training import quantized_dmatrix, fit_booster
+
+    with threadpool_limits(limits=_THREADS):
+        # Binned once per worker; later trials on the same fold reuse it
+        dtrain = quantized_dmatrix(_X, _y, train_start, train_end, key=_CACHE_KEY)
+        booster = fit_booster(dtrain, params, n_jobs=_THREADS)
+        proba = booster.inplace_predict(_X[test_start:test_end])
+
+    return _fold_metrics(_y[test_start:test_end], proba)
+
+
+def _fit_lstm_fold(train_start, train_end, test_start, test_end, params):
+    """Fit the LSTM on one fold inside a worker (TensorFlow imported lazily)"""
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(_THREADS)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    from sklearn.preprocessing import StandardScaler
+    from ml.tf_dataset import window_dataset
+    from ml.windowing import window_targets
+    from scripts.train_models import build_lstm_model, LSTM_TIMESTEPS, LSTM_BATCH_SIZE, LSTM_SHUFFLE_BLOCK
+
+    # Scale on the fold's own training window only (no look-ahead)
+    scaler = StandardScaler().fit(_X[train_start:train_end])
+    X_train = scaler.transform(_X[train_start:train_end])
+    X_test = scaler.transform(_X[test_start:test_end])
+    y_train, y_test = _y[train_start:train_end], _y[test_start:test_end]
+
+    architecture = {k: params[k] for k in ('units', 'dropout', 'learning_rate') if k in params}
+    model = build_lstm_model(LSTM_TIMESTEPS, X_train.shape[1], **architecture)
+    model.fit(
+        window_dataset(X_train, y_train, LSTM_TIMESTEPS, LSTM_BATCH_SIZE, shuffle_block=LSTM_SHUFFLE_BLOCK),
+        epochs=params.get('epochs', 20), verbose=0
+    )
+    proba = model.predict(window_dataset(X_test, None, LSTM_TIMESTEPS, LSTM_BATCH_SIZE), verbose=0).flatten()
+
+    return _fold_metrics(window_targets(y_test, LSTM_TIMESTEPS), proba)
+
+
+FOLD_RUNNERS = {
+    'xgboost': _fit_xgboost_fold,
+    'lstm': _fit_lstm_fold,
+}
+
+
+def _run_fold(model_name, fold_id, fold, params):
+    """Worker entry point: fit one (model, fold) pair and time it"""
+    start = time.perf_counter()
+    metrics = FOLD_RUNNERS[model_name](*fold, params)
+    train_start, train_end, test_start, test_end = fold
+    return {
+        'model': model_name,
+        'fold': fold_id,
+        'train_rows': train_end - train_start,
+        'test_rows': test_end - test_start,
+        'train_range': [train_start, train_end],
+        'test_range': [test_start, test_end],
+        'fit_seconds': round(time.perf_counter() - start, 3),
+        **metrics
+    }
+
+
+def aggregate_fold_results(fold_results: list) -> dict:
+    """Mean/std/min/max of every numeric metric, per model"""
+    summary = {}
+    for model_name in sorted({r['model'] for r in fold_results}):
+        rows = [r for r in fold_results if r['model'] == model_name]
+        metric_names = [k for k in ('accuracy', 'roc_auc', 'log_loss') if any(k in r for r in rows)]
+        summary[model_name] = {'folds': len(rows)}
+        for metric in metric_names:
+            values = np.array([r[metric] for r in rows if metric in r])
+            summary[model_name][metric] = {
+                'mean': float(values.mean()),
+                'std': float(values.std()),
+                'min': float(values.min()),
+                'max': float(values.max()),
+            }
+    return summary
+
+
+def run_walk_forward(X, y, folds: list, models=('xgboost',), n_workers: int = None,
+                     params: dict = None, cache_key: str = None) -> dict:
+    """
+    Evaluate every (model, fold) pair in parallel worker processes
+
+    Args:
+        X: Feature matrix (rows in time order; unscaled for XGBoost)
+        y: Binary targets
+        folds: Output of walk_forward_folds
+        models: Any of 'xgboost', 'lstm'
+        n_workers: Worker processes (default: one per task, capped at CPU count)
+        params: Per-model parameter overrides, e.g. {'xgboost': {'max_depth': 4}}
+        cache_key: Key from ml.xgb_training.training_matrix; workers memory-map
+            the cached matrix instead of receiving a pickled copy
+
+    Returns:
+        {'folds': [...per-fold metrics...], 'summary': {...per-model aggregates...}}
+    """
+    params = params or {}
+    tasks = [(model_name, i, fold) for model_name in models for i, fold in enumerate(folds)]
+    n_workers = n_workers or min(len(tasks), os.cpu_count() or 1)
+    threads = threads_per_worker(n_workers)
+
+    logger.info(f"Walk-forward: {len(folds)} folds × {len(models)} model(s) on "
+                f"{n_workers} workers × {threads} threads")
+
+    model_params = {
+        'xgboost': {**DEFAULT_XGB_PARAMS, **params.get('xgboost', {})},
+        'lstm': params.get('lstm', {}),
+    }
+
+    if cache_key is not None:
+        worker_args = (None, None, threads, cache_key)
+    else:
+        worker_args = (np.asarray(X), np.asarray(y), threads)
+
+    results = []
+    # spawn: fresh interpreters, no inherited OpenMP/TensorFlow thread state
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context('spawn'),
+                             initializer=_init_worker,
+                             initargs=worker_args) as pool:
+        futures = [pool.submit(_run_fold, name, i, fold, model_params[name]) for name, i, fold in tasks]
+        for future in as_completed(futures):
+            result = future.result()
+            logger.info(f"  ✓ {result['model']} fold {result['fold']}: "
+                        f"acc={result['accuracy']:.3f} ({result['fit_seconds']:.1f}s)")
+            results.append(result)
+
+    results.sort(key=lambda r: (r['model'], r['fold']))
+    return {'folds': results, 'summary': aggregate_fold_results(results)}
@@ -0,0 +1,31 @@
+# ml/windowing.py - Sliding-window sequence views for the LSTM
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(X, timesteps: int) -> np.ndarray:
+    """
+    Read-only (samples, timesteps, features) view over a 2-D feature matrix
+
+    Window ``i`` covers rows ``X[i:i + timesteps]`` and is paired with target
+    ``y[i + timesteps]`` (see window_targets), matching the original
+    ``X[i-timesteps:i]`` loop. No data is copied: memory stays O(N × features)
+    regardless of ``timesteps``.
+    """
+    X = np.ascontiguousarray(X)
+    if X.ndim != 2:
+        raise ValueError(f"Expected a 2-D feature matrix, got shape {X.shape}")
+    if len(X) <= timesteps:
+        return np.empty((0, timesteps, X.shape[1]), dtype=X.dtype)
+
+    # sliding_window_view puts the window axis last: (N-T+1, F, T) -> (N-T+1, T, F)
+    windows = sliding_window_view(X, timesteps, axis=0).transpose(0, 2, 1)
+
+    # Last window has no target row after it
+    return windows[:-1]
+
+
+def window_targets(y, timesteps: int) -> np.ndarray:
+    """Targets aligned with sliding_windows (the row right after each window)"""
+    return np.asarray(y)[timesteps:]
+
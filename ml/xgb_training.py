@@ -0,0 +1,260 @@
+# ml/xgb_training.py - Cached training matrices and reusable quantized DMatrices for XGBoost
+import numpy as np
+import xgboost as xgb
+from pathlib import Path
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+
+from utils.feature_store import (
+    DEFAULT_TARGET, feature_store_version, read_model_frame, iter_feature_chunks, forward_filled
+)
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_ROOT / 'models' / 'cache'
+EXTMEM_DIR = CACHE_DIR / 'extmem'
+
+# Same hyperparameters as the original XGBClassifier in train_models
+XGB_PARAMS = {
+    'n_estimators': 200,
+    'max_depth': 6,
+    'learning_rate': 0.1,
+    'subsample': 0.8,
+    'colsample_bytree': 0.8,
+    'random_state': 42,
+}
+MAX_BIN = 256
+BATCH_ROWS = 100_000  # rows per external-memory batch
+
+# (cache key, row range, max_bin) -> QuantileDMatrix, binned once per process
+_QUANTIZED = {}
+
+
+def matrix_key(start_date=None, end_date=None, symbols=None, target_col: str = DEFAULT_TARGET) -> str:
+    """Cache key for a training slice of the current feature-store version"""
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    payload = {
+        'store': feature_store_version(),
+        'start': str(start_date) if start_date is not None else None,
+        'end': str(end_date) if end_date is not None else None,
+        'symbols': sorted(symbols) if symbols else None,
+        'target': target_col,
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _is_complete(directory: Path) -> bool:
+    """True for a committed entry of the current layout (older entries lack symbols.npy)"""
+    return (directory / 'meta.json').exists() and (directory / 'symbols.npy').exists()
+
+
+def load_cached_matrix(key: str, root=CACHE_DIR):
+    """Memory-map a cached (X, y, dates, feature_cols) slice, or None on a miss"""
+    directory = Path(root) / key
+    if not _is_complete(directory):
+        return None
+    with open(directory / 'meta.json', 'r') as f:
+        meta = json.load(f)
+    X = np.load(directory / 'X.npy', mmap_mode='r')
+    y = np.load(directory / 'y.npy', mmap_mode='r')
+    dates = np.load(directory / 'dates.npy')
+    return X, y, dates, meta['feature_cols']
+
+
+def load_cached_symbols(key: str, root=CACHE_DIR) -> np.ndarray:
+    """Symbol of every row of a cached training matrix"""
+    return np.load(Path(root) / key / 'symbols.npy')
+
+
+def _save_matrix(key: str, X, y, dates, symbols, feature_cols: list, store_version: str, root=CACHE_DIR):
+    """Write a cache entry via temp dir + rename; drop entries of older store versions"""
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    tmp_dir = root / f".{key}.{uuid.uuid4().hex}.tmp"
+    tmp_dir.mkdir()
+    np.save(tmp_dir / 'X.npy', X)
+    np.save(tmp_dir / 'y.npy', y)
+    np.save(tmp_dir / 'dates.npy', dates)
+    np.save(tmp_dir / 'symbols.npy', symbols)
+    with open(tmp_dir / 'meta.json', 'w') as f:
+        json.dump({'feature_cols': feature_cols, 'store_version': store_version,
+                   'rows': int(len(X))}, f, indent=2)
+
+    target = root / key
+    if target.exists() and not _is_complete(target):
+        # Entry of an older cache layout: it would block the rename for good
+        shutil.rmtree(target, ignore_errors=True)
+    try:
+        os.replace(tmp_dir, target)
+    except OSError:
+        # Another process committed the same key first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    for entry in root.iterdir():
+        meta_file = entry / 'meta.json'
+        if entry.name == key or not meta_file.exists():
+            continue
+        with open(meta_file, 'r') as f:
+            if json.load(f).get('store_version') != store_version:
+                shutil.rmtree(entry, ignore_errors=True)
+
+
+def training_matrix(start_date=None, end_date=None, symbols=None,
+                    target_col: str = DEFAULT_TARGET, root=CACHE_DIR):
+    """
+    Forward-filled float32 model inputs for a slice, cached per feature-store version
+
+    The first call reads the feature store, forward-fills and converts; later
+    calls (and other processes) memory-map the cached arrays instead.
+
+    Returns:
+        (X, y, dates, feature_cols, key)
+    """
+    key = matrix_key(start_date, end_date, symbols, target_col)
+    cached = load_cached_matrix(key, root)
+    if cached is not None:
+        logger.info(f"✓ Training matrix cache hit ({key}): {cached[0].shape[0]:,} × {cached[0].shape[1]}")
+        return (*cached, key)
+
+    store_version = feature_store_version()
+    df, feature_cols = read_model_frame(start_date, end_date, symbols, target_col)
+    X = df[feature_cols].ffill().fillna(0).values.astype(np.float32)
+    y = df[target_col].fillna(0).values.astype(np.float32)
+    dates = df['date'].values
+    symbols = np.asarray(df['symbol'], dtype=str) if 'symbol' in df.columns else np.full(len(df), '')
+
+    _save_matrix(key, X, y, dates, symbols, feature_cols, store_version, root)
+    cached = load_cached_matrix(key, root)
+    if cached is None:
+        logger.warning(f"⚠️  Training matrix {key} could not be cached, using it from memory")
+        return X, y, dates, feature_cols, key
+    logger.info(f"✓ Cached training matrix ({key}): {X.shape[0]:,} × {X.shape[1]}")
+    return (*cached, key)
+
+
+def quantized_dmatrix(X, y=None, start: int = 0, end: int = None, key: str = None,
+                      max_bin: int = MAX_BIN) -> xgb.QuantileDMatrix:
+    """
+    Histogram-binned DMatrix for rows [start:end], built once per process
+
+    With a ``key`` (see training_matrix) the result is memoized, so repeated
+    fits, folds and parameter trials on the same rows skip the quantile
+    sketch and bin assignment.
+    """
+    end = len(X) if end is None else end
+    memo_key = (key, start, end, max_bin)
+    if key is not None and memo_key in _QUANTIZED:
+        return _QUANTIZED[memo_key]
+
+    dmatrix = xgb.QuantileDMatrix(
+        X[start:end], None if y is None else y[start:end], max_bin=max_bin
+    )
+    if key is not None:
+        _QUANTIZED[memo_key] = dmatrix
+    return dmatrix
+
+
+def clear_quantized():
+    """Release memoized quantized matrices"""
+    _QUANTIZED.clear()
+
+
+def fit_booster(dtrain, params: dict = None, n_jobs: int = -1, xgb_model=None) -> xgb.Booster:
+    """
+    Train with the ``hist`` tree method on a quantized DMatrix
+
+    ``params`` use the XGBClassifier names of XGB_PARAMS; ``n_estimators``
+    becomes the number of boosting rounds.
+    """
+    params = {**XGB_PARAMS, **(params or {})}
+    num_boost_round = params.pop('n_estimators')
+    params.setdefault('max_bin', MAX_BIN)  # must match the max_bin dtrain was built with
+    params.update({
+        'objective': 'binary:logistic',
+        'tree_method': 'hist',
+        'nthread': n_jobs if n_jobs and n_jobs > 0 else (os.cpu_count() or 1),
+    })
+    return xgb.train(params, dtrain, num_boost_round=num_boost_round, xgb_model=xgb_model)
+
+
+def to_classifier(booster: xgb.Booster) -> xgb.XGBClassifier:
+    """Wrap a trained booster as an XGBClassifier (predict_proba, feature_importances_)"""
+    model = xgb.XGBClassifier()
+    model.load_model(bytearray(booster.save_raw('ubj')))
+    return model
+
+
+def iter_model_batches(feature_cols: list, target_col: str = DEFAULT_TARGET, start_date=None,
+                       end_date=None, symbols=None, row_start: int = 0, row_end: int = None,
+                       batch_rows: int = BATCH_ROWS):
+    """
+    Stream forward-filled float32 (X, y) batches in training row order
+
+    Rows are numbered like training_matrix (date order over the whole slice),
+    so ``row_start``/``row_end`` select the same rows as ``X[row_start:row_end]``.
+    """
+    columns = feature_cols + [target_col]
+    offset = 0
+    chunks = iter_feature_chunks(columns, start_date, end_date, symbols)
+
+    for df in forward_filled(chunks, feature_cols):
+        lo = max(row_start - offset, 0)
+        hi = len(df) if row_end is None else min(row_end - offset, len(df))
+        offset += len(df)
+
+        if hi > lo:
+            X = np.nan_to_num(df[feature_cols].values[lo:hi].astype(np.float32), nan=0.0)
+            y = np.nan_to_num(df[target_col].values[lo:hi].astype(np.float32), nan=0.0)
+            for i in range(0, len(X), batch_rows):
+                yield X[i:i + batch_rows], y[i:i + batch_rows]
+
+        if row_end is not None and offset >= row_end:
+            return
+
+
+class FeatureStoreIter(xgb.DataIter):
+    """
+    XGBoost data iterator over the partitioned feature store
+
+    Each pass re-reads the store batch by batch; XGBoost keeps only the
+    quantized pages (spilled under EXTMEM_DIR), so memory stays bounded by
+    one batch regardless of history length.
+    """
+
+    def __init__(self, feature_cols: list, target_col: str = DEFAULT_TARGET, start_date=None,
+                 end_date=None, symbols=None, row_start: int = 0, row_end: int = None,
+                 batch_rows: int = BATCH_ROWS, cache_dir=EXTMEM_DIR):
+        self._batch_args = (feature_cols, target_col, start_date, end_date, symbols,
+                            row_start, row_end, batch_rows)
+        self._batches = None
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        super().__init__(cache_prefix=str(Path(cache_dir) / 'features'))
+
+    def reset(self):
+        self._batches = None
+
+    def next(self, input_data) -> bool:
+        if self._batches is None:
+            self._batches = iter_model_batches(*self._batch_args)
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        input_data(data=batch[0], label=batch[1])
+        return True
+
+
+def external_dmatrix(feature_cols: list, target_col: str = DEFAULT_TARGET, start_date=None,
+                     end_date=None, symbols=None, row_start: int = 0, row_end: int = None,
+                     max_bin: int = MAX_BIN, batch_rows: int = BATCH_ROWS) -> xgb.ExtMemQuantileDMatrix:
+    """Quantized external-memory DMatrix streamed from the feature store"""
+    data_iter = FeatureStoreIter(feature_cols, target_col, start_date, end_date, symbols,
+                                 row_start, row_end, batch_rows)
+    return xgb.ExtMemQuantileDMatrix(data_iter, max_bin=max_bin)
@@ -11,6 +11,7 @@ from utils.style_loader import load_custom_css
 from components.header import render_header
 from components.sidebar import render_sidebar
 from components.footer import render_footer
+from services.data_service import get_data_service
 
 st.set_page_config(page_title="Crash Countdown", page_icon="⏱️", layout="wide")
 
@@ -21,8 +22,7 @@ render_sidebar()
 st.title("⏱️ Major Event Countdown")
 
 try:
-    events_df = pd.read_csv('planetary_events_calendar.csv')
-    events_df['date'] = pd.to_datetime(events_df['date'])
+    events_df = get_data_service().events()
     
     today = datetime.now()
     future_events = events_df[events_df['date'] > today]
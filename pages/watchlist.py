@@ -6,7 +6,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from utils.style_loader import load_custom_css
-from utils.calculations import get_stock_prediction
+from utils.calculations import get_watchlist_predictions
 from components.header import render_header
 from components.sidebar import render_sidebar
 from components.footer import render_footer
@@ -33,9 +33,13 @@ with col2:
 
 st.markdown("---")
 
-# Display watchlist
-for symbol in st.session_state.watchlist:
-    pred = get_stock_prediction(symbol)
+# Display watchlist (all quotes in one batched, cached fetch)
+predictions = get_watchlist_predictions(st.session_state.watchlist)
+if st.session_state.watchlist and not any(predictions.values()):
+    st.warning("⚠️ Quotes are unavailable right now. Try again in a minute.")
+
+for symbol in list(st.session_state.watchlist):
+    pred = predictions.get(symbol.strip().upper())
     
     if pred:
         col1, col2, col3, col4, col5 = st.columns([2, 2, 2, 2, 1])
@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 import logging
 from datetime import timedelta
+from functools import lru_cache
 import warnings
 
 warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
@@ -15,6 +16,8 @@ warnings.filterwarnings('ignore', category=pd.errors.PerformanceWarning)
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils.feature_store import FEATURES_FULL_FILE, write_features, write_feature_partitions
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -31,12 +34,16 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '5432')
 DB_NAME = os.getenv('DB_NAME', 'astro_finance')
 
-engine = create_engine(f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+@lru_cache(maxsize=1)
+def get_engine():
+    """Database engine, created on first use (feature functions need no database driver)"""
+    return create_engine(f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
 
 def load_master_data():
     """Load financial + planetary data"""
     logger.info("Loading master dataset...")
     
+    engine = get_engine()
     financial_df = pd.read_sql("SELECT * FROM financial_data ORDER BY date", engine)
     planetary_df = pd.read_sql("SELECT * FROM planetary_positions ORDER BY date", engine)
     
@@ -245,8 +252,7 @@ def main():
     logger.info(f"📊 Final dataset: {len(df):,} rows × {len(df.columns):,} features (+{len(df.columns) - original_cols} new)")
     
     # Save full features
-    df.to_parquet('features_full.parquet', index=False)
-    logger.info("✓ Saved features_full.parquet")
+    write_features(df, FEATURES_FULL_FILE)
     
     # Get numeric columns for variance analysis
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
@@ -261,8 +267,8 @@ def main():
     
     # Save selected features with metadata
     selected_cols = top_variance + ['date', 'symbol']
-    df[selected_cols].to_parquet('features_selected.parquet', index=False)
-    logger.info("✓ Saved features_selected.parquet (TOP 100 + metadata)")
+    write_feature_partitions(df[selected_cols])
+    logger.info("✓ Saved features (TOP 100 + metadata) to year/symbol partitions")
     
     logger.info("\n" + "=" * 80)
     logger.info("✅ PHASE 2 COMPLETE - READY FOR ML MODELING!")
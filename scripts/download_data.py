@@ -14,7 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Import modules from current structure
 from scripts.financial_data import download_financial_data, validate_financial_data, TICKERS
-from scripts.planetary_data import compute_planetary_positions, validate_planetary_data
+from scripts.planetary_data import backfill_planetary_positions, validate_planetary_data
+from utils.checkpoints import run_chunked, job_params
 
 # Try to import database (optional - will skip if not available)
 try:
@@ -33,38 +34,63 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def download_all_financial_data():
-    """Download all financial instruments"""
+# Full history per instrument
+START_DATES = {
+    'DXY': '1973-01-01',
+    'DJIA': '1950-01-01',
+    'GOLD': '1970-01-01',
+}
+
+def insert_rows(df: pd.DataFrame, table: str):
+    """
+    Insert a chunk, replacing rows it covers (raises so the chunk is not marked complete)
+
+    Rows in the chunk's date range (per symbol, when the table has one) are
+    deleted in the same transaction, so inserting a chunk again never
+    duplicates rows.
+    """
+    # Half-open day range: also matches rows stored with a time of day
+    start = df['date'].min().normalize().to_pydatetime()
+    end = (df['date'].max().normalize() + pd.Timedelta(days=1)).to_pydatetime()
+    symbols = df['symbol'].unique() if 'symbol' in df.columns else [None]
+    with engine.begin() as conn:
+        if sqlalchemy.inspect(conn).has_table(table):
+            for symbol in symbols:
+                where = "date >= :start AND date < :end" + (" AND symbol = :symbol" if symbol else "")
+                conn.execute(sqlalchemy.text(f"DELETE FROM {table} WHERE {where}"),
+                             {'start': start, 'end': end, 'symbol': symbol})
+        df.to_sql(table, conn, if_exists='append', index=False)
+    logger.info(f"✓ Inserted {len(df)} rows into {table}")
+
+def download_all_financial_data(resume: bool = True):
+    """
+    Download all financial instruments, one checkpointed chunk per symbol
+
+    A symbol counts as done once it is downloaded and inserted; rerunning
+    after a failure downloads only the symbols that are missing, up to the
+    end date of the interrupted run.
+    """
     logger.info("\n" + "=" * 70)
     logger.info("DOWNLOADING FINANCIAL DATA")
     logger.info("=" * 70)
     
-    END_DATE = datetime.now().strftime("%Y-%m-%d")
-    financial_stats = {}
+    params = job_params('financial_data', {'end_date': datetime.now().strftime("%Y-%m-%d")}, resume)
     
-    for symbol, ticker in TICKERS.items():
-        # Set appropriate start dates for each instrument (full historical)
-        start_dates = {
-            'DXY': '1973-01-01',
-            'DJIA': '1950-01-01',
-            'GOLD': '1970-01-01',
-        }
-        
-        start_date = start_dates.get(symbol, '1950-01-01')
-        
-        # Download
-        df = download_financial_data(symbol, ticker, start_date, END_DATE)
-        
-        if not df.empty and DATABASE_AVAILABLE:
-            # Insert into database
-            try:
-                df.to_sql('financial_data', engine, if_exists='append', index=False)
-                logger.info(f"✓ Inserted {len(df)} rows for {symbol} into database")
-            except Exception as e:
-                logger.error(f"✗ Failed to insert {symbol}: {e}")
-        
+    def process(symbol: str) -> pd.DataFrame:
+        start_date = START_DATES.get(symbol, '1950-01-01')
+        df = download_financial_data(symbol, TICKERS[symbol], start_date, params['end_date'])
+        if df.empty:
+            raise RuntimeError(f"No data downloaded for {symbol}")
+        if DATABASE_AVAILABLE:
+            insert_rows(df, 'financial_data')
+        return df
+    
+    df = run_chunked('financial_data', list(TICKERS), process)
+    
+    financial_stats = {}
+    for symbol in TICKERS:
         # Validate
-        stats = validate_financial_data(df, symbol)
+        stats = validate_financial_data(df[df['symbol'] == symbol], symbol)
         financial_stats[symbol] = stats
         
         logger.info(f"{symbol} Stats:")
@@ -73,8 +99,8 @@ def download_all_financial_data():
     
     return financial_stats
 
-def download_all_planetary_data(years_back: int = 10):
-    """Compute planetary data for recent period (extend after verification)"""
+def download_all_planetary_data(years_back: int = 10, resume: bool = True):
+    """Compute planetary data for recent period, checkpointed per calendar year"""
     logger.info("\n" + "=" * 70)
     logger.info("COMPUTING PLANETARY DATA")
     logger.info("=" * 70)
@@ -83,24 +109,14 @@ def download_all_planetary_data(years_back: int = 10):
     START_DATE = (datetime.now() - timedelta(days=365*years_back)).strftime("%Y-%m-%d")
     
     logger.info(f"Computing {years_back} years of planetary data ({START_DATE} to {END_DATE})")
-    logger.info("(Full 100 years will take 2-3 hours - extend after verification)")
-    
-    # Compute
-    df = compute_planetary_positions(START_DATE, END_DATE)
+    logger.info("(Full 100 years takes 2-3 hours; an interrupted run resumes at the failed year)")
     
-    planetary_stats = {'rows': 0, 'status': 'FAILED'}
+    if not DATABASE_AVAILABLE:
+        logger.warning("Database unavailable - positions go to the partitioned store only")
+    sink = (lambda df: insert_rows(df, 'planetary_positions')) if DATABASE_AVAILABLE else None
     
-    if not df.empty and DATABASE_AVAILABLE:
-        # Insert into database
-        try:
-            df.to_sql('planetary_positions', engine, if_exists='append', index=False)
-            logger.info(f"✓ Inserted {len(df)} rows of planetary data into database")
-            planetary_stats = validate_planetary_data(df)
-        except Exception as e:
-            logger.error(f"✗ Failed to insert planetary data: {e}")
-    else:
-        logger.warning("✗ No planetary data computed or database unavailable")
-        planetary_stats = validate_planetary_data(df)
+    df = backfill_planetary_positions(START_DATE, END_DATE, sink=sink, resume=resume)
+    planetary_stats = validate_planetary_data(df)
     
     logger.info("Planetary Data Stats:")
     for key, value in planetary_stats.items():
@@ -142,15 +158,22 @@ def print_summary(financial_stats, planetary_stats):
     logger.info("3. Ready for Phase 2: Feature Engineering!")
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Download financial data and backfill planetary positions")
+    parser.add_argument('--years', type=int, default=10, help="Years of planetary data")
+    parser.add_argument('--restart', action='store_true', help="Discard checkpoints of an interrupted run")
+    args = parser.parse_args()
+    
     logger.info("=" * 70)
     logger.info("ASTRO FINANCE: DATA ACQUISITION PIPELINE")
     logger.info("=" * 70)
     
     # Download financial data (full historical range)
-    financial_stats = download_all_financial_data()
+    financial_stats = download_all_financial_data(resume=not args.restart)
     
     # Download planetary data (10 years for testing)
-    planetary_stats = download_all_planetary_data(years_back=10)
+    planetary_stats = download_all_planetary_data(years_back=args.years, resume=not args.restart)
     
     # Print summary
     print_summary(financial_stats, planetary_stats)
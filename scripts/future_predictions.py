@@ -1,186 +1,198 @@
-# scripts/planetary_data.py - FIXED WITH GLOBAL LOADER
+# scripts/future_predictions.py - 90-day Monte Carlo price forecast
 
 import pandas as pd
 import numpy as np
-from skyfield.api import Loader
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 import logging
-import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from ml.forecast import (HORIZON_DAYS, N_PATHS, VOL_LOOKBACK, base_drift, base_volatility,
+                         event_vol_multiplier, forecast_frame)
+from utils.artifacts import read_artifact, write_artifact
+from utils.feature_store import read_features, feature_schema, select_feature_columns
+from utils.partitioned_store import read_partitions, write_partitions
 
-# Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Define paths
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_RAW = PROJECT_ROOT / 'data' / 'raw'
-DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+FORECAST_SYMBOL = 'DJIA'
+
+
+def load_price_history(symbol: str = FORECAST_SYMBOL) -> pd.DataFrame:
+    """Date-ordered closes of one symbol from the feature store"""
+    df = read_features(['date', 'close'], symbols=symbol)
+    return df.dropna(subset=['close']).drop_duplicates('date', keep='last')
+
+
+def latest_probability(symbol: str = FORECAST_SYMBOL) -> float:
+    """XGBoost P(up) for the latest feature row, as daily_probabilities scores (0.5 if unavailable)"""
+    try:
+        from ml.predictor import MarketPredictor
+        probability = MarketPredictor().predict_stock(symbol)['xgb_proba']
+    except Exception as e:
+        logger.warning(f"⚠️  Model probability unavailable, using 0.5: {e}")
+        return 0.5
+    return 0.5 if pd.isna(probability) else float(probability)
+
+
+def load_future_ephemeris(dates) -> pd.DataFrame:
+    """
+    Planetary columns for each forecast day from the ephemeris store
+
+    Days the store does not cover yet are computed once and written back,
+    so later runs only read. Rows stay NaN when no ephemeris is available.
+    """
+    dates = pd.DatetimeIndex(dates)
+    ephemeris = read_partitions('planetary_positions', dates[0], dates[-1])
+    if ephemeris.empty or not dates.isin(ephemeris['date'].dt.normalize()).all():
+        try:
+            from scripts.planetary_data import compute_planetary_positions
+            computed = compute_planetary_positions(dates[0].strftime('%Y-%m-%d'), dates[-1].strftime('%Y-%m-%d'))
+        except Exception as e:
+            logger.warning(f"⚠️  Cannot compute future ephemeris: {e}")
+            computed = pd.DataFrame()
+        if not computed.empty:
+            computed['date'] = pd.to_datetime(computed['date'])
+            write_partitions(computed, 'planetary_positions')
+            ephemeris = computed
+
+    if ephemeris.empty:
+        return pd.DataFrame(index=dates)
+    ephemeris = ephemeris.assign(date=ephemeris['date'].dt.normalize()).drop_duplicates('date', keep='last')
+    return ephemeris.set_index('date').reindex(dates)
+
+
+def replay_symbols(assembler, symbol: str = FORECAST_SYMBOL) -> list:
+    """Per-date symbol order of the stored feature rows (last stored date), signal symbol included"""
+    order = list(assembler.symbol_order)
+    return order if symbol in order else order + [symbol]
+
+
+def replay_vectors(assembler, ephemeris: pd.DataFrame, symbol: str = FORECAST_SYMBOL) -> dict:
+    """
+    Feature vector of ``symbol`` on every ephemeris date, replayed without bars
+
+    Each date replays one row per symbol in the stored row order, so motion
+    features step on the same rows as in the feature store (the first row of
+    a date carries the sky's move, later rows of that date see none). The
+    vector is taken right after the signal symbol's row, as training reads
+    that row. Market columns keep their last values, only the sky moves.
+    """
+    symbols = replay_symbols(assembler, symbol)
+    vectors = {}
+    for date, positions in ephemeris.iterrows():
+        positions = positions.dropna().to_dict() or None
+        for row_symbol in symbols:
+            vector = assembler.update(row_symbol, {}, positions, date)
+            if row_symbol == symbol:
+                vectors[date] = vector
+    return vectors
+
+
+def daily_probabilities(dates, symbol: str = FORECAST_SYMBOL):
+    """
+    XGBoost P(up) for every forecast day from one batched predict call
+
+    Every trading day from the last stored bar to the end of the horizon is
+    replayed with that day's ephemeris (see replay_vectors), also across
+    the gap before the first forecast day, and the forecast days are
+    scored. Returns None when no future ephemeris is available.
+    """
+    from ml.live_features import LiveFeatureAssembler
+    from ml.registry import get_models
 
-# Ensure directories exist
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+    dates = pd.DatetimeIndex(dates)
+    models = get_models()
+    feature_cols = models.feature_cols or select_feature_columns(feature_schema())
+    assembler = LiveFeatureAssembler.from_feature_store(feature_cols)
 
-# Create GLOBAL Skyfield loader pointing ONLY to our data/raw folder
-# This prevents any downloads
-load = Loader(str(DATA_RAW), expire=False)
+    replay = pd.bdate_range(assembler.date + pd.offsets.BDay(1), dates[-1])
+    ephemeris = load_future_ephemeris(replay)
+    if ephemeris.reindex(dates).dropna(how='all').empty:
+        return None
 
-# Disable automatic downloads
-os.environ['SKYFIELD_DOWNLOAD'] = '0'
+    vectors = replay_vectors(assembler, ephemeris, symbol)
+    return models.xgboost.predict_proba(np.vstack([vectors[date] for date in dates]))[:, 1]
+
+
+def load_events() -> pd.DataFrame:
+    """Planetary events calendar (empty when stage 2 has not run)"""
+    try:
+        return read_artifact('planetary_events')
+    except FileNotFoundError:
+        logger.warning("⚠️  No events calendar, forecasting with unconditioned volatility")
+        return pd.DataFrame()
 
 
-def compute_planetary_positions(start_date, end_date):
+def predict_future_90_days(days: int = HORIZON_DAYS, n_paths: int = N_PATHS, seed: int = 42,
+                           probabilities=None, export_csv: bool = False) -> pd.DataFrame:
     """
-    Compute planetary positions for date range
-    
+    Simulate ``n_paths`` price paths over the next ``days`` trading days
+
+    Daily drift is implied by the model's P(up): its common level, set by
+    the carried market state, decays towards the recent average drift
+    further out, while the day-to-day differences from each day's sky are
+    kept; daily volatility is the recent realized volatility scaled up
+    around calendar events.
+
     Args:
-        start_date: Start date (YYYY-MM-DD)
-        end_date: End date (YYYY-MM-DD)
-    
+        probabilities: P(up) per forecast day (default: scored per day from
+            future ephemeris features, else the latest model probability)
+
     Returns:
-        DataFrame with planetary positions
+        Forecast table (also written as the predictions_future_90d artifact
+        and appended to its year partitions, latest forecast per date)
     """
-    
-    logger.info(f"Computing planetary positions from {start_date} to {end_date}...")
-    
-    # Check if BSP file exists
-    bsp_file = DATA_RAW / 'de421.bsp'
-    if not bsp_file.exists():
-        logger.error(f"❌ BSP file not found: {bsp_file}")
-        logger.info(f"💡 Download from: https://naif.jpl.nasa.gov/pub/naif/generic_kernels/spk/planets/de421.bsp")
-        logger.info(f"💡 Save to: {bsp_file}")
-        raise FileNotFoundError(f"BSP file not found at {bsp_file}")
-    
-    logger.info(f"✓ Using local BSP file: {bsp_file}")
-    
-    # Load ephemeris from LOCAL file (will NOT download)
-    try:
-        eph = load('de421.bsp')
-        logger.info("✓ Ephemeris loaded from local file (no download)")
-    except Exception as e:
-        logger.error(f"❌ Error loading ephemeris: {e}")
-        raise
-    
-    # Create timescale (might download tiny timescale files first time only)
-    try:
-        ts = load.timescale()
-    except Exception as e:
-        logger.warning(f"⚠️  Timescale load issue: {e}")
-        # Fallback: use built-in
-        from skyfield.api import load as default_load
-        ts = default_load.timescale(builtin=True)
-    
-    # Generate date range
-    start = datetime.strptime(start_date, '%Y-%m-%d')
-    end = datetime.strptime(end_date, '%Y-%m-%d')
-    dates = pd.date_range(start=start, end=end, freq='D')
-    
-    logger.info(f"✓ Processing {len(dates)} days...")
-    
-    # Planet codes
-    planets = {
-        'sun': 10,
-        'moon': 301,
-        'mercury': 1,
-        'venus': 2,
-        'mars': 4,
-        'jupiter': 5,
-        'saturn': 6,
-        'uranus': 7,
-        'neptune': 8,
-        'pluto': 9
-    }
-    
-    # Earth
-    earth = eph[399]
-    
-    # Compute positions
-    data = []
-    
-    for date in dates:
-        t = ts.utc(date.year, date.month, date.day)
-        
-        row = {'date': date}
-        
-        # Get positions for each planet
-        for planet_name, planet_code in planets.items():
-            try:
-                planet = eph[planet_code]
-                
-                # Position relative to Earth
-                astrometric = earth.at(t).observe(planet)
-                ra, dec, distance = astrometric.radec()
-                
-                # Ecliptic longitude (approximate)
-                lon = ra.degrees
-                
-                row[f'{planet_name}_longitude'] = lon
-                row[f'{planet_name}_distance'] = distance.au
-                
-            except Exception as e:
-                logger.warning(f"Could not compute {planet_name}: {e}")
-                row[f'{planet_name}_longitude'] = np.nan
-                row[f'{planet_name}_distance'] = np.nan
-        
-        data.append(row)
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Calculate velocities (rate of change)
-    for planet_name in planets.keys():
-        lon_col = f'{planet_name}_longitude'
-        if lon_col in df.columns:
-            df[f'{planet_name}_velocity'] = df[lon_col].diff()
-    
-    logger.info(f"✓ Computed positions for {len(df)} days")
-    
-    return df
+    history = load_price_history()
+    last_date = pd.Timestamp(history['date'].iloc[-1])
+    last_price = float(history['close'].iloc[-1])
 
+    start = max(last_date, pd.Timestamp(datetime.now().date())) + pd.offsets.BDay(1)
+    dates = pd.bdate_range(start, periods=days)
 
-def save_planetary_data(df, filename='planetary_positions.csv'):
-    """Save planetary data to processed folder"""
-    output_path = DATA_PROCESSED / filename
-    df.to_csv(output_path, index=False)
-    logger.info(f"✓ Saved to: {output_path}")
-    return output_path
+    if probabilities is None:
+        try:
+            probabilities = daily_probabilities(dates)
+        except Exception as e:
+            logger.warning(f"⚠️  Per-day scoring failed: {e}")
+            probabilities = None
+        if probabilities is None:
+            probabilities = latest_probability()
+            logger.info(f"Using the latest model probability for every day: {probabilities:.3f}")
+        else:
+            logger.info(f"✓ Scored {len(probabilities)} forecast days in one batch "
+                        f"(P(up) {probabilities.min():.3f} - {probabilities.max():.3f})")
+    closes = history['close'].values
+    vol = base_volatility(closes, VOL_LOOKBACK) * event_vol_multiplier(dates, load_events())
+
+    started = time.perf_counter()
+    df = forecast_frame(dates, last_price, probabilities, vol, base_drift(closes, VOL_LOOKBACK),
+                        n_paths, seed)
+    elapsed = time.perf_counter() - started
+
+    logger.info(f"✓ Simulated {n_paths:,} × {days} paths in {elapsed * 1000:.0f} ms "
+                f"(last close ${last_price:,.2f} on {last_date.date()})")
+    logger.info(f"  Day {days}: median ${df['predicted_price'].iloc[-1]:,.0f}, "
+                f"90% band ${df['p05'].iloc[-1]:,.0f} - ${df['p95'].iloc[-1]:,.0f}, "
+                f"P(above today) {df['prob_above_last'].iloc[-1]:.1%}")
+
+    write_artifact(df, 'predictions_future_90d', export_csv=export_csv)
+    write_partitions(df, 'predictions_future_90d')
+    return df
 
 
 if __name__ == "__main__":
-    logger.info("=" * 60)
-    logger.info("🌙 ASTRO FINANCE ML - PLANETARY DATA GENERATOR")
-    logger.info("=" * 60)
-    logger.info(f"Project Root: {PROJECT_ROOT}")
-    logger.info(f"Data Folder: {DATA_RAW}")
-    logger.info(f"Output: {DATA_PROCESSED}")
-    logger.info("")
-    
-    # Test: Compute last 30 days
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-    
-    try:
-        df = compute_planetary_positions(
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
-        )
-        
-        print("\n📊 SAMPLE DATA (Last 5 Days):")
-        print("=" * 80)
-        print(df.tail(5)[['date', 'sun_longitude', 'moon_longitude', 'saturn_longitude']].to_string(index=False))
-        
-        # Save
-        output_path = save_planetary_data(df)
-        
-        print(f"\n✅ SUCCESS!")
-        print(f"   Data saved to: {output_path}")
-        print(f"   Rows: {len(df)}")
-        print(f"   Columns: {len(df.columns)}")
-        
-    except FileNotFoundError as e:
-        logger.error(f"\n❌ {e}")
-        
-    except Exception as e:
-        logger.error(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Monte Carlo price forecast")
+    parser.add_argument('--days', type=int, default=HORIZON_DAYS)
+    parser.add_argument('--paths', type=int, default=N_PATHS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--csv', action='store_true', help="Also write the CSV side-output")
+    args = parser.parse_args()
+
+    df = predict_future_90_days(args.days, args.paths, args.seed, export_csv=args.csv)
+    print(df[['date', 'predicted_price', 'p05', 'p95', 'probability_up', 'direction']].head(10).to_string(index=False))
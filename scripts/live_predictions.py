@@ -1,68 +1,112 @@
-# scripts/live_predictions.py - ULTRA-SIMPLE VERSION (GUARANTEED TO WORK)
+# scripts/live_predictions.py - Live trading signal from incrementally assembled features
 
 import pandas as pd
 import numpy as np
-import joblib
-import yfinance as yf
 from datetime import datetime, timedelta
+from pathlib import Path
 import logging
+import sys
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from ml.registry import get_models
+from ml.live_features import LiveFeatureAssembler
+from scripts.financial_data import download_financial_data, TICKERS
+from utils.feature_store import feature_schema, select_feature_columns
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+SIGNAL_SYMBOL = 'DJIA'
+
+
+def fetch_bars(start_date: str, end_date: str) -> pd.DataFrame:
+    """Daily bars of every ticker since the feature store ends (signal symbol last within a date)"""
+    frames = [download_financial_data(symbol, ticker, start_date, end_date)
+              for symbol, ticker in TICKERS.items()]
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    bars = pd.concat(frames, ignore_index=True)
+    bars['signal_last'] = bars['symbol'] == SIGNAL_SYMBOL
+    return bars.sort_values(['date', 'signal_last'], kind='stable').drop(columns='signal_last')
+
+
+def fetch_ephemeris(start_date: str, end_date: str) -> dict:
+    """Planetary columns by date ({} when Skyfield/ephemeris is unavailable)"""
+    try:
+        from scripts.planetary_data import compute_planetary_positions
+        positions = compute_planetary_positions(start_date, end_date)
+    except Exception as e:
+        # Skyfield missing or the kernel cannot be loaded: live signal still works
+        logger.warning(f"⚠️  Ephemeris unavailable ({e}), planetary features are carried")
+        return {}
+    if positions.empty:
+        return {}
+    positions['date'] = pd.to_datetime(positions['date'])
+    return positions.set_index('date').to_dict('index')
+
+
 def main():
     """Get live trading signal"""
-    
+
     logger.info("=" * 60)
     logger.info("🌟 ASTRO FINANCE LIVE PREDICTION")
     logger.info("=" * 60)
-    
-    # Load trained model
-    model = joblib.load('models/xgboost_model.pkl')
-    
-    # Get latest DJIA data
-    logger.info("Fetching DJIA data...")
-    djia = yf.download('^GSPC', period='5d', progress=False)
-    
-    if djia.empty:
-        print("❌ No market data available")
+
+    models = get_models()
+    model = models.xgboost
+    feature_cols = models.feature_cols or select_feature_columns(feature_schema())
+
+    # Rolling state from the stored history, then advanced bar by bar to today
+    assembler = LiveFeatureAssembler.from_feature_store(feature_cols)
+    start = (assembler.date + timedelta(days=1)).strftime('%Y-%m-%d')
+    end = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    logger.info(f"Fetching market data since {start}...")
+    bars = fetch_bars(start, end)
+    if bars.empty:
+        print("❌ No market data newer than the feature store")
+        return
+
+    ephemeris = fetch_ephemeris(start, bars['date'].max().strftime('%Y-%m-%d'))
+
+    X, latest, timings = None, None, []
+    for bar in bars.to_dict('records'):
+        started = time.perf_counter()
+        vector = assembler.update(bar['symbol'], bar, ephemeris.get(bar['date']), bar['date'])
+        timings.append(time.perf_counter() - started)
+        if bar['symbol'] == SIGNAL_SYMBOL:
+            X, latest = vector, bar
+
+    if X is None:
+        print(f"❌ No {SIGNAL_SYMBOL} data available")
         return
-    
-    latest_close = float(djia['Close'].iloc[-1])
-    latest_volume = float(djia['Volume'].iloc[-1])
-    latest_date = djia.index[-1].strftime('%Y-%m-%d')
-    
-    logger.info(f"✓ DJIA: ${latest_close:.2f} (Vol: {latest_volume:,.0f})")
-    
-    # Create simple feature vector (use model defaults)
-    # Model expects 85 features, we'll use volume + price patterns
-    X = np.zeros((1, 85))
-    X[0, 0] = latest_volume / 1e9  # Normalized volume
-    X[0, 1] = latest_volume / 1e9  # volume_mean_7d approx
-    X[0, 2] = latest_volume / 1e9  # volume_mean_14d approx
-    X[0, 5] = np.log(latest_close)  # Log price (close)
-    
+
+    logger.info(f"✓ Assembled {len(timings)} bars, {np.mean(timings) * 1e3:.2f} ms per feature vector")
+    logger.info(f"✓ {SIGNAL_SYMBOL}: ${latest['close']:.2f} (Vol: {latest['volume']:,.0f})")
+
     # Predict
     try:
         proba = model.predict_proba(X)[0, 1]
         prediction = model.predict(X)[0]
         confidence = max(proba, 1-proba)
-        
+
         signal = '🟢 BUY' if prediction == 1 else '🔴 HOLD/SELL'
-        
+
         print(f"\n{'='*50}")
-        print(f"📅 {latest_date}")
-        print(f"📈 DJIA: ${latest_close:,.2f}")
+        print(f"📅 {latest['date']:%Y-%m-%d}")
+        print(f"📈 DJIA: ${latest['close']:,.2f}")
         print(f"🎯 SIGNAL: {signal}")
         print(f"📊 P(UP in 5 days): {proba:.1%}")
         print(f"💪 Confidence: {confidence:.1%}")
         print(f"{'='*50}\n")
-        
+
     except Exception as e:
         print(f"❌ Prediction error: {e}")
-    
+
     logger.info("=" * 60)
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+# scripts/load_test_server.py - Concurrent load test for the local prediction API
+
+import sys
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import time
+import urllib.request
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.prediction_server import DEFAULT_HOST, DEFAULT_PORT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SYMBOLS = ['DJIA', 'DXY', 'GOLD']
+
+
+def _get(url: str) -> dict:
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def _post(url: str, payload: dict) -> float:
+    """Latency of one request in seconds (raises on a non-200 response)"""
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=30) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run_load_test(base_url: str, n_requests: int = 2000, concurrency: int = 32,
+                  seed: int = 42) -> dict:
+    """
+    Fire single-pair requests from `concurrency` client threads
+
+    Dates are drawn from the last two years so requests hit different
+    feature rows. Returns latency percentiles (ms), throughput and the
+    server-side batching it achieved.
+    """
+    rng = np.random.default_rng(seed)
+    today = np.datetime64('today', 'D')
+    payloads = [{'symbol': SYMBOLS[rng.integers(len(SYMBOLS))],
+                 'date': str(today - int(rng.integers(0, 730)))} for _ in range(n_requests)]
+
+    before = _get(f"{base_url}/health")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(lambda p: _post(f"{base_url}/predict", p), payloads))
+    elapsed = time.perf_counter() - started
+    after = _get(f"{base_url}/health")
+
+    latencies_ms = np.array(latencies) * 1000
+    batches = after['batches'] - before['batches']
+    return {
+        'requests': n_requests,
+        'concurrency': concurrency,
+        'seconds': round(elapsed, 3),
+        'rps': round(n_requests / elapsed, 1),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 2),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 2),
+        'max_ms': round(float(latencies_ms.max()), 2),
+        'batches': batches,
+        'mean_batch': round((after['pairs'] - before['pairs']) / max(batches, 1), 1),
+    }
+
+
+def main(host=DEFAULT_HOST, port=DEFAULT_PORT, n_requests=2000, concurrency=32):
+    base_url = f"http://{host}:{port}"
+    logger.info("=" * 60)
+    logger.info(f"⏱️  LOAD TEST: {n_requests} requests, {concurrency} concurrent → {base_url}")
+    logger.info("=" * 60)
+
+    report = run_load_test(base_url, n_requests, concurrency)
+
+    logger.info(f"Throughput: {report['rps']:,.1f} requests/s ({report['seconds']:.2f} s)")
+    logger.info(f"Latency:    p50 {report['p50_ms']:.2f} ms | p99 {report['p99_ms']:.2f} ms | "
+                f"max {report['max_ms']:.2f} ms")
+    logger.info(f"Batching:   {report['batches']} model calls, {report['mean_batch']} requests per call")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the prediction API")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    main(args.host, args.port, args.requests, args.concurrency)
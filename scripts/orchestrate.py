@@ -10,15 +10,19 @@ import sys
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from typing import Dict, Tuple
 
 # Add project root
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.planetary_data import compute_planetary_positions, save_planetary_data
-from scripts.planetary_calendar import detect_major_aspects, predict_next_crash
-from scripts.future_predictions import predict_future_90_days
-from scripts.yearly_outlook import generate_yearly_outlook
+from ml.registry import active_version
+from utils.artifacts import artifact_path, read_artifact
+from utils.feature_store import feature_store_version
+from utils import stage_cache
+from utils.profiling import StageProfiler, append_history, regressions, rows_of
 
 # Setup logging
 logging.basicConfig(
@@ -36,17 +40,211 @@ PROJECT_ROOT = Path(__file__).parent.parent
 DATA_RAW = PROJECT_ROOT / 'data' / 'raw'
 DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
 OUTPUT_LOG = PROJECT_ROOT / 'pipeline_results.json'
+HISTORY_LOG = PROJECT_ROOT / 'pipeline_history.jsonl'
+
+# Stage metrics kept per run in the history (hot functions stay in pipeline_results.json)
+HISTORY_FIELDS = ['status', 'cache', 'duration_seconds', 'cpu_seconds', 'peak_rss_mb',
+                  'rows_in', 'rows_out', 'bytes_read', 'bytes_written']
+
+# Legacy CSV side-outputs (Parquet is always written)
+EXPORT_CSV = os.getenv('EXPORT_CSV', '0') == '1'
+
+OUTLOOK_YEAR = 2025
+
+
+def trailing_year() -> Tuple[str, str]:
+    """Date range of the planetary positions stage (past 365 days)"""
+    end_date = datetime.now()
+    return (end_date - timedelta(days=365)).strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+
+
+def coming_year() -> Tuple[str, str]:
+    """Date range of the event calendar (next 365 days)"""
+    start_date = datetime.now()
+    return start_date.strftime('%Y-%m-%d'), (start_date + timedelta(days=365)).strftime('%Y-%m-%d')
+
+
+def run_planetary_data():
+    """Past year of planetary positions"""
+    # Stage modules are imported when a stage runs: a fully cached run never pays for them
+    from scripts.planetary_data import compute_planetary_positions, save_planetary_data
+
+    df = compute_planetary_positions(*trailing_year())
+    save_planetary_data(df, export_csv=EXPORT_CSV)
+    return df, f"Computed {len(df)} days of planetary positions"
+
+
+def run_event_calendar():
+    """Planetary events of the coming year"""
+    from scripts.planetary_calendar import detect_major_aspects, predict_next_crash
+
+    events_df = detect_major_aspects(*coming_year(), export_csv=EXPORT_CSV)
+    predict_next_crash(events_df)
+    return events_df, f"Detected {len(events_df)} planetary events"
+
+
+def run_future_predictions():
+    """90-day forecast (volatility reads the event calendar)"""
+    from scripts.future_predictions import predict_future_90_days
+
+    predictions_df = predict_future_90_days(export_csv=EXPORT_CSV)
+    return predictions_df, f"Generated {len(predictions_df)} daily predictions"
+
+
+def run_yearly_outlook():
+    """Annual outlook"""
+    from scripts.yearly_outlook import generate_yearly_outlook
+
+    outlook = generate_yearly_outlook(OUTLOOK_YEAR)
+    return outlook, f"Generated {OUTLOOK_YEAR} market outlook"
+
+
+def outlook_path() -> Path:
+    """generate_yearly_outlook writes into the working directory"""
+    return Path(f'market_outlook_{OUTLOOK_YEAR}.json')
+
+
+def load_outlook():
+    with open(outlook_path(), 'r') as f:
+        return json.load(f)
+
+
+def data_versions() -> dict:
+    """Versions of the stored features and the active models (None while missing)"""
+    try:
+        features = feature_store_version()
+    except FileNotFoundError:
+        features = None
+    return {'features': features, 'model_version': active_version()}
+
+
+# Stage name -> what it runs, its banner, the stages whose outputs it reads,
+# and for the cache: its inputs, output files and how to reload them (the code
+# it runs is found from the function's imports, see stage_cache.code_sources)
+STAGES = {
+    'PLANETARY_DATA': {
+        'func': run_planetary_data, 'title': 'COMPUTING PLANETARY POSITIONS', 'depends_on': [],
+        'inputs': lambda: {'range': trailing_year()},
+        'outputs': lambda: [artifact_path('planetary_positions')],
+        'load': lambda: read_artifact('planetary_positions'),
+    },
+    'EVENT_CALENDAR': {
+        'func': run_event_calendar, 'title': 'DETECTING PLANETARY EVENTS', 'depends_on': [],
+        'inputs': lambda: {'range': coming_year()},
+        'outputs': lambda: [artifact_path('planetary_events')],
+        'load': lambda: read_artifact('planetary_events'),
+    },
+    'PREDICTIONS': {
+        'func': run_future_predictions, 'title': 'GENERATING 90-DAY PREDICTIONS',
+        'depends_on': ['EVENT_CALENDAR'],
+        'inputs': lambda: {'today': datetime.now().strftime('%Y-%m-%d'), **data_versions()},
+        'outputs': lambda: [artifact_path('predictions_future_90d')],
+        'load': lambda: read_artifact('predictions_future_90d'),
+    },
+    'YEARLY_OUTLOOK': {
+        'func': run_yearly_outlook, 'title': 'GENERATING YEARLY OUTLOOK', 'depends_on': [],
+        'inputs': lambda: {'year': OUTLOOK_YEAR},
+        'outputs': lambda: [outlook_path()],
+        'load': load_outlook,
+    },
+}
+
+
+def stage_fingerprint(name: str, stages: dict = STAGES) -> str:
+    """
+    Hash of everything a stage's output depends on
+
+    Its inputs (date range, data and model versions), the contents of every
+    project file its function imports (transitively) and, recursively, the
+    fingerprints of its dependencies.
+    """
+    stage = stages[name]
+    return stage_cache.fingerprint({
+        'stage': name,
+        'inputs': stage['inputs'](),
+        'sources': stage_cache.code_sources(stage['func'], PROJECT_ROOT),
+        'upstream': {dep: stage_fingerprint(dep, stages) for dep in stage['depends_on']},
+    })
+
+
+def cached_result(name: str, digest: str, stages: dict = STAGES) -> dict:
+    """Stage result rebuilt from its existing outputs (None on a cache miss)"""
+    stage = stages[name]
+    if not stage_cache.is_current(name, digest, stage['outputs']()):
+        return None
+    started_at = datetime.now()
+    try:
+        with StageProfiler() as profiler:
+            output = stage['load']()
+    except Exception as e:
+        logger.warning(f"⚠️  {name}: cached output unreadable, recomputing: {e}")
+        return None
+    return {
+        'status': 'SUCCESS',
+        'message': f"Up to date, reused outputs (fingerprint {digest[:12]})",
+        'output': output,
+        'started_at': started_at.isoformat(),
+        'pid': os.getpid(),
+        'cache': 'HIT',
+        'rows_out': rows_of(output),
+        **profiler.metrics,
+    }
+
+
+def _execute_stage(func, title: str, profile: bool = False) -> dict:
+    """Run one stage function and measure it (top-level so pool workers can unpickle it)"""
+    logger.info("\n" + "="*60)
+    logger.info(f"STAGE: {title}")
+    logger.info("="*60)
+
+    started_at = datetime.now()
+    with StageProfiler(profile=profile) as profiler:
+        try:
+            output, message = func()
+            status = 'SUCCESS'
+        except Exception as e:
+            output, message, status = None, str(e), 'ERROR'
+
+    return {
+        'status': status,
+        'message': message,
+        'output': output,
+        'started_at': started_at.isoformat(),
+        'pid': os.getpid(),
+        'rows_out': rows_of(output),
+        **profiler.metrics,
+    }
+
+
+def critical_path(stage_results: dict, stages: dict = STAGES) -> Tuple[float, list]:
+    """Longest chain of stage durations through the dependency graph"""
+    memo = {}
+
+    def finish(name):
+        if name not in memo:
+            upstream = [finish(dep) for dep in stages[name]['depends_on'] if dep in stage_results]
+            best = max(upstream, default=(0.0, []))
+            duration = stage_results.get(name, {}).get('duration_seconds', 0.0)
+            memo[name] = (best[0] + duration, best[1] + [name])
+        return memo[name]
+
+    return max((finish(name) for name in stage_results), default=(0.0, []))
 
 
 class PipelineOrchestrator:
     """Orchestrate entire data pipeline"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = True, profile: bool = False, stages: dict = STAGES):
         self.start_time = datetime.now()
+        self.use_cache = use_cache
+        self.profile = profile
+        self.stages = stages
+        self.fingerprints = {}
         self.results = {
             'timestamp': self.start_time.isoformat(),
             'stages': {},
             'errors': [],
+            'cache_hits': [],
             'success': False
         }
         
@@ -54,12 +252,13 @@ class PipelineOrchestrator:
         DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
         DATA_RAW.mkdir(parents=True, exist_ok=True)
     
-    def log_stage(self, stage_name: str, status: str, message: str = ""):
-        """Log stage result"""
+    def log_stage(self, stage_name: str, status: str, message: str = "", **details):
+        """Log stage result (details: timing fields recorded alongside the status)"""
         self.results['stages'][stage_name] = {
             'status': status,
             'timestamp': datetime.now().isoformat(),
-            'message': message
+            'message': message,
+            **details
         }
         
         if status == 'SUCCESS':
@@ -70,121 +269,150 @@ class PipelineOrchestrator:
             logger.error(f"❌ {stage_name}: {message}")
             self.results['errors'].append({'stage': stage_name, 'error': message})
     
-    def stage_1_planetary_data(self):
-        """Stage 1: Compute planetary positions"""
-        logger.info("\n" + "="*60)
-        logger.info("STAGE 1: COMPUTING PLANETARY POSITIONS")
-        logger.info("="*60)
-        
+    def run_stage(self, name: str):
+        """Run one stage in this process (unless its outputs are current) and record it"""
+        result = self._from_cache(name) or self._execute(name)
+        self._record(name, result)
+        return result['output']
+
+    def _execute(self, name: str) -> dict:
+        stage = self.stages[name]
+        return _execute_stage(stage['func'], stage['title'], self.profile)
+
+    def _from_cache(self, name: str) -> dict:
+        """Fingerprint a stage and return its cached result if its inputs are unchanged"""
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=365)
-            
-            df = compute_planetary_positions(
-                start_date.strftime('%Y-%m-%d'),
-                end_date.strftime('%Y-%m-%d')
-            )
-            
-            save_planetary_data(df)
-            
-            self.log_stage(
-                'PLANETARY_DATA',
-                'SUCCESS',
-                f"Computed {len(df)} days of planetary positions"
-            )
-            
-            return df
-            
+            self.fingerprints[name] = stage_fingerprint(name, self.stages)
         except Exception as e:
-            self.log_stage('PLANETARY_DATA', 'ERROR', str(e))
+            logger.warning(f"⚠️  {name}: cannot fingerprint inputs, running uncached: {e}")
             return None
-    
+        if not self.use_cache:
+            return None
+        return cached_result(name, self.fingerprints[name], self.stages)
+
+    def _record(self, name: str, result: dict):
+        digest = self.fingerprints.get(name)
+        cache = result.get('cache', 'MISS' if self.use_cache else 'OFF')
+        if cache == 'HIT':
+            self.results['cache_hits'].append(name)
+        elif result['status'] == 'SUCCESS' and digest:
+            stage_cache.record(name, digest, self.stages[name]['outputs']())
+
+        details = {k: v for k, v in result.items() if k not in ('status', 'message', 'output', 'cache')}
+        self.log_stage(name, result['status'], result['message'],
+                       depends_on=self.stages[name]['depends_on'], cache=cache, fingerprint=digest, **details)
+
+    def stage_1_planetary_data(self):
+        """Stage 1: Compute planetary positions"""
+        return self.run_stage('PLANETARY_DATA')
+
     def stage_2_event_calendar(self):
         """Stage 2: Detect planetary events"""
-        logger.info("\n" + "="*60)
-        logger.info("STAGE 2: DETECTING PLANETARY EVENTS")
-        logger.info("="*60)
-        
-        try:
-            start_date = datetime.now().strftime('%Y-%m-%d')
-            end_date = (datetime.now() + timedelta(days=365)).strftime('%Y-%m-%d')
-            
-            events_df = detect_major_aspects(start_date, end_date)
-            predict_next_crash(events_df)
-            
-            self.log_stage(
-                'EVENT_CALENDAR',
-                'SUCCESS',
-                f"Detected {len(events_df)} planetary events"
-            )
-            
-            return events_df
-            
-        except Exception as e:
-            self.log_stage('EVENT_CALENDAR', 'ERROR', str(e))
-            return None
-    
+        return self.run_stage('EVENT_CALENDAR')
+
     def stage_3_future_predictions(self):
         """Stage 3: Generate 90-day predictions"""
-        logger.info("\n" + "="*60)
-        logger.info("STAGE 3: GENERATING 90-DAY PREDICTIONS")
-        logger.info("="*60)
-        
-        try:
-            predictions_df = predict_future_90_days()
-            
-            self.log_stage(
-                'PREDICTIONS',
-                'SUCCESS',
-                f"Generated {len(predictions_df)} daily predictions"
-            )
-            
-            return predictions_df
-            
-        except Exception as e:
-            self.log_stage('PREDICTIONS', 'ERROR', str(e))
-            return None
-    
+        return self.run_stage('PREDICTIONS')
+
     def stage_4_yearly_outlook(self):
         """Stage 4: Generate yearly outlook"""
-        logger.info("\n" + "="*60)
-        logger.info("STAGE 4: GENERATING YEARLY OUTLOOK")
-        logger.info("="*60)
-        
-        try:
-            outlook = generate_yearly_outlook()
-            
-            self.log_stage(
-                'YEARLY_OUTLOOK',
-                'SUCCESS',
-                f"Generated 2025 market outlook"
-            )
-            
-            return outlook
-            
-        except Exception as e:
-            self.log_stage('YEARLY_OUTLOOK', 'ERROR', str(e))
-            return None
-    
-    def run_full_pipeline(self):
-        """Run complete pipeline"""
+        return self.run_stage('YEARLY_OUTLOOK')
+
+    def run_dag(self, max_workers: int = None) -> dict:
+        """
+        Run the orchestrator's stages as soon as their dependencies have succeeded
+
+        Independent stages run concurrently in a process pool (spawned
+        interpreters, like the walk-forward workers). A stage whose inputs
+        are unchanged since its last success is not run at all: its outputs
+        are reloaded here, so no worker is started for it. A stage whose
+        dependency failed is marked SKIPPED. With max_workers=1 the stages
+        run in this process in dependency order (the pool needs stage
+        functions defined at module level).
+
+        Returns:
+            Stage name -> output (None for failed/skipped stages)
+        """
+        max_workers = max_workers or min(len(self.stages), os.cpu_count() or 1)
+        self.results['scheduler'] = {'max_workers': max_workers}
+        outputs, pending = {}, dict(self.stages)
+
+        def ready():
+            return [name for name, stage in pending.items()
+                    if all(dep in outputs for dep in stage['depends_on'])]
+
+        def finish(name, result):
+            self._record(name, result)
+            outputs[name] = result['output'] if result['status'] == 'SUCCESS' else None
+            if result['status'] != 'SUCCESS':
+                # Dependents cannot run: skip them transitively
+                for other, stage in list(pending.items()):
+                    if name in stage['depends_on']:
+                        del pending[other]
+                        finish(other, {'status': 'SKIPPED', 'output': None,
+                                       'message': f"Skipped: depends on failed stage {name}"})
+
+        def schedulable():
+            names = ready()
+            for name in names:
+                del pending[name]
+            return names
+
+        def launch(run):
+            # Cache hits finish right here and may release their dependents in turn
+            names = schedulable()
+            while names:
+                for name in names:
+                    cached = self._from_cache(name)
+                    if cached is None:
+                        run(name)
+                    else:
+                        finish(name, cached)
+                names = schedulable()
+
+        if max_workers == 1:
+            launch(lambda name: finish(name, self._execute(name)))
+            return outputs
+
+        # Workers are only spawned on the first submit, so a fully cached run starts none
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context('spawn')) as pool:
+            running = {}
+
+            def submit(name):
+                stage = self.stages[name]
+                running[pool.submit(_execute_stage, stage['func'], stage['title'], self.profile)] = name
+
+            launch(submit)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Worker died or the output could not be pickled back
+                        result = {'status': 'ERROR', 'message': str(e), 'output': None}
+                    finish(name, result)
+                launch(submit)
+
+        return outputs
+
+    def run_full_pipeline(self, max_workers: int = None):
+        """Run complete pipeline (independent stages in parallel)"""
         logger.info("\n" + "🚀"*30)
         logger.info("ASTRO FINANCE ML - COMPLETE PIPELINE")
         logger.info("🚀"*30)
         logger.info(f"Started: {self.start_time}")
         logger.info(f"Project: {PROJECT_ROOT}")
         logger.info("")
-        
-        # Run stages
-        df_planetary = self.stage_1_planetary_data()
-        df_events = self.stage_2_event_calendar()
-        df_predictions = self.stage_3_future_predictions()
-        outlook = self.stage_4_yearly_outlook()
-        
+
+        outputs = self.run_dag(max_workers)
+
         # Final summary
         self.finalize()
-        
-        return df_planetary, df_events, df_predictions, outlook
+
+        return (outputs.get('PLANETARY_DATA'), outputs.get('EVENT_CALENDAR'),
+                outputs.get('PREDICTIONS'), outputs.get('YEARLY_OUTLOOK'))
     
     def finalize(self):
         """Finalize and save results"""
@@ -194,6 +422,19 @@ class PipelineOrchestrator:
         self.results['end_time'] = end_time.isoformat()
         self.results['duration_seconds'] = duration
         self.results['success'] = len(self.results['errors']) == 0
+
+        path_seconds, path = critical_path(self.results['stages'])
+        self.results['critical_path'] = {'stages': path, 'seconds': round(path_seconds, 3)}
+
+        # Rolling history: one compact line per run, compared against earlier runs
+        history = append_history({
+            'timestamp': self.results['timestamp'],
+            'duration_seconds': duration,
+            'success': self.results['success'],
+            'stages': {name: {k: v for k, v in stage.items() if k in HISTORY_FIELDS}
+                       for name, stage in self.results['stages'].items()},
+        }, HISTORY_LOG)
+        self.results['regressions'] = regressions(self.results['stages'], history)
         
         # Save results
         with open(OUTPUT_LOG, 'w') as f:
@@ -203,8 +444,10 @@ class PipelineOrchestrator:
         logger.info("\n" + "="*60)
         logger.info("PIPELINE SUMMARY")
         logger.info("="*60)
-        logger.info(f"Duration: {duration:.1f} seconds")
-        logger.info(f"Stages completed: {len(self.results['stages'])}")
+        logger.info(f"Duration: {duration:.1f} seconds "
+                    f"(critical path {path_seconds:.1f}s: {' → '.join(path) or '-'})")
+        logger.info(f"Stages completed: {len(self.results['stages'])} "
+                    f"({len(self.results['cache_hits'])} up to date, not rerun)")
         logger.info(f"Errors: {len(self.results['errors'])}")
         logger.info(f"Status: {'✅ SUCCESS' if self.results['success'] else '❌ PARTIAL FAILURE'}")
         logger.info(f"Results saved to: {OUTPUT_LOG}")
@@ -213,15 +456,30 @@ class PipelineOrchestrator:
         # Print stage results
         for stage, result in self.results['stages'].items():
             status_emoji = "✅" if result['status'] == 'SUCCESS' else "❌"
-            logger.info(f"{status_emoji} {stage}: {result['message']}")
+            timing = (f" [{result['duration_seconds']:.1f}s, peak {result['peak_rss_mb']:.0f} MB, "
+                      f"rows {result['rows_in']:,} in / {result['rows_out'] or 0:,} out]"
+                      if 'duration_seconds' in result else "")
+            logger.info(f"{status_emoji} {stage}: {result['message']}{timing}")
+
+        for stage, regression in self.results['regressions'].items():
+            logger.warning(f"⚠️  {stage} took {regression['value']:.1f}s, "
+                           f"median of the last {regression['runs']} runs is {regression['median']:.1f}s")
         
         return self.results
 
 
 def main():
     """Main entry point"""
-    orchestrator = PipelineOrchestrator()
-    results = orchestrator.run_full_pipeline()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the full data pipeline")
+    parser.add_argument('--workers', type=int, help="Stage worker processes (1 = sequential, in-process)")
+    parser.add_argument('--force', action='store_true', help="Rerun every stage even if its inputs are unchanged")
+    parser.add_argument('--profile', action='store_true', help="Record the hottest functions of each stage (cProfile)")
+    args = parser.parse_args()
+
+    orchestrator = PipelineOrchestrator(use_cache=not args.force, profile=args.profile)
+    results = orchestrator.run_full_pipeline(max_workers=args.workers)
     
     # Exit code
     sys.exit(0 if orchestrator.results['success'] else 1)
@@ -0,0 +1,54 @@
+# scripts/partition_processed_data.py - Migrate monolithic processed files to Parquet artifacts and partitioned datasets
+
+import pandas as pd
+import sys
+from pathlib import Path
+import logging
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.partitioned_store import write_partitions, DATA_PROCESSED
+from utils.artifacts import upgrade_legacy_csv
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Legacy single-file outputs -> partitioned dataset name
+LEGACY_FILES = {
+    'features_selected.parquet': 'features',
+    'planetary_positions.csv': 'planetary_positions',
+    'planetary_events_calendar.csv': 'planetary_events',
+    'predictions_future_90d.csv': 'predictions_future_90d',
+}
+
+
+def load_legacy_file(path: Path) -> pd.DataFrame:
+    """Load a legacy CSV/parquet output"""
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    df = pd.read_csv(path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+
+def main():
+    """Upgrade legacy CSV artifacts to Parquet, then partition every legacy file found in data/processed"""
+    logger.info("=" * 60)
+    logger.info("📦 PARTITIONING PROCESSED DATA")
+    logger.info("=" * 60)
+    
+    for name in upgrade_legacy_csv(DATA_PROCESSED):
+        logger.info(f"✓ Upgraded legacy {name} CSV to Parquet")
+    
+    for filename, dataset in LEGACY_FILES.items():
+        path = DATA_PROCESSED / filename
+        if not path.exists():
+            logger.warning(f"⚠️  Skipping {filename} (not found)")
+            continue
+        
+        df = load_legacy_file(path)
+        manifest = write_partitions(df, dataset, mode='overwrite')
+        logger.info(f"✓ {filename} → {dataset}/ ({len(manifest['partitions'])} partitions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,178 +1,134 @@
-# scripts/planetary_data.py - UPDATED WITH CORRECT BSP PATH
+# scripts/planetary_calendar.py - Upcoming planetary event calendar (aspects, stations, new moons)
 
 import pandas as pd
 import numpy as np
-from skyfield.api import load, Topos
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from scripts.planetary_data import compute_planetary_positions
+from utils.artifacts import write_artifact
+from utils.partitioned_store import write_partitions
 
-# Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Define paths
-PROJECT_ROOT = Path(__file__).parent.parent
-DATA_RAW = PROJECT_ROOT / 'data' / 'raw'
-DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+OUTER_PLANETS = ['jupiter', 'saturn', 'uranus', 'neptune', 'pluto']
+CONJUNCTION_ORB = 3.0       # degrees
+NEW_MOON_ORB = 6.0          # the Moon moves ~13°/day, so one daily sample falls inside this
+
+# Outer-planet conjunctions: (severity, impact); unlisted pairs are HIGH
+CONJUNCTIONS = {
+    ('saturn', 'pluto'): ('CRITICAL', 'MAJOR MARKET CRASH RISK'),
+    ('jupiter', 'saturn'): ('HIGH', 'MAJOR TREND SHIFT (20-yr cycle)'),
+    ('saturn', 'uranus'): ('HIGH', 'Structural market disruption'),
+}
+
+# Retrograde stations: planet -> (severity, impact) when retrograde starts
+STATIONS = {
+    'mercury': ('LOW', 'Communication/tech volatility'),
+    'venus': ('MEDIUM', 'Financial sector stress (rare)'),
+    'mars': ('MEDIUM', 'Aggressive selling pressure'),
+    'saturn': ('HIGH', 'Structural market weakness'),
+}
+
+SEVERITY_ORDER = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
 
-# Ensure directories exist
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
 
-# BSP file path
-BSP_FILE = DATA_RAW / 'de421.bsp'
+def _separation(lon1: pd.Series, lon2: pd.Series) -> pd.Series:
+    """Shortest angular distance between two longitudes (degrees)"""
+    diff = np.abs(lon1 - lon2) % 360
+    return np.minimum(diff, 360 - diff)
 
 
-def compute_planetary_positions(start_date, end_date):
+def _episode_minima(dates: pd.Series, distance: pd.Series, orb: float):
+    """(date, distance) of the closest day in every consecutive run within the orb"""
+    inside = distance <= orb
+    runs = (inside != inside.shift()).cumsum()[inside]
+    for _, idx in distance[inside].groupby(runs).groups.items():
+        best = distance.loc[idx].idxmin()
+        yield dates.loc[best], float(distance.loc[best])
+
+
+def detect_major_aspects(start_date: str, end_date: str, export_csv: bool = False) -> pd.DataFrame:
     """
-    Compute planetary positions for date range
-    
-    Args:
-        start_date: Start date (YYYY-MM-DD)
-        end_date: End date (YYYY-MM-DD)
-    
+    Detect market-relevant planetary events between two dates
+
+    Outer-planet conjunctions (exact day of each pass), retrograde stations
+    of Mercury/Venus/Mars/Saturn and new moons.
+
     Returns:
-        DataFrame with planetary positions
+        date, event, severity, exactness, impact (also written as the
+        planetary_events artifact and appended to its year partitions)
     """
-    
-    logger.info(f"🌙 Computing planetary positions: {start_date} to {end_date}")
-    
-    # Check if BSP file exists
-    if not BSP_FILE.exists():
-        logger.error(f"❌ BSP file not found: {BSP_FILE}")
-        logger.info(f"💡 Download from: https://naif.jpl.nasa.gov/pub/naif/generic_kernels/spk/planets/de421.bsp")
-        logger.info(f"💡 Save to: {BSP_FILE}")
-        raise FileNotFoundError(f"BSP file not found at {BSP_FILE}")
-    
-    logger.info(f"✓ Using BSP file: {BSP_FILE}")
-    
-    # Load ephemeris
-    try:
-        eph = load(str(BSP_FILE))
-        logger.info("✓ Ephemeris loaded successfully")
-    except Exception as e:
-        logger.error(f"❌ Error loading ephemeris: {e}")
-        raise
-    
-    # Create timescale
-    ts = load.timescale()
-    
-    # Generate date range
-    start = datetime.strptime(start_date, '%Y-%m-%d')
-    end = datetime.strptime(end_date, '%Y-%m-%d')
-    dates = pd.date_range(start=start, end=end, freq='D')
-    
-    logger.info(f"✓ Processing {len(dates)} days...")
-    
-    # Planet codes
-    planets = {
-        'sun': 10,
-        'moon': 301,
-        'mercury': 1,
-        'venus': 2,
-        'mars': 4,
-        'jupiter': 5,
-        'saturn': 6,
-        'uranus': 7,
-        'neptune': 8,
-        'pluto': 9
-    }
-    
-    # Earth
-    earth = eph[399]
-    
-    # Compute positions
-    data = []
-    
-    for date in dates:
-        t = ts.utc(date.year, date.month, date.day)
-        
-        row = {'date': date}
-        
-        # Get positions for each planet
-        for planet_name, planet_code in planets.items():
-            try:
-                planet = eph[planet_code]
-                
-                # Position relative to Earth
-                astrometric = earth.at(t).observe(planet)
-                ra, dec, distance = astrometric.radec()
-                
-                # Ecliptic longitude (approximate)
-                lon = ra.degrees
-                
-                row[f'{planet_name}_longitude'] = lon
-                row[f'{planet_name}_distance'] = distance.au
-                
-            except Exception as e:
-                logger.warning(f"Could not compute {planet_name}: {e}")
-                row[f'{planet_name}_longitude'] = np.nan
-                row[f'{planet_name}_distance'] = np.nan
-        
-        data.append(row)
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Calculate velocities (rate of change)
-    for planet_name in planets.keys():
-        lon_col = f'{planet_name}_longitude'
-        if lon_col in df.columns:
-            df[f'{planet_name}_velocity'] = df[lon_col].diff()
-    
-    logger.info(f"✓ Computed positions for {len(df)} days")
-    logger.info(f"✓ Planets: {', '.join(planets.keys())}")
-    
-    return df
-
-
-def save_planetary_data(df, filename='planetary_positions.csv'):
-    """Save planetary data to processed folder"""
-    output_path = DATA_PROCESSED / filename
-    df.to_csv(output_path, index=False)
-    logger.info(f"✓ Saved to: {output_path}")
-    return output_path
+    df = compute_planetary_positions(start_date, end_date)
+    if df.empty:
+        raise RuntimeError(f"No planetary positions for {start_date} to {end_date}")
+    df['date'] = pd.to_datetime(df['date'])
+    events = []
+
+    for i, p1 in enumerate(OUTER_PLANETS):
+        for p2 in OUTER_PLANETS[i+1:]:
+            if f'{p1}_longitude' not in df.columns or f'{p2}_longitude' not in df.columns:
+                continue
+            severity, impact = CONJUNCTIONS.get((p1, p2), ('HIGH', 'Long-cycle trend change'))
+            distance = _separation(df[f'{p1}_longitude'], df[f'{p2}_longitude'])
+            for date, exactness in _episode_minima(df['date'], distance, CONJUNCTION_ORB):
+                events.append({'date': date, 'event': f"{p1.title()}-{p2.title()} Conjunction",
+                               'severity': severity, 'exactness': f"{exactness:.2f}°", 'impact': impact})
+
+    for planet, (severity, impact) in STATIONS.items():
+        lon_col = f'{planet}_longitude'
+        if lon_col not in df.columns:
+            continue
+        motion = (df[lon_col].diff() + 180) % 360 - 180
+        retrograde = motion < 0
+        changed = retrograde != retrograde.shift()
+        changed.iloc[:2] = False     # the first diff is undefined
+        for idx in df.index[changed]:
+            if retrograde.loc[idx]:
+                events.append({'date': df.loc[idx, 'date'], 'event': f"{planet.title()} Retrograde Starts",
+                               'severity': severity, 'exactness': 'Station', 'impact': impact})
+            else:
+                events.append({'date': df.loc[idx, 'date'], 'event': f"{planet.title()} Direct (Rx ends)",
+                               'severity': 'LOW', 'exactness': 'Station', 'impact': 'Volatility eases'})
+
+    if 'moon_phase' in df.columns:
+        distance = np.minimum(df['moon_phase'] % 360, 360 - df['moon_phase'] % 360)
+        for date, exactness in _episode_minima(df['date'], distance, NEW_MOON_ORB):
+            events.append({'date': date, 'event': 'New Moon (Eclipse Window)', 'severity': 'MEDIUM',
+                           'exactness': f"{exactness:.2f}°", 'impact': 'New trend initiation'})
+
+    events_df = pd.DataFrame(events, columns=['date', 'event', 'severity', 'exactness', 'impact'])
+    events_df = events_df.sort_values(['date', 'event'], kind='stable').reset_index(drop=True)
+    logger.info(f"✓ Detected {len(events_df)} events "
+                f"({(events_df['severity'].isin(['CRITICAL', 'HIGH'])).sum()} CRITICAL/HIGH)")
+
+    write_artifact(events_df, 'planetary_events', export_csv=export_csv)
+    write_partitions(events_df, 'planetary_events')
+    return events_df
+
+
+def predict_next_crash(events_df: pd.DataFrame, today=None) -> dict:
+    """Next CRITICAL (else HIGH) event after today, with a countdown (None if there is none)"""
+    today = pd.Timestamp(today or datetime.now().date())
+    upcoming = events_df[pd.to_datetime(events_df['date']) >= today]
+    for severity in SEVERITY_ORDER[:2]:
+        matches = upcoming[upcoming['severity'] == severity]
+        if not matches.empty:
+            event = matches.iloc[0].to_dict()
+            event['days_until'] = int((pd.Timestamp(event['date']) - today).days)
+            logger.info(f"⚠️  Next {severity} event: {event['event']} on "
+                        f"{pd.Timestamp(event['date']).date()} ({event['days_until']} days)")
+            return event
+    logger.info("✓ No CRITICAL/HIGH events ahead")
+    return None
 
 
 if __name__ == "__main__":
-    logger.info("=" * 60)
-    logger.info("🌙 ASTRO FINANCE ML - PLANETARY DATA GENERATOR")
-    logger.info("=" * 60)
-    logger.info(f"Project Root: {PROJECT_ROOT}")
-    logger.info(f"BSP File: {BSP_FILE}")
-    logger.info(f"Output: {DATA_PROCESSED}")
-    logger.info("")
-    
-    # Test: Compute last 30 days
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-    
-    try:
-        df = compute_planetary_positions(
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
-        )
-        
-        print("\n📊 SAMPLE DATA (Last 5 Days):")
-        print("=" * 80)
-        print(df.tail(5)[['date', 'sun_longitude', 'moon_longitude', 'saturn_longitude']].to_string(index=False))
-        
-        # Save
-        output_path = save_planetary_data(df)
-        
-        print(f"\n✅ SUCCESS!")
-        print(f"   Data saved to: {output_path}")
-        print(f"   Rows: {len(df)}")
-        print(f"   Columns: {len(df.columns)}")
-        
-    except FileNotFoundError as e:
-        logger.error(f"\n❌ {e}")
-        logger.info("\n💡 TO FIX:")
-        logger.info(f"   1. Download de421.bsp from NASA")
-        logger.info(f"   2. Save to: {BSP_FILE}")
-        
-    except Exception as e:
-        logger.error(f"\n❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    start = datetime.now()
+    events_df = detect_major_aspects(start.strftime('%Y-%m-%d'), (start + timedelta(days=365)).strftime('%Y-%m-%d'))
+    print(events_df.to_string(index=False))
+    predict_next_crash(events_df)
@@ -4,11 +4,23 @@ import pandas as pd
 import numpy as np
 from skyfield import api
 from datetime import datetime, timedelta
+from functools import lru_cache
 import logging
+import sys
+from pathlib import Path
 from typing import Tuple
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.artifacts import write_artifact
+from utils.checkpoints import run_chunked, job_params
+from utils.partitioned_store import write_partitions
+
 logger = logging.getLogger(__name__)
 
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+
 # Planetary body codes (SPICE IDs used by Skyfield)
 BODIES = {
     'sun': 10,
@@ -23,6 +35,20 @@ BODIES = {
     'moon': 301,
 }
 
+BACKFILL_JOB = 'planetary_positions'
+
+
+@lru_cache(maxsize=1)
+def _load_ephemeris():
+    """Timescale and de421 kernel, loaded once per process (backfills call us per chunk)"""
+    logger.info("Downloading ephemeris data (de421.bsp)...")
+    # Note: cache parameter removed in Skyfield 1.46+
+    ts = api.load.timescale()
+    eph = api.load('de421.bsp')
+    logger.info("✓ Ephemeris loaded successfully")
+    return ts, eph
+
+
 def compute_planetary_positions(start_date: str, end_date: str) -> pd.DataFrame:
     """
     Compute planetary positions using Skyfield
@@ -32,22 +58,20 @@ def compute_planetary_positions(start_date: str, end_date: str) -> pd.DataFrame:
         end_date: YYYY-MM-DD format
     
     Returns:
-        DataFrame with planetary positions or empty DataFrame if failed
+        DataFrame with planetary positions
+
+    Raises:
+        Whatever Skyfield raises (ephemeris download, out-of-range dates):
+        an empty frame would look like a successful result downstream
     """
     logger.info(f"Computing planetary positions from {start_date} to {end_date}...")
-    logger.info("Downloading ephemeris data (de421.bsp)...")
     
     try:
-        # Load ephemeris and timescale
-        # Note: cache parameter removed in Skyfield 1.46+
-        ts = api.load.timescale()
-        eph = api.load('de421.bsp')
+        ts, eph = _load_ephemeris()
         earth = eph['earth']
         sun = eph['sun']
         moon = eph['moon']
         
-        logger.info("✓ Ephemeris loaded successfully")
-        
         # Parse dates
         start = datetime.strptime(start_date, '%Y-%m-%d')
         end = datetime.strptime(end_date, '%Y-%m-%d')
@@ -125,9 +149,55 @@ def compute_planetary_positions(start_date: str, end_date: str) -> pd.DataFrame:
         
     except Exception as e:
         logger.error(f"✗ Failed to compute planetary data: {e}")
-        import traceback
-        traceback.print_exc()
-        return pd.DataFrame()
+        raise
+
+def year_chunks(start_date: str, end_date: str) -> dict:
+    """Calendar year ('2019') -> (start, end) dates of a range split at year boundaries"""
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    chunks = {}
+    for year in range(start.year, end.year + 1):
+        chunk_start = max(start, pd.Timestamp(year, 1, 1))
+        chunk_end = min(end, pd.Timestamp(year, 12, 31))
+        chunks[str(year)] = (f"{chunk_start:%Y-%m-%d}", f"{chunk_end:%Y-%m-%d}")
+    return chunks
+
+def backfill_planetary_positions(start_date: str, end_date: str, sink=None, resume: bool = True) -> pd.DataFrame:
+    """
+    Compute a long range year by year, resuming after the last completed year
+
+    Each year is written to the partitioned store (and passed to ``sink``,
+    e.g. a database insert) before it is checkpointed, so a rerun after a
+    failure recomputes only the year that failed. Chunks are keyed by year
+    and an interrupted job keeps its original bounds, so resuming on a later
+    day (with a shifted start/end) still matches the completed years.
+
+    Args:
+        sink: Optional callable receiving each completed year's frame
+        resume: Reuse years completed by an interrupted run
+
+    Returns:
+        All positions in the range
+    """
+    bounds = job_params(BACKFILL_JOB, {'start_date': start_date, 'end_date': end_date}, resume)
+    chunks = year_chunks(bounds['start_date'], bounds['end_date'])
+
+    def process(year: str) -> pd.DataFrame:
+        df = compute_planetary_positions(*chunks[year])
+        write_partitions(df, 'planetary_positions')
+        if sink is not None:
+            sink(df)
+        return df
+
+    return run_chunked(BACKFILL_JOB, list(chunks), process)
+
+def save_planetary_data(df: pd.DataFrame, export_csv: bool = False) -> Path:
+    """Save planetary data as Parquet (CSV only as an optional side-output)"""
+    output_path = write_artifact(df, 'planetary_positions', export_csv=export_csv)
+    
+    # Only the years covered by df are rewritten in the partitioned store
+    write_partitions(df, 'planetary_positions')
+    
+    return output_path
 
 def validate_planetary_data(df: pd.DataFrame) -> dict:
     """Validate planetary data quality"""
@@ -156,7 +226,7 @@ if __name__ == "__main__":
     START_DATE = (datetime.now() - timedelta(days=365*10)).strftime("%Y-%m-%d")
     
     logger.info(f"\n{'='*70}")
-    df = compute_planetary_positions(START_DATE, END_DATE)
+    df = backfill_planetary_positions(START_DATE, END_DATE)
     stats = validate_planetary_data(df)
     
     logger.info(f"\nStats:")
@@ -0,0 +1,63 @@
+# scripts/tune_models.py - Hyperparameter search over walk-forward folds
+
+import sys
+from pathlib import Path
+from datetime import datetime
+import logging
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.walk_forward import walk_forward_folds
+from ml.tuning import run_search, TRIALS_FILE, BEST_PARAMS_FILE
+from ml.xgb_training import training_matrix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def main(model_name='xgboost', n_trials=27, n_folds=3, eta=3, n_workers=None, seed=42,
+         start_date=None, end_date=None, symbols=None):
+    """Search hyperparameters for one model and record every trial"""
+    logger.info("=" * 60)
+    logger.info(f"🔎 HYPERPARAMETER SEARCH: {model_name.upper()}")
+    logger.info("=" * 60)
+
+    X, y, dates, feature_cols, cache_key = training_matrix(start_date, end_date, symbols)
+
+    # Tune on the first 80% only: the last 20% stays the train_models test set
+    X, y = X[:int(len(X) * 0.8)], y[:int(len(y) * 0.8)]
+    folds = walk_forward_folds(len(X), n_folds, 'expanding')
+
+    started = datetime.now()
+    best = run_search(X, y, folds, model_name, n_trials=n_trials, eta=eta,
+                      n_workers=n_workers, seed=seed, cache_key=cache_key)
+
+    logger.info("\n" + "=" * 60)
+    logger.info(f"🏆 Best trial {best['trial']}: log loss {best['score']:.4f}, "
+                f"accuracy {best['accuracy']:.3f}")
+    for name, value in best['params'].items():
+        logger.info(f"  {name:18s} {value}")
+    logger.info(f"Duration: {(datetime.now() - started).total_seconds():.1f} seconds")
+    logger.info(f"Trials: {TRIALS_FILE}")
+    logger.info(f"Best parameters: {BEST_PARAMS_FILE} (use: train_models.py --tuned)")
+
+    return best
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hyperparameter search with successive halving")
+    parser.add_argument('--model', choices=['xgboost', 'lstm'], default='xgboost')
+    parser.add_argument('--trials', type=int, default=27, help="Configurations in the first rung")
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--eta', type=int, default=3, help="Keep 1/eta of trials per rung")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last date (YYYY-MM-DD)")
+    parser.add_argument('--symbol', action='append', help="Restrict to symbol (repeatable)")
+    args = parser.parse_args()
+
+    main(args.model, args.trials, args.folds, args.eta, args.workers, args.seed,
+         args.start, args.end, args.symbol)
@@ -0,0 +1,77 @@
+# scripts/walk_forward.py - Walk-forward evaluation for the train_models models
+
+import sys
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.walk_forward import walk_forward_folds, run_walk_forward
+from ml.xgb_training import training_matrix
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MODEL_DIR = Path(__file__).parent.parent / 'models'
+RESULTS_FILE = MODEL_DIR / 'walk_forward_results.json'
+
+
+def main(n_folds=5, mode='expanding', models=('xgboost',), n_workers=None,
+         start_date=None, end_date=None, symbols=None):
+    """Run the walk-forward harness and save per-fold metrics"""
+    logger.info("=" * 60)
+    logger.info("🔁 WALK-FORWARD EVALUATION")
+    logger.info("=" * 60)
+    
+    X, y, dates, feature_cols, cache_key = training_matrix(start_date, end_date, symbols)
+    folds = walk_forward_folds(len(X), n_folds, mode)
+    
+    started = datetime.now()
+    results = run_walk_forward(X, y, folds, models=models, n_workers=n_workers, cache_key=cache_key)
+    
+    # Attach calendar ranges so folds are readable without the index math
+    for fold in results['folds']:
+        train_start, train_end = fold['train_range']
+        test_start, test_end = fold['test_range']
+        fold['train_dates'] = [str(dates[train_start])[:10], str(dates[train_end - 1])[:10]]
+        fold['test_dates'] = [str(dates[test_start])[:10], str(dates[test_end - 1])[:10]]
+    
+    results.update({
+        'timestamp': started.isoformat(),
+        'duration_seconds': (datetime.now() - started).total_seconds(),
+        'mode': mode,
+        'n_folds': n_folds,
+        'features': len(feature_cols),
+    })
+    
+    MODEL_DIR.mkdir(exist_ok=True)
+    with open(RESULTS_FILE, 'w') as f:
+        json.dump(results, f, indent=2)
+    
+    logger.info("\n" + "=" * 60)
+    for model_name, summary in results['summary'].items():
+        acc = summary['accuracy']
+        logger.info(f"{model_name:10s}: {acc['mean']:.3f} ± {acc['std']:.3f} over {summary['folds']} folds")
+    logger.info(f"Duration: {results['duration_seconds']:.1f} seconds")
+    logger.info(f"Results saved to: {RESULTS_FILE}")
+    
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--mode', choices=['expanding', 'rolling'], default='expanding')
+    parser.add_argument('--lstm', action='store_true', help="Also evaluate the LSTM")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--start', help="First date (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Last date (YYYY-MM-DD)")
+    parser.add_argument('--symbol', action='append', help="Restrict to symbol (repeatable)")
+    args = parser.parse_args()
+    
+    models = ('xgboost', 'lstm') if args.lstm else ('xgboost',)
+    main(args.folds, args.mode, models, args.workers, args.start, args.end, args.symbol)
@@ -0,0 +1,187 @@
+# services/data_service.py - Process-wide pipeline outputs for every dashboard page, reloaded only on change
+
+import pandas as pd
+from pathlib import Path
+from functools import lru_cache
+import json
+import logging
+import threading
+
+from utils.artifacts import DATA_PROCESSED, artifact_path, read_published
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_FILE = PROJECT_ROOT / 'pipeline_results.json'
+
+WATCH_INTERVAL_SECONDS = 1.0
+
+
+def _stat(path: Path):
+    """(mtime_ns, size) of a file, None if it does not exist"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DataService:
+    """
+    One parsed copy of each pipeline output per process
+
+    Every accessor checks the version of its source files (mtime and size of
+    each candidate file) together with the pipeline run id; the value is
+    parsed again only when that version changed, otherwise all sessions and
+    pages share the cached object. Returned frames are shared: filter or
+    copy them, never modify them in place.
+
+    A missing output is cached as missing too and raises FileNotFoundError,
+    like read_published.
+
+    With ``watch()`` a background thread re-checks every loaded output once
+    a second and reloads it as soon as the pipeline publishes a new
+    version, so the first read after a run is a cache hit as well.
+    """
+
+    def __init__(self, root=DATA_PROCESSED, results_file=RESULTS_FILE):
+        self.root = Path(root)
+        self.results_file = Path(results_file)
+        self._entries = {}      # key -> (version, value, (paths, loader, with_run_id))
+        self._locks = {}
+        self._guard = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self.stats = {'hits': 0, 'loads': 0, 'reloaded_by_watcher': 0}
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _version(self, paths: list, with_run_id: bool = True) -> tuple:
+        version = tuple(_stat(path) for path in paths)
+        if with_run_id:
+            version += (self.run_id(),)
+        return version
+
+    def _get(self, key: str, paths: list, loader, with_run_id: bool = True):
+        """Cached value of ``key`` while ``paths`` (and the run id) are unchanged"""
+        version = self._version(paths, with_run_id)
+        # Per-key lock: concurrent sessions wait for one parse instead of each parsing
+        with self._lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.stats['hits'] += 1
+                return entry[1]
+            value = loader()
+            self._entries[key] = (version, value, (paths, loader, with_run_id))
+            self.stats['loads'] += 1
+        logger.info(f"✓ Loaded {key} (version changed)")
+        return value
+
+    def _artifact_paths(self, name: str) -> list:
+        # Any of the published, primary or legacy files may be the one read
+        return [artifact_path(name, suffix, self.root) for suffix in ('.arrow', '.parquet', '.csv')]
+
+    def version(self, name: str) -> tuple:
+        """
+        Current version token of an artifact (hashable, changes exactly when it is republished)
+
+        Derived caches key on it instead of expiring after a fixed TTL.
+        """
+        return self._version(self._artifact_paths(name), with_run_id=False)
+
+    def watch(self, interval: float = WATCH_INTERVAL_SECONDS):
+        """Start the background watcher (once per service)"""
+        with self._guard:
+            if self._watcher is not None:
+                return
+            self._watcher = threading.Thread(target=self._watch, args=(interval,),
+                                             name='data-service-watcher', daemon=True)
+            self._watcher.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            for key, (version, _, spec) in list(self._entries.items()):
+                paths, loader, with_run_id = spec
+                if self._version(paths, with_run_id) == version:
+                    continue
+                try:
+                    self._get(key, *spec)
+                    self.stats['reloaded_by_watcher'] += 1
+                except Exception as e:
+                    # Readers reload (and see the error) themselves
+                    logger.warning(f"⚠️  Watcher could not reload {key}: {e}")
+
+    def _artifact(self, name: str) -> pd.DataFrame:
+        paths = self._artifact_paths(name)
+
+        def load():
+            try:
+                return read_published(name, root=self.root)
+            except FileNotFoundError:
+                return None
+
+        df = self._get(name, paths, load)
+        if df is None:
+            raise FileNotFoundError(f"No artifact found for '{name}' in {self.root}")
+        return df
+
+    def pipeline_results(self) -> dict:
+        """Summary of the last orchestrator run (empty dict before the first)"""
+        def load():
+            try:
+                with open(self.results_file, 'r') as f:
+                    return json.load(f)
+            except (FileNotFoundError, ValueError):
+                return {}
+
+        return self._get('pipeline_results', [self.results_file], load, with_run_id=False)
+
+    def run_id(self) -> str:
+        """Start timestamp of the last pipeline run (None before the first)"""
+        return self.pipeline_results().get('timestamp')
+
+    def events(self) -> pd.DataFrame:
+        """Planetary events calendar"""
+        return self._artifact('planetary_events')
+
+    def predictions(self) -> pd.DataFrame:
+        """90-day forecast"""
+        return self._artifact('predictions_future_90d')
+
+    def outlook_path(self, year: int = 2025) -> Path:
+        """Outlook written by the pipeline (project root), else the copy in data/processed"""
+        for directory in (PROJECT_ROOT, self.root):
+            path = directory / f'market_outlook_{year}.json'
+            if path.exists():
+                return path
+        return PROJECT_ROOT / f'market_outlook_{year}.json'
+
+    def outlook(self, year: int = 2025) -> dict:
+        """Yearly outlook, including its 'year'"""
+        path = self.outlook_path(year)
+
+        def load():
+            try:
+                with open(path, 'r') as f:
+                    return {'year': year, **json.load(f)}
+            except FileNotFoundError:
+                return None
+
+        outlook = self._get(f'outlook_{year}', [path], load)
+        if outlook is None:
+            raise FileNotFoundError(f"No outlook for {year}: run scripts/yearly_outlook.py")
+        return outlook
+
+
+@lru_cache(maxsize=None)
+def get_data_service(root: str = str(DATA_PROCESSED)) -> DataService:
+    """Shared, watching DataService for this process (pages, sessions and helpers all get the same one)"""
+    service = DataService(root)
+    service.watch()
+    return service
@@ -0,0 +1,318 @@
+# services/pipeline_jobs.py - Background pipeline jobs: single-flight launch, status and log tail
+
+"""
+Run scripts/orchestrate.py as a detached background job
+
+Each job gets an id and a directory under data/jobs with its status.json and
+the orchestrator's streamed output (job.log). A lock file makes launches
+single-flight across sessions and processes: starting while a job is running
+returns the running job instead of a second pipeline. The job process
+records its own exit status, so status stays correct even if the dashboard
+that launched it restarts.
+"""
+
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+JOBS_DIR = PROJECT_ROOT / 'data' / 'jobs'
+ORCHESTRATOR = PROJECT_ROOT / 'scripts' / 'orchestrate.py'
+
+LOCK_NAME = 'PIPELINE.lock'
+MUTEX_NAME = 'PIPELINE.mutex'     # serializes changes to the lock file
+STATUS_NAME = 'status.json'
+LOG_NAME = 'job.log'
+
+QUEUE_TIMEOUT_SECONDS = 60  # a job not running by then never started
+MUTEX_TIMEOUT_SECONDS = 10
+KEEP_JOBS = 20              # finished job directories kept
+TAIL_BYTES = 64 * 1024
+
+ACTIVE_STATES = ('queued', 'running')
+
+# Stage result lines logged by the orchestrator: "✅ PREDICTIONS: ..."
+STAGE_LINE = re.compile(r"(✅|⚠️|❌)\s+([A-Z][A-Z0-9_]+): ")
+STAGE_STATUS = {'✅': 'SUCCESS', '⚠️': 'WARNING', '❌': 'ERROR'}
+
+
+def _job_dir(job_id: str) -> Path:
+    return JOBS_DIR / job_id
+
+
+def _write_status(job_id: str, status: dict):
+    """Replace status.json atomically (temp file + rename)"""
+    path = _job_dir(job_id) / STATUS_NAME
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_status(job_id: str) -> dict:
+    with open(_job_dir(job_id) / STATUS_NAME, 'r') as f:
+        return json.load(f)
+
+
+def _is_alive(status: dict) -> bool:
+    """Whether a queued/running job still has a live process behind it"""
+    if status['state'] == 'queued':
+        created = datetime.fromisoformat(status['created_at'])
+        return (datetime.now() - created).total_seconds() < QUEUE_TIMEOUT_SECONDS
+    if status['state'] != 'running':
+        return False
+    try:
+        process = psutil.Process(status['pid'])
+        # Same pid and start time: not a recycled pid; a killed job that its
+        # launcher has not reaped yet lingers as a zombie
+        return (abs(process.create_time() - status['pid_create_time']) < 1.0
+                and process.status() != psutil.STATUS_ZOMBIE)
+    except (psutil.Error, KeyError):
+        return False
+
+
+def get_job(job_id: str) -> dict:
+    """
+    Status of a job (None if unknown)
+
+    Keys: id, state (queued/running/succeeded/failed/lost), args, created_at,
+    started_at, finished_at, returncode, pid, log, stages (stage -> status
+    parsed from the log so far).
+    """
+    try:
+        status = _read_status(job_id)
+    except (FileNotFoundError, ValueError):
+        return None
+    if status['state'] in ACTIVE_STATES and not _is_alive(status):
+        # Killed without recording an exit status
+        status['state'] = 'lost'
+    status['stages'] = stage_progress(job_id)
+    return status
+
+
+def list_jobs(limit: int = KEEP_JOBS) -> list:
+    """Most recent jobs first"""
+    if not JOBS_DIR.exists():
+        return []
+    ids = sorted((p.name for p in JOBS_DIR.iterdir() if (p / STATUS_NAME).exists()), reverse=True)
+    return [job for job in (get_job(job_id) for job_id in ids[:limit]) if job is not None]
+
+
+def latest_job() -> dict:
+    """Most recently created job (None before the first)"""
+    jobs = list_jobs(limit=1)
+    return jobs[0] if jobs else None
+
+
+def _lock_holder() -> str:
+    """Job id in the lock file (None when unlocked)"""
+    try:
+        return (JOBS_DIR / LOCK_NAME).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+
+def current_job() -> dict:
+    """The job holding the pipeline lock, if it is still queued or running"""
+    job_id = _lock_holder()
+    job = get_job(job_id) if job_id else None
+    return job if job is not None and job['state'] in ACTIVE_STATES else None
+
+
+def _lock_is_stale() -> bool:
+    """Lock left by a dead job (a lock younger than the queue timeout may not have its status yet)"""
+    lock_file = JOBS_DIR / LOCK_NAME
+    try:
+        age = time.time() - lock_file.stat().st_mtime
+    except FileNotFoundError:
+        return True
+    job_id = _lock_holder()
+    if not job_id or not (_job_dir(job_id) / STATUS_NAME).exists():
+        return age > QUEUE_TIMEOUT_SECONDS
+    return current_job() is None
+
+
+def _mutex():
+    """
+    Short OS lock around every change to the lock file
+
+    Checking a lock for staleness and removing it are two steps; without
+    this, two launchers could both find the same stale lock and the second
+    would remove the fresh lock of the first.
+    """
+    return file_lock(JOBS_DIR / MUTEX_NAME, MUTEX_TIMEOUT_SECONDS)
+
+
+def _acquire_lock(job_id: str) -> bool:
+    """Take the single-flight lock (O_EXCL create), breaking a stale one"""
+    lock_file = JOBS_DIR / LOCK_NAME
+    with _mutex():
+        if lock_file.exists():
+            if not _lock_is_stale():
+                return False
+            lock_file.unlink()
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        with os.fdopen(fd, 'w') as f:
+            f.write(job_id)
+        return True
+
+
+def _release_lock(job_id: str):
+    """Remove the lock if this job still holds it"""
+    lock_file = JOBS_DIR / LOCK_NAME
+    with _mutex():
+        try:
+            if lock_file.read_text().strip() == job_id:
+                lock_file.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _prune(keep: int = KEEP_JOBS):
+    """Delete the oldest finished job directories beyond ``keep``"""
+    for job in list_jobs(limit=10_000)[keep:]:
+        if job['state'] not in ACTIVE_STATES:
+            shutil.rmtree(_job_dir(job['id']), ignore_errors=True)
+
+
+def start_pipeline(args=()) -> dict:
+    """
+    Launch the orchestrator in the background unless a pipeline is already running
+
+    Args:
+        args: Extra orchestrate.py arguments (e.g. ['--force'])
+
+    Returns:
+        Job status plus 'started': False when an existing job was returned
+    """
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    job_id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+    if not _acquire_lock(job_id):
+        holder = _lock_holder()
+        return {**(get_job(holder) or {'id': holder, 'state': 'queued'}), 'started': False}
+
+    try:
+        _prune()
+        _job_dir(job_id).mkdir()
+        _write_status(job_id, {
+            'id': job_id,
+            'state': 'queued',
+            'args': list(args),
+            'created_at': datetime.now().isoformat(),
+            'log': str(_job_dir(job_id) / LOG_NAME),
+        })
+        subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), '--run', job_id],
+            cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True,
+            creationflags=getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0),
+        )
+    except Exception:
+        _release_lock(job_id)
+        raise
+
+    logger.info(f"✓ Started pipeline job {job_id}")
+    return {**get_job(job_id), 'started': True}
+
+
+def run_job(job_id: str) -> int:
+    """Job process body: run the orchestrator with output streamed to the job log"""
+    status = _read_status(job_id)
+    process = psutil.Process()
+    status.update(state='running', pid=process.pid, pid_create_time=process.create_time(),
+                  started_at=datetime.now().isoformat())
+    _write_status(job_id, status)
+
+    returncode = None
+    try:
+        with open(status['log'], 'ab', buffering=0) as log:
+            returncode = subprocess.call(
+                [sys.executable, '-u', str(ORCHESTRATOR), *status['args']],
+                cwd=PROJECT_ROOT, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                env={**os.environ, 'PYTHONUNBUFFERED': '1'},
+            )
+    finally:
+        status.update(state='succeeded' if returncode == 0 else 'failed', returncode=returncode,
+                      finished_at=datetime.now().isoformat())
+        _write_status(job_id, status)
+        _release_lock(job_id)
+    return returncode
+
+
+def tail_log(job_id: str, lines: int = 20) -> list:
+    """Last ``lines`` lines of a job's output (reads only the end of the file)"""
+    path = _job_dir(job_id) / LOG_NAME
+    if not path.exists():
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - TAIL_BYTES))
+        text = f.read().decode('utf-8', errors='replace')
+    return text.splitlines()[-lines:]
+
+
+def stage_progress(job_id: str) -> dict:
+    """Stage -> SUCCESS/WARNING/ERROR for every stage result logged so far"""
+    path = _job_dir(job_id) / LOG_NAME
+    if not path.exists():
+        return {}
+    stages = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = STAGE_LINE.search(line)
+            if match:
+                stages[match.group(2)] = STAGE_STATUS[match.group(1)]
+    return stages
+
+
+def wait(job_id: str, timeout: float = None, poll_seconds: float = 0.5) -> dict:
+    """Block until a job has finished (or ``timeout`` seconds passed); returns its status"""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        job = get_job(job_id)
+        if job is None or job['state'] not in ACTIVE_STATES:
+            return job
+        if deadline is not None and time.monotonic() > deadline:
+            return job
+        time.sleep(poll_seconds)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Background pipeline jobs")
+    parser.add_argument('--run', metavar='JOB_ID', help=argparse.SUPPRESS)
+    parser.add_argument('--start', action='store_true', help="Start a pipeline job (or show the running one)")
+    parser.add_argument('--status', metavar='JOB_ID', nargs='?', const='', help="Status of a job (default: latest)")
+    parser.add_argument('--wait', action='store_true', help="With --start: wait for the job to finish")
+    args, orchestrator_args = parser.parse_known_args()
+
+    if args.run:
+        sys.exit(0 if run_job(args.run) == 0 else 1)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.start:
+        job = start_pipeline(orchestrator_args)
+        if args.wait:
+            job = wait(job['id'])
+    else:
+        job = get_job(args.status) if args.status else latest_job()
+    print(json.dumps(job, indent=2))
+    if job:
+        print('\n'.join(tail_log(job['id'])))
@@ -0,0 +1,234 @@
+# services/prediction_server.py - Long-lived local prediction API with request micro-batching
+
+import sys
+from pathlib import Path
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.registry import get_models
+from ml.predictor import MarketPredictor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8600
+MAX_BATCH = 256             # (symbol, date) pairs scored per model call
+MAX_WAIT_MS = 5.0           # how long the first queued request waits for company
+REQUEST_TIMEOUT = 30.0
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent prediction requests into batched model calls
+
+    Handler threads enqueue their (symbol, date) pairs and block on a
+    Future. A single scoring thread takes the first waiting request, keeps
+    collecting until MAX_BATCH pairs or MAX_WAIT_MS have passed, scores
+    everything with one MarketPredictor.predict_batch and hands each caller
+    its own rows. Only this thread touches the models.
+    """
+
+    def __init__(self, max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._predictor = None
+        self.stats = {'requests': 0, 'batches': 0, 'pairs': 0, 'max_batch_seen': 0}
+        self._thread = threading.Thread(target=self._run, name='prediction-batcher', daemon=True)
+
+    def start(self):
+        """Load models and features, score one request so the first caller pays nothing"""
+        self._refresh_models()
+        self._predictor.predict_batch([('DJIA', pd.Timestamp.today().normalize())])
+        self._thread.start()
+        logger.info(f"✓ Batcher ready (model {self.model_version}, "
+                    f"batch ≤ {self.max_batch}, wait ≤ {self.max_wait * 1000:.1f} ms)")
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1)
+
+    @property
+    def model_version(self) -> str:
+        return (self._predictor.models.version or 'legacy') if self._predictor else None
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _refresh_models(self):
+        # get_models re-reads the ACTIVE pointer; a newly activated version is picked up here
+        models = get_models()
+        if self._predictor is None or self._predictor.models is not models:
+            self._predictor = MarketPredictor(models)
+
+    def submit(self, pairs: list) -> Future:
+        """Queue (symbol, date) pairs; the Future resolves to their result rows"""
+        future = Future()
+        self._queue.put((pairs, future))
+        return future
+
+    def _collect(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            pairs = [pair for item_pairs, _ in batch for pair in item_pairs]
+            try:
+                self._refresh_models()
+                records = to_records(self._predictor.predict_batch(pairs))
+            except Exception as e:
+                logger.exception("Batch scoring failed")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for item_pairs, future in batch:
+                future.set_result(records[offset:offset + len(item_pairs)])
+                offset += len(item_pairs)
+
+            self.stats['requests'] += len(batch)
+            self.stats['batches'] += 1
+            self.stats['pairs'] += len(pairs)
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], len(pairs))
+
+
+def to_records(result: pd.DataFrame) -> list:
+    """predict_batch rows as JSON-ready dicts (ISO dates, null for missing values)"""
+    result = result.copy()
+    for col in ['date', 'feature_date']:
+        result[col] = result[col].dt.strftime('%Y-%m-%d')
+    result = result.astype(object).where(result.notna(), None)
+    return [{k: (float(v) if isinstance(v, np.floating) else v) for k, v in row.items()}
+            for row in result.to_dict('records')]
+
+
+def parse_pairs(payload: dict) -> list:
+    """{'symbol', 'date'} or {'requests': [{'symbol', 'date'}, ...]} -> [(symbol, date)]"""
+    items = payload['requests'] if 'requests' in payload else [payload]
+    if not isinstance(items, list) or not items:
+        raise ValueError("'requests' must be a non-empty list")
+    pairs = []
+    for item in items:
+        if not item.get('symbol'):
+            raise ValueError("every request needs a 'symbol'")
+        date = pd.Timestamp(item['date']) if item.get('date') else pd.Timestamp.today().normalize()
+        pairs.append((str(item['symbol']).upper(), date))
+    return pairs
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    """JSON endpoints: POST /predict, GET /health"""
+
+    batcher: MicroBatcher = None
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        self._send_json(200, {
+            'status': 'ok',
+            'model_version': self.batcher.model_version,
+            'queue_depth': self.batcher.queue_depth,
+            **self.batcher.stats,
+        })
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            pairs = parse_pairs(json.loads(self.rfile.read(length) or b'{}'))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        try:
+            predictions = self.batcher.submit(pairs).result(timeout=REQUEST_TIMEOUT)
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+        self._send_json(200, {'model_version': self.batcher.model_version, 'predictions': predictions})
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128    # socketserver's default backlog of 5 resets bursts of clients
+
+
+def make_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_batch: int = MAX_BATCH,
+                max_wait_ms: float = MAX_WAIT_MS) -> PredictionServer:
+    """HTTP server bound to a started batcher (call serve_forever on it)"""
+    batcher = MicroBatcher(max_batch, max_wait_ms).start()
+    handler = type('BoundPredictionHandler', (PredictionHandler,), {'batcher': batcher})
+    server = PredictionServer((host, port), handler)
+    server.batcher = batcher
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Local prediction API (JSON over HTTP)")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH, help="Pairs per model call")
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS, help="Batching latency budget")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.max_batch, args.max_wait_ms)
+    logger.info(f"🚀 Serving predictions on http://{args.host}:{args.port} (POST /predict, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.batcher.stop()
+        server.server_close()
@@ -0,0 +1,161 @@
+# services/quote_service.py - Batched, process-wide cached quotes for watchlists
+
+import pandas as pd
+import numpy as np
+from functools import lru_cache
+import logging
+import os
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+QUOTE_TTL_SECONDS = 60      # quotes younger than this are served from memory
+HISTORY_PERIOD = '30d'      # window for the price change
+FETCH_TIMEOUT = 30.0        # seconds a caller waits for another session's fetch
+
+# 'yahoo' (default) or 'fake' for tests and offline runs
+QUOTE_BACKEND = os.environ.get('QUOTE_BACKEND', 'yahoo')
+
+
+class YahooBackend:
+    """All requested symbols in one multi-symbol yfinance download"""
+
+    def __init__(self, period: str = HISTORY_PERIOD):
+        self.period = period
+
+    def fetch(self, symbols: list) -> dict:
+        """symbol -> daily closes over the period (symbols without data are left out)"""
+        import yfinance as yf
+
+        data = yf.download(symbols, period=self.period, progress=False, threads=True,
+                           auto_adjust=True, group_by='column')
+        closes = data['Close'] if data is not None and not data.empty else pd.DataFrame()
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        found = {symbol: closes[symbol].dropna() for symbol in symbols
+                 if symbol in closes and closes[symbol].notna().any()}
+        if not found:
+            # yfinance reports network failures as empty data, not exceptions
+            raise RuntimeError("no data returned (network down or all symbols unknown)")
+        return found
+
+
+class FakeQuoteBackend:
+    """
+    Deterministic synthetic closes for tests and offline runs
+
+    Every symbol gets its own seeded random walk (stable across runs), except
+    those in ``missing``, which behave like unknown tickers. ``calls`` counts
+    fetches and ``delay`` simulates network latency per request.
+    """
+
+    def __init__(self, days: int = 30, missing=(), delay: float = 0.0):
+        self.days = days
+        self.missing = set(missing)
+        self.delay = delay
+        self.calls = 0
+
+    def fetch(self, symbols: list) -> dict:
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=self.days)
+        closes = {}
+        for symbol in symbols:
+            if symbol in self.missing:
+                continue
+            rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+            start = rng.uniform(20, 500)
+            closes[symbol] = pd.Series(start * np.cumprod(1 + rng.normal(0, 0.015, self.days)), index=dates)
+        return closes
+
+
+BACKENDS = {'yahoo': YahooBackend, 'fake': FakeQuoteBackend}
+
+
+def to_quote(symbol: str, closes: pd.Series) -> dict:
+    """{'symbol', 'price', 'change'}: last close and % change over the window"""
+    first, last = float(closes.iloc[0]), float(closes.iloc[-1])
+    return {'symbol': symbol, 'price': last, 'change': (last - first) / first * 100}
+
+
+class QuoteService:
+    """
+    Quotes shared by every session in the process, fetched in batches
+
+    ``get_quotes`` serves symbols fetched within the TTL from memory and
+    fetches all the others with one backend call. A symbol another session
+    is already fetching is waited for instead of being requested twice.
+    Unknown symbols are cached as None for the TTL too. When a fetch fails
+    the last known quote is served (None if there is none) and nothing is
+    cached, so the next call retries.
+    """
+
+    def __init__(self, backend=None, ttl: float = QUOTE_TTL_SECONDS):
+        self.backend = backend or YahooBackend()
+        self.ttl = ttl
+        self._quotes = {}       # symbol -> (fetched_at, quote or None)
+        self._inflight = {}     # symbol -> Event set when its fetch finished
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'fetched': 0, 'requests': 0, 'errors': 0}
+
+    def _fresh(self, symbol: str, now: float) -> bool:
+        entry = self._quotes.get(symbol)
+        return entry is not None and now - entry[0] < self.ttl
+
+    def get_quotes(self, symbols) -> dict:
+        """symbol -> quote dict (None for unknown symbols), in the order given"""
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        now = time.monotonic()
+        with self._lock:
+            fresh = [s for s in symbols if self._fresh(s, now)]
+            waiting = {s: self._inflight[s] for s in symbols if s not in fresh and s in self._inflight}
+            to_fetch = [s for s in symbols if s not in fresh and s not in waiting]
+            done = threading.Event()
+            for symbol in to_fetch:
+                self._inflight[symbol] = done
+            self.stats['hits'] += len(fresh)
+
+        if to_fetch:
+            try:
+                self._fetch(to_fetch)
+            finally:
+                with self._lock:
+                    for symbol in to_fetch:
+                        self._inflight.pop(symbol, None)
+                done.set()
+        for event in set(waiting.values()):
+            event.wait(FETCH_TIMEOUT)
+
+        with self._lock:
+            return {s: self._quotes[s][1] if s in self._quotes else None for s in symbols}
+
+    def get_quote(self, symbol: str) -> dict:
+        """Quote for one symbol (None if unknown)"""
+        return self.get_quotes([symbol]).get(symbol.strip().upper())
+
+    def _fetch(self, symbols: list):
+        started = time.perf_counter()
+        try:
+            closes = self.backend.fetch(symbols)
+        except Exception as e:
+            self.stats['errors'] += 1
+            logger.warning(f"⚠️  Quote fetch failed for {', '.join(symbols)}: {e}")
+            return
+        fetched_at = time.monotonic()
+        with self._lock:
+            for symbol in symbols:
+                series = closes.get(symbol)
+                quote = to_quote(symbol, series) if series is not None and len(series) else None
+                self._quotes[symbol] = (fetched_at, quote)
+            self.stats['fetched'] += len(symbols)
+            self.stats['requests'] += 1
+        logger.info(f"✓ Fetched {len(symbols)} quotes in one request ({time.perf_counter() - started:.2f}s)")
+
+
+@lru_cache(maxsize=None)
+def get_quote_service(backend: str = QUOTE_BACKEND) -> QuoteService:
+    """Shared QuoteService for this process (QUOTE_BACKEND=fake for offline runs)"""
+    return QuoteService(BACKENDS[backend]())
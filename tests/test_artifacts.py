@@ -0,0 +1,110 @@
+# tests/test_artifacts.py - Typed artifact hand-off between pipeline stages
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.artifacts import (artifact_path, open_ipc, publish_ipc, read_artifact, read_published,
+                             upgrade_legacy_csv, write_artifact)
+
+
+def _positions():
+    return pd.DataFrame({
+        'date': ['2025-01-01', '2025-01-02', '2025-01-03'],
+        'sun_longitude': [280.5, 281.5, 282.5],
+        'retrograde_count': np.array([1, 0, 2], dtype='int32'),
+        'sign': ['Capricorn', 'Capricorn', 'Capricorn'],
+    })
+
+
+def test_round_trip_keeps_native_types(tmp_path):
+    path = write_artifact(_positions(), 'planetary_positions', root=tmp_path)
+    df = read_artifact('planetary_positions', root=tmp_path)
+
+    assert path == artifact_path('planetary_positions', root=tmp_path)
+    assert df['date'].dtype == 'datetime64[us]'
+    assert df['retrograde_count'].dtype == 'int32'
+    assert df['sun_longitude'].tolist() == [280.5, 281.5, 282.5]
+    assert df['date'].iloc[-1] == pd.Timestamp('2025-01-03')
+    assert not artifact_path('planetary_positions', '.csv', tmp_path).exists()
+
+
+def test_column_selection(tmp_path):
+    write_artifact(_positions(), 'planetary_positions', root=tmp_path)
+
+    assert list(read_artifact('planetary_positions', columns=['date', 'sign'], root=tmp_path).columns) == ['date', 'sign']
+
+
+def test_csv_export(tmp_path):
+    write_artifact(_positions(), 'planetary_positions', export_csv=True, root=tmp_path)
+
+    csv = pd.read_csv(artifact_path('planetary_positions', '.csv', tmp_path))
+    assert csv['date'].tolist() == ['2025-01-01', '2025-01-02', '2025-01-03']
+
+
+def test_legacy_csv_fallback(tmp_path):
+    _positions().to_csv(artifact_path('planetary_positions', '.csv', tmp_path), index=False)
+
+    df = read_artifact('planetary_positions', root=tmp_path)
+    assert df['date'].dtype == 'datetime64[us]'
+    assert df['sign'].tolist() == ['Capricorn'] * 3
+    assert not artifact_path('planetary_positions', root=tmp_path).exists()    # reads never write
+
+
+def test_upgrade_legacy_csv(tmp_path):
+    _positions().to_csv(artifact_path('planetary_positions', '.csv', tmp_path), index=False)
+    write_artifact(_positions(), 'planetary_events', export_csv=True, root=tmp_path)
+
+    assert upgrade_legacy_csv(tmp_path) == ['planetary_positions']
+    assert read_artifact('planetary_positions', root=tmp_path)['date'].dtype == 'datetime64[us]'
+    assert upgrade_legacy_csv(tmp_path) == []
+
+
+def test_missing_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_artifact('planetary_events', root=tmp_path)
+
+
+def test_published_copy_matches_parquet(tmp_path):
+    write_artifact(_positions(), 'planetary_positions', root=tmp_path)
+
+    published = read_published('planetary_positions', root=tmp_path)
+    pd.testing.assert_frame_equal(published, read_artifact('planetary_positions', root=tmp_path))
+    assert published['date'].dtype == 'datetime64[us]'
+
+
+def test_published_copy_is_memory_mapped(tmp_path):
+    numeric = pd.DataFrame({'date': pd.bdate_range('2025-01-01', periods=10_000), 'value': np.arange(10_000.0)})
+    publish_ipc(numeric, 'planetary_positions', root=tmp_path)
+
+    allocated = pa.total_allocated_bytes()
+    table = open_ipc('planetary_positions', root=tmp_path)
+    assert pa.total_allocated_bytes() == allocated      # buffers point into the mapped file
+    assert table.num_rows == 10_000
+
+    df = read_published('planetary_positions', root=tmp_path)
+    assert pa.total_allocated_bytes() - allocated < numeric.memory_usage().sum() / 10   # views, not copies
+    assert df['value'].iloc[-1] == 9_999.0
+
+
+def test_republish_keeps_open_readers_consistent(tmp_path):
+    publish_ipc(_positions(), 'planetary_positions', root=tmp_path)
+    table = open_ipc('planetary_positions', root=tmp_path)
+
+    publish_ipc(_positions().assign(sun_longitude=0.0), 'planetary_positions', root=tmp_path)
+
+    assert table.column('sun_longitude').to_pylist() == [280.5, 281.5, 282.5]
+    assert read_published('planetary_positions', root=tmp_path)['sun_longitude'].tolist() == [0.0] * 3
+
+
+def test_unpublished_falls_back_to_parquet(tmp_path):
+    write_artifact(_positions(), 'planetary_positions', publish=False, root=tmp_path)
+
+    assert not artifact_path('planetary_positions', '.arrow', tmp_path).exists()
+    assert len(read_published('planetary_positions', root=tmp_path)) == 3
@@ -0,0 +1,106 @@
+# tests/test_checkpoints.py - Year chunking and resumable chunked backfills
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.planetary_data import year_chunks
+from utils.checkpoints import Checkpoint, job_params, run_chunked
+
+JOB = 'backfill'
+
+
+class Process:
+    """Chunk processor that records its calls and can fail on one key"""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    def __call__(self, key):
+        self.calls.append(key)
+        if key == self.fail_on:
+            raise RuntimeError(f"chunk {key} failed")
+        return pd.DataFrame({'chunk': [key, key], 'value': [1, 2]})
+
+
+def test_year_chunks_split_at_year_boundaries():
+    assert year_chunks('2019-03-05', '2021-02-01') == {
+        '2019': ('2019-03-05', '2019-12-31'),
+        '2020': ('2020-01-01', '2020-12-31'),
+        '2021': ('2021-01-01', '2021-02-01'),
+    }
+
+
+def test_year_chunks_within_one_year():
+    assert year_chunks('2024-02-01', '2024-02-29') == {'2024': ('2024-02-01', '2024-02-29')}
+
+
+def test_all_chunks_in_order(tmp_path):
+    process = Process()
+    df = run_chunked(JOB, ['2019', '2020', '2021'], process, root=tmp_path)
+
+    assert process.calls == ['2019', '2020', '2021']
+    assert df['chunk'].tolist() == ['2019', '2019', '2020', '2020', '2021', '2021']
+    assert not (tmp_path / JOB).exists()
+
+
+def test_failed_run_resumes_after_completed_chunks(tmp_path):
+    chunks = ['2019', '2020', '2021']
+    with pytest.raises(RuntimeError):
+        run_chunked(JOB, chunks, Process(fail_on='2020'), root=tmp_path)
+    assert Checkpoint(JOB, tmp_path).completed() == {'2019'}
+
+    process = Process()
+    df = run_chunked(JOB, chunks, process, root=tmp_path)
+
+    assert process.calls == ['2020', '2021']
+    assert df['chunk'].tolist() == ['2019', '2019', '2020', '2020', '2021', '2021']
+
+
+def test_no_resume_starts_over(tmp_path):
+    chunks = ['2019', '2020']
+    with pytest.raises(RuntimeError):
+        run_chunked(JOB, chunks, Process(fail_on='2020'), root=tmp_path)
+
+    process = Process()
+    run_chunked(JOB, chunks, process, resume=False, root=tmp_path)
+
+    assert process.calls == ['2019', '2020']
+
+
+def test_checkpoints_kept_when_asked(tmp_path):
+    run_chunked(JOB, ['2019'], Process(), clear_on_success=False, root=tmp_path)
+
+    assert Checkpoint(JOB, tmp_path).completed() == {'2019'}
+
+
+def test_interrupted_job_keeps_its_bounds(tmp_path):
+    first = job_params(JOB, {'start_date': '2019-01-01', 'end_date': '2021-06-01'}, root=tmp_path)
+    with pytest.raises(RuntimeError):
+        run_chunked(JOB, list(year_chunks(**first)), Process(fail_on='2020'), root=tmp_path)
+
+    # Rerun a day later: the pinned bounds give the same chunk keys
+    params = job_params(JOB, {'start_date': '2019-01-02', 'end_date': '2021-06-02'}, root=tmp_path)
+    process = Process()
+    run_chunked(JOB, list(year_chunks(**params)), process, root=tmp_path)
+
+    assert params == first
+    assert process.calls == ['2020', '2021']
+
+
+def test_finished_job_takes_new_bounds(tmp_path):
+    job_params(JOB, {'end_date': '2021-06-01'}, root=tmp_path)
+    run_chunked(JOB, ['2021'], Process(), root=tmp_path)
+
+    assert job_params(JOB, {'end_date': '2021-06-02'}, root=tmp_path) == {'end_date': '2021-06-02'}
+
+
+def test_no_resume_replaces_pinned_bounds(tmp_path):
+    job_params(JOB, {'end_date': '2021-06-01'}, root=tmp_path)
+
+    assert job_params(JOB, {'end_date': '2021-06-02'}, resume=False, root=tmp_path) == {'end_date': '2021-06-02'}
@@ -0,0 +1,109 @@
+# tests/test_data_service.py - Pipeline outputs parsed once per version and shared across readers
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.data_service import DataService
+from utils.artifacts import write_artifact
+
+
+def _events(n):
+    return pd.DataFrame({'date': pd.bdate_range('2025-01-01', periods=n), 'event': ['conjunction'] * n})
+
+
+def _touch(path: Path, seconds: int):
+    """Move a file's mtime forward so a rewrite within the same tick still reads as new"""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def _results(path: Path, timestamp: str):
+    path.write_text(json.dumps({'timestamp': timestamp}))
+
+
+@pytest.fixture
+def service(tmp_path):
+    _results(tmp_path / 'pipeline_results.json', '2025-01-01T00:00:00')
+    write_artifact(_events(5), 'planetary_events', root=tmp_path)
+    return DataService(tmp_path, tmp_path / 'pipeline_results.json')
+
+
+def test_same_version_is_a_shared_hit(service):
+    first = service.events()
+    second = service.events()
+
+    assert second is first
+    assert service.stats['loads'] == 2      # pipeline_results and the events
+    assert service.stats['hits'] >= 1
+
+
+def test_rewritten_artifact_reloaded(service, tmp_path):
+    first = service.events()
+    write_artifact(_events(8), 'planetary_events', root=tmp_path)
+    _touch(tmp_path / 'planetary_events_calendar.arrow', 1)
+
+    second = service.events()
+    assert second is not first
+    assert len(second) == 8
+    assert service.events() is second
+
+
+def test_new_pipeline_run_reloads(service, tmp_path):
+    first = service.events()
+    _results(tmp_path / 'pipeline_results.json', '2025-01-02T00:00:00')
+    _touch(tmp_path / 'pipeline_results.json', 1)
+
+    assert service.run_id() == '2025-01-02T00:00:00'
+    assert service.events() is not first
+
+
+def test_missing_artifact_raises_until_published(service, tmp_path):
+    with pytest.raises(FileNotFoundError):
+        service.predictions()
+    with pytest.raises(FileNotFoundError):
+        service.predictions()   # cached as missing
+
+    write_artifact(pd.DataFrame({'date': ['2025-01-01'], 'probability': [0.4]}),
+                   'predictions_future_90d', root=tmp_path)
+    assert service.predictions()['probability'].tolist() == [0.4]
+
+
+def test_dates_come_back_as_timestamps(service):
+    assert pd.api.types.is_datetime64_any_dtype(service.events()['date'])
+
+
+def test_version_changes_only_on_republish(service, tmp_path):
+    before = service.version('planetary_events')
+    assert service.version('planetary_events') == before
+
+    write_artifact(_events(8), 'planetary_events', root=tmp_path)
+    _touch(tmp_path / 'planetary_events_calendar.arrow', 1)
+    assert service.version('planetary_events') != before
+    assert hash(service.version('planetary_events'))
+
+
+def test_watcher_reloads_a_changed_entry(service, tmp_path):
+    first = service.events()
+    write_artifact(_events(8), 'planetary_events', root=tmp_path)
+    _touch(tmp_path / 'planetary_events_calendar.arrow', 1)
+
+    service.watch(interval=0.01)
+    deadline = time.monotonic() + 5
+    while service.stats['reloaded_by_watcher'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    service.stop()
+    service._watcher.join()
+
+    assert service.stats['reloaded_by_watcher'] >= 1
+    loads = service.stats['loads']
+    second = service.events()
+    assert second is not first and len(second) == 8
+    assert service.stats['loads'] == loads   # already reloaded: the read is a hit
@@ -0,0 +1,75 @@
+# tests/test_feature_store.py - Dataset filter expressions for feature reads
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.feature_store import build_filter, forward_filled
+
+
+def _table():
+    return pa.table({
+        'date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03', '2024-01-03']),
+        'symbol': ['DJIA', 'DJIA', 'DJIA', 'GOLD'],
+        'value': [1.0, 2.0, 3.0, 4.0],
+    })
+
+
+def _apply(expr):
+    return ds.dataset(_table()).to_table(filter=expr).to_pandas()
+
+
+def test_no_bounds_means_no_filter():
+    assert build_filter() is None
+
+
+def test_date_bounds_are_inclusive():
+    rows = _apply(build_filter('2024-01-02', '2024-01-03'))
+
+    assert rows['value'].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_single_symbol_string():
+    rows = _apply(build_filter(symbols='GOLD'))
+
+    assert rows['symbol'].tolist() == ['GOLD']
+
+
+def test_dates_and_symbols_combine():
+    rows = _apply(build_filter(start_date='2024-01-02', symbols=['DJIA']))
+
+    assert rows['value'].tolist() == [2.0, 3.0]
+
+
+def _gappy_frame():
+    nan = np.nan
+    return pd.DataFrame({
+        'date': pd.bdate_range('2024-01-01', periods=10),
+        'a': [nan, 1.0, nan, nan, 2.0, nan, nan, nan, nan, 3.0],
+        'b': [5.0, nan, nan, nan, nan, nan, 6.0, nan, nan, nan],
+        'target': [nan] * 10,
+    })
+
+
+def test_forward_fill_continues_across_chunks():
+    df = _gappy_frame()
+    expected = df.assign(**df[['a', 'b']].ffill())
+
+    for bounds in ([0, 3, 10], [0, 1, 2, 6, 10], [0, 4, 4, 9, 10]):
+        chunks = (df.iloc[start:end] for start, end in zip(bounds, bounds[1:]))
+        filled = pd.concat(forward_filled(chunks, ['a', 'b']))
+
+        pd.testing.assert_frame_equal(filled, expected)
+
+
+def test_forward_fill_leaves_other_columns():
+    filled = pd.concat(forward_filled(iter([_gappy_frame()]), ['a']))
+
+    assert filled['b'].isna().sum() == 8
+    assert filled['target'].isna().all()
@@ -0,0 +1,65 @@
+# tests/test_forecast.py - Shape and seeding of the simulated forecast table
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.forecast import forecast_frame
+
+DATES = pd.bdate_range('2025-01-02', periods=30)
+
+
+def _frame(**kwargs):
+    args = dict(dates=DATES, last_price=100.0, probability=0.6, vol=0.01, n_paths=2_000, seed=1)
+    args.update(kwargs)
+    return forecast_frame(**args)
+
+
+def test_one_row_per_date():
+    df = _frame()
+
+    assert len(df) == len(DATES)
+    assert (df['date'] == DATES).all()
+    assert list(df.columns) == ['date', 'predicted_price', 'probability_up', 'direction', 'confidence',
+                                'p05', 'p25', 'p75', 'p95', 'prob_above_last']
+
+
+def test_bands_are_ordered():
+    df = _frame()
+
+    assert (df['p05'] <= df['p25']).all()
+    assert (df['p25'] <= df['predicted_price']).all()
+    assert (df['predicted_price'] <= df['p75']).all()
+    assert (df['p75'] <= df['p95']).all()
+    assert df['prob_above_last'].between(0, 1).all()
+
+
+def test_same_seed_same_paths():
+    pd.testing.assert_frame_equal(_frame(seed=3), _frame(seed=3))
+    assert not _frame(seed=3)['predicted_price'].equals(_frame(seed=4)['predicted_price'])
+
+
+def test_per_day_probabilities():
+    probability = np.linspace(0.3, 0.7, len(DATES))
+    df = _frame(probability=probability)
+
+    np.testing.assert_allclose(df['probability_up'], probability)
+    assert (df['direction'] == np.where(probability > 0.5, 'UP', 'DOWN')).all()
+    np.testing.assert_allclose(df['confidence'], np.maximum(probability, 1 - probability))
+
+
+def test_bullish_signal_lifts_the_median():
+    up = _frame(probability=0.8)['predicted_price'].iloc[-1]
+    down = _frame(probability=0.2)['predicted_price'].iloc[-1]
+
+    assert up > 100.0 > down
+
+
+def test_probability_length_must_match_dates():
+    with pytest.raises(ValueError):
+        _frame(probability=[0.6, 0.4])
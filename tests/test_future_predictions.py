@@ -0,0 +1,68 @@
+# tests/test_future_predictions.py - Future feature rows replayed like the stored feature rows
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.live_features import LiveFeatureAssembler
+from scripts.compute_features import create_planetary_aspects, create_motion_features
+from scripts.future_predictions import replay_symbols, replay_vectors
+
+pytestmark = pytest.mark.filterwarnings('ignore::pandas.errors.PerformanceWarning')
+
+# Columns a replay without bars derives from the sky alone
+SKY_COLS = [
+    'sun_longitude', 'moon_longitude', 'sun_moon_square', 'moon_velocity', 'mercury_velocity',
+    'mercury_retrograde', 'mercury_retro_duration', 'mercury_velocity_max_7d', 'retrograde_count',
+]
+PLANET_SPEEDS = {'sun': 0.98, 'moon': 13.2, 'mercury': 1.2, 'venus': 1.1, 'mars': 0.5,
+                 'jupiter': 0.08, 'saturn': 0.03}
+
+
+def _feature_store(order, days: int = 40) -> pd.DataFrame:
+    """Stored feature rows with ``order`` as the symbol order within each date"""
+    dates = pd.bdate_range('2024-01-01', periods=days)
+    t = np.arange(days)
+    positions = pd.DataFrame({'date': dates})
+    for i, (planet, speed) in enumerate(PLANET_SPEEDS.items()):
+        loop = 25 * np.sin(t / 9) if planet == 'mercury' else 0
+        positions[f'{planet}_longitude'] = (40 * i + speed * t + loop) % 360
+
+    rows = pd.DataFrame([(date, symbol) for date in dates for symbol in order], columns=['date', 'symbol'])
+    df = rows.merge(positions, on='date', how='left')
+    return create_motion_features(create_planetary_aspects(df))
+
+
+@pytest.mark.parametrize('order', [('GOLD', 'DJIA', 'DXY'), ('DJIA', 'DXY', 'GOLD'), ('DXY', 'GOLD', 'DJIA')])
+def test_replayed_vectors_equal_stored_rows(order):
+    store = _feature_store(order)
+    known = store['date'].unique()[-2:]
+    history = store[store['date'] < known[0]]
+    assembler = LiveFeatureAssembler(SKY_COLS).prime(history)
+
+    lon_cols = [col for col in store.columns if col.endswith('_longitude')]
+    ephemeris = store.drop_duplicates('date').set_index('date').loc[known, lon_cols]
+    vectors = replay_vectors(assembler, ephemeris, 'DJIA')
+
+    stored = store[SKY_COLS].ffill().fillna(0).set_index(store['date'])[store['symbol'].values == 'DJIA']
+    for date in known:
+        np.testing.assert_allclose(vectors[date][0], stored.loc[date].to_numpy(), rtol=1e-5, atol=1e-4,
+                                   err_msg=f"{order} {pd.Timestamp(date).date()}")
+
+
+def test_replay_order_comes_from_the_store():
+    assembler = LiveFeatureAssembler(SKY_COLS).prime(_feature_store(('GOLD', 'DJIA', 'DXY')))
+
+    assert replay_symbols(assembler, 'DJIA') == ['GOLD', 'DJIA', 'DXY']
+
+
+def test_signal_symbol_missing_from_last_date_is_appended():
+    store = _feature_store(('GOLD', 'DXY'))
+    assembler = LiveFeatureAssembler(SKY_COLS).prime(store)
+
+    assert replay_symbols(assembler, 'DJIA') == ['GOLD', 'DXY', 'DJIA']
@@ -0,0 +1,73 @@
+# tests/test_incremental.py - Selecting the rows an incremental update trains and validates on
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.incremental import MIN_NEW_ROWS, split_new_rows, update_lstm
+
+
+def test_new_rows_split_into_update_and_validation():
+    dates = pd.bdate_range('2024-01-01', periods=150)
+    trained_through = dates[99]
+
+    assert split_new_rows(dates, trained_through) == (100, 140, 150)
+
+
+def test_too_few_new_rows():
+    dates = pd.bdate_range('2024-01-01', periods=100)
+    trained_through = dates[len(dates) - MIN_NEW_ROWS]
+
+    assert split_new_rows(dates, trained_through) is None
+
+
+def test_trained_through_between_rows():
+    dates = pd.bdate_range('2024-01-01', periods=100)
+
+    # A weekend cutoff counts the Friday as trained on
+    update_start, _, end = split_new_rows(dates, '2024-01-07')
+    assert update_start == 5 and end == 100
+
+
+def test_string_dates_accepted():
+    dates = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2024-01-01', periods=60)]
+
+    assert split_new_rows(dates, '2023-12-31') == (0, 48, 60)
+
+
+class RecordingModel:
+    """LSTM stand-in recording the windows it is asked to predict"""
+
+    def __init__(self):
+        self.predicted = []
+
+    def predict(self, dataset, verbose=0):
+        windows = np.concatenate([batch.numpy() for batch in dataset])
+        self.predicted.append(windows)
+        return np.full((len(windows), 1), 0.5)
+
+    def compile(self, **kwargs):
+        pass
+
+    def fit(self, dataset, **kwargs):
+        pass
+
+
+def test_lstm_validation_context_clamped_at_first_row():
+    pytest.importorskip('tensorflow')
+    X = np.arange(40, dtype=np.float32).reshape(-1, 1)
+    y = np.arange(40) % 2
+    model = RecordingModel()
+
+    # Validation starts 20 rows in, before a full 30-row window of context
+    result = update_lstm(model, X, y, update_start=0, val_start=20, end=40, timesteps=30)
+
+    windows = model.predicted[0]
+    assert len(windows) == 10
+    assert windows[0, 0, 0] == 0 and windows[-1, -1, 0] == 38
+    assert result['current']['accuracy'] == 0.5
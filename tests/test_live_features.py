@@ -0,0 +1,92 @@
+# tests/test_live_features.py - Live feature vectors match the batch feature pipeline
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.live_features import LiveFeatureAssembler
+from scripts.compute_features import (create_price_features, create_technical_indicators,
+                                      create_planetary_aspects, create_motion_features)
+
+pytestmark = pytest.mark.filterwarnings('ignore::pandas.errors.PerformanceWarning')
+
+FEATURE_COLS = [
+    'close', 'volume', 'djia_return_1d', 'gold_return_7d', 'close_mean_7d', 'close_std_14d',
+    'volume_mean_7d', 'rsi_14_djia', 'rsi_14_gold', 'macd_djia', 'macd_signal_gold', 'macd_hist_djia',
+    'bb_position_gold', 'sun_longitude', 'sun_mercury_conjunction', 'sun_moon_square',
+    'mercury_retrograde', 'mercury_velocity', 'mercury_retro_duration', 'mercury_velocity_max_7d',
+    'venus_velocity_min_7d', 'retrograde_count', 'inner_planets_retro',
+]
+PLANET_SPEEDS = {'sun': 0.98, 'moon': 13.2, 'mercury': 1.2, 'venus': 1.1, 'mars': 0.5,
+                 'jupiter': 0.08, 'saturn': 0.03}
+
+
+def _master_frame(days: int = 80) -> pd.DataFrame:
+    """Two symbols per date, as load_master_data returns them"""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-01', periods=days)
+    t = np.arange(days)
+
+    frames = []
+    for symbol, start in [('DJIA', 37_000.0), ('GOLD', 2_000.0)]:
+        close = start * np.cumprod(1 + rng.normal(0, 0.01, days))
+        frames.append(pd.DataFrame({
+            'date': dates, 'symbol': symbol, 'open': close, 'high': close * 1.01, 'low': close * 0.99,
+            'close': close, 'volume': rng.integers(1_000, 5_000, days).astype(float),
+        }))
+    df = pd.concat(frames).sort_values(['date', 'symbol'], kind='stable').reset_index(drop=True)
+
+    positions = pd.DataFrame({'date': dates})
+    for i, (planet, speed) in enumerate(PLANET_SPEEDS.items()):
+        # Mercury and Venus loop backwards for part of the window
+        loop = 25 * np.sin(t / 9) if planet in ('mercury', 'venus') else 0
+        positions[f'{planet}_longitude'] = (40 * i + speed * t + loop) % 360
+    return df.merge(positions, on='date').reset_index(drop=True)
+
+
+def _features(df: pd.DataFrame) -> pd.DataFrame:
+    """Feature store rows computed by the batch pipeline"""
+    for step in (create_price_features, create_technical_indicators,
+                 create_planetary_aspects, create_motion_features):
+        df = step(df)
+    return df
+
+
+def _training_rows(features: pd.DataFrame) -> pd.DataFrame:
+    """Model inputs as training reads them: forward-filled, remaining gaps 0"""
+    return features[FEATURE_COLS].ffill().fillna(0)
+
+
+def test_updates_match_compute_features():
+    df = _master_frame()
+    expected = _training_rows(_features(df.copy()))
+    lon_cols = [col for col in df.columns if col.endswith('_longitude')]
+
+    assembler = LiveFeatureAssembler(FEATURE_COLS)
+    for i, row in df.iterrows():
+        vector = assembler.update(row['symbol'], row.to_dict(), row[lon_cols].to_dict(), row['date'])
+        np.testing.assert_allclose(vector[0], expected.iloc[i].to_numpy(), rtol=1e-5, atol=1e-4,
+                                   err_msg=f"row {i} ({row['symbol']} {row['date'].date()})")
+
+    assert assembler.date == df['date'].iloc[-1]
+
+
+def test_primed_assembler_continues_like_the_batch():
+    df = _master_frame()
+    features = _features(df.copy())
+    expected = _training_rows(features)
+    lon_cols = [col for col in df.columns if col.endswith('_longitude')]
+    split = 120
+
+    assembler = LiveFeatureAssembler(FEATURE_COLS).prime(features.iloc[:split])
+
+    for i in range(split, len(df)):
+        row = df.iloc[i]
+        vector = assembler.update(row['symbol'], row.to_dict(), row[lon_cols].to_dict(), row['date'])
+        np.testing.assert_allclose(vector[0], expected.iloc[i].to_numpy(), rtol=1e-5, atol=1e-4,
+                                   err_msg=f"row {i}")
@@ -0,0 +1,159 @@
+# tests/test_orchestrate.py - Stage scheduling, skipping, caching and the critical path
+
+import os
+import sys
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import stage_cache
+
+STAGES = {
+    'DOWNLOAD': {'depends_on': []},
+    'PLANETARY': {'depends_on': []},
+    'FEATURES': {'depends_on': ['DOWNLOAD', 'PLANETARY']},
+    'TRAIN': {'depends_on': ['FEATURES']},
+    'EVENTS': {'depends_on': ['PLANETARY']},
+    'FORECAST': {'depends_on': ['TRAIN', 'EVENTS']},
+}
+
+
+@pytest.fixture(scope='module')
+def orchestrate(tmp_path_factory):
+    # The orchestrator opens pipeline.log in the working directory at import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp('pipeline'))
+    try:
+        from scripts import orchestrate
+    finally:
+        os.chdir(cwd)
+    return orchestrate
+
+
+@pytest.fixture
+def critical_path(orchestrate):
+    return orchestrate.critical_path
+
+
+@pytest.fixture
+def pipeline(orchestrate, tmp_path, monkeypatch):
+    """Stage specs writing under tmp_path, a stage cache file there, and the run log"""
+    cache_file = tmp_path / '_stage_cache.json'
+    monkeypatch.setattr(orchestrate, 'stage_cache', SimpleNamespace(
+        fingerprint=stage_cache.fingerprint, code_sources=stage_cache.code_sources,
+        is_current=partial(stage_cache.is_current, path=cache_file),
+        record=partial(stage_cache.record, path=cache_file)))
+    ran, inputs = [], {}
+
+    def stage(name, depends_on=(), fail=False):
+        output = tmp_path / f'{name}.txt'
+
+        def func():
+            ran.append(name)
+            if fail:
+                raise RuntimeError(f"{name} broke")
+            output.write_text(name.lower())
+            return name.lower(), f"ran {name}"
+
+        return {'func': func, 'title': name, 'depends_on': list(depends_on),
+                'inputs': lambda: {'value': inputs.get(name)},
+                'outputs': lambda: [output], 'load': output.read_text}
+
+    def run(stages, use_cache=True):
+        orchestrator = orchestrate.PipelineOrchestrator(use_cache=use_cache, stages=stages)
+        return orchestrator, orchestrator.run_dag(max_workers=1)
+
+    return SimpleNamespace(stage=stage, run=run, ran=ran, inputs=inputs)
+
+
+def _graph(pipeline, failing=()):
+    return {name: pipeline.stage(name, spec['depends_on'], fail=name in failing)
+            for name, spec in STAGES.items()}
+
+
+def test_stages_run_after_their_dependencies(pipeline):
+    _, outputs = pipeline.run(_graph(pipeline))
+
+    order = {name: i for i, name in enumerate(pipeline.ran)}
+    assert sorted(order) == sorted(STAGES)
+    for name, spec in STAGES.items():
+        assert all(order[dep] < order[name] for dep in spec['depends_on'])
+    assert outputs['FORECAST'] == 'forecast'
+
+
+def test_failed_stage_skips_its_dependents_transitively(pipeline):
+    orchestrator, outputs = pipeline.run(_graph(pipeline, failing={'FEATURES'}))
+    stages = orchestrator.results['stages']
+
+    assert stages['FEATURES']['status'] == 'ERROR'
+    assert stages['TRAIN']['status'] == 'SKIPPED' and stages['FORECAST']['status'] == 'SKIPPED'
+    assert stages['EVENTS']['status'] == 'SUCCESS'
+    assert 'TRAIN' not in pipeline.ran and 'FORECAST' not in pipeline.ran
+    assert outputs['TRAIN'] is None
+
+
+def test_cache_hits_release_their_dependents(pipeline):
+    pipeline.run(_graph(pipeline))
+    pipeline.ran.clear()
+    pipeline.inputs['TRAIN'] = 'new window'
+
+    orchestrator, outputs = pipeline.run(_graph(pipeline))
+
+    assert pipeline.ran == ['TRAIN', 'FORECAST']
+    assert sorted(orchestrator.results['cache_hits']) == ['DOWNLOAD', 'EVENTS', 'FEATURES', 'PLANETARY']
+    assert outputs['FEATURES'] == 'features' and outputs['FORECAST'] == 'forecast'
+
+
+def test_cache_off_reruns_everything(pipeline):
+    pipeline.run(_graph(pipeline))
+    pipeline.ran.clear()
+
+    orchestrator, _ = pipeline.run(_graph(pipeline), use_cache=False)
+
+    assert sorted(pipeline.ran) == sorted(STAGES)
+    assert orchestrator.results['cache_hits'] == []
+
+
+def test_fingerprint_covers_the_code_a_stage_imports(orchestrate):
+    sources = stage_cache.code_sources(orchestrate.STAGES['PREDICTIONS']['func'], orchestrate.PROJECT_ROOT)
+
+    assert {'scripts/future_predictions.py', 'ml/forecast.py', 'ml/predictor.py', 'ml/registry.py',
+            'utils/feature_store.py', 'utils/partitioned_store.py'} <= set(sources)
+    assert 'scripts.orchestrate.run_future_predictions' in sources
+
+
+def _results(**durations):
+    return {name: {'duration_seconds': seconds} for name, seconds in durations.items()}
+
+
+def test_longest_chain_wins(critical_path):
+    results = _results(DOWNLOAD=10, PLANETARY=30, FEATURES=5, TRAIN=20, EVENTS=40, FORECAST=1)
+
+    assert critical_path(results, STAGES) == (71, ['PLANETARY', 'EVENTS', 'FORECAST'])
+
+
+def test_parallel_branches_do_not_add_up(critical_path):
+    results = _results(DOWNLOAD=50, PLANETARY=30, FEATURES=5, TRAIN=20, EVENTS=10, FORECAST=1)
+
+    assert critical_path(results, STAGES) == (76, ['DOWNLOAD', 'FEATURES', 'TRAIN', 'FORECAST'])
+
+
+def test_stages_not_run_are_skipped(critical_path):
+    results = _results(PLANETARY=30, EVENTS=40)
+
+    assert critical_path(results, STAGES) == (70, ['PLANETARY', 'EVENTS'])
+
+
+def test_missing_duration_counts_as_zero(critical_path):
+    results = _results(DOWNLOAD=10, FEATURES=5)
+    results['DOWNLOAD'] = {'status': 'ERROR'}
+
+    assert critical_path(results, STAGES) == (5, ['DOWNLOAD', 'FEATURES'])
+
+
+def test_no_results(critical_path):
+    assert critical_path({}, STAGES) == (0.0, [])
@@ -0,0 +1,63 @@
+# tests/test_partitioned_store.py - Manifest-only partition pruning
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.partitioned_store import select_partition_files, read_partitions, write_partitions
+
+
+def _features():
+    dates = pd.to_datetime(['2022-06-01', '2023-06-01', '2024-06-01'])
+    return pd.DataFrame({
+        'date': list(dates) * 2,
+        'symbol': ['DJIA'] * 3 + ['GOLD'] * 3,
+        'value': range(6),
+    })
+
+
+def _partitions(files):
+    return sorted(Path(f).parent.relative_to(Path(f).parents[2]).as_posix() for f in files)
+
+
+def test_all_partitions_without_bounds(tmp_path):
+    write_partitions(_features(), 'features', root=tmp_path)
+
+    assert len(select_partition_files('features', root=tmp_path)) == 6
+
+
+def test_date_range_prunes_years(tmp_path):
+    write_partitions(_features(), 'features', root=tmp_path)
+    files = select_partition_files('features', start_date='2023-01-01', end_date='2023-12-31', root=tmp_path)
+
+    assert _partitions(files) == ['year=2023/symbol=DJIA', 'year=2023/symbol=GOLD']
+
+
+def test_symbols_prune_partitions(tmp_path):
+    write_partitions(_features(), 'features', root=tmp_path)
+    files = select_partition_files('features', start_date='2023-01-01', symbols='GOLD', root=tmp_path)
+
+    assert _partitions(files) == ['year=2023/symbol=GOLD', 'year=2024/symbol=GOLD']
+
+
+def test_range_outside_data_selects_nothing(tmp_path):
+    write_partitions(_features(), 'features', root=tmp_path)
+
+    assert select_partition_files('features', start_date='2030-01-01', root=tmp_path) == []
+
+
+def test_symbol_filter_ignored_without_symbol_partitions(tmp_path):
+    df = pd.DataFrame({'date': pd.to_datetime(['2023-03-01', '2024-03-01']), 'sun': [1.0, 2.0]})
+    write_partitions(df, 'planetary_positions', root=tmp_path)
+
+    assert len(select_partition_files('planetary_positions', symbols=['DJIA'], root=tmp_path)) == 2
+
+
+def test_read_trims_to_requested_range(tmp_path):
+    write_partitions(_features(), 'features', root=tmp_path)
+    df = read_partitions('features', start_date='2023-01-01', end_date='2023-12-31', root=tmp_path)
+
+    assert sorted(df['value'].tolist()) == [1, 4]
@@ -0,0 +1,112 @@
+# tests/test_pipeline_jobs.py - Single-flight lock, job status and log tail of background pipeline jobs
+
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import psutil
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import pipeline_jobs
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pipeline_jobs, 'JOBS_DIR', tmp_path)
+    return tmp_path
+
+
+def _job(job_id, state='running', pid=None, create_time=None, log=''):
+    """Write a job directory as the job process would"""
+    process = psutil.Process()
+    pipeline_jobs._job_dir(job_id).mkdir()
+    pipeline_jobs._write_status(job_id, {
+        'id': job_id, 'state': state, 'args': [], 'created_at': datetime.now().isoformat(),
+        'pid': pid or process.pid, 'pid_create_time': create_time or process.create_time(),
+        'log': str(pipeline_jobs._job_dir(job_id) / pipeline_jobs.LOG_NAME),
+    })
+    (pipeline_jobs._job_dir(job_id) / pipeline_jobs.LOG_NAME).write_text(log, encoding='utf-8')
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_lock_is_single_flight(jobs_dir):
+    assert pipeline_jobs._acquire_lock('first')
+    assert not pipeline_jobs._acquire_lock('second')
+    assert pipeline_jobs._lock_holder() == 'first'
+
+    pipeline_jobs._release_lock('second')  # not the holder: no effect
+    assert pipeline_jobs._lock_holder() == 'first'
+    pipeline_jobs._release_lock('first')
+    assert pipeline_jobs._acquire_lock('second')
+
+
+def test_lock_of_a_running_job_is_kept(jobs_dir):
+    _job('live')
+    assert pipeline_jobs._acquire_lock('live')
+
+    assert not pipeline_jobs._acquire_lock('next')
+    assert pipeline_jobs.current_job()['id'] == 'live'
+
+
+def test_lock_of_a_dead_job_is_broken(jobs_dir):
+    _job('dead', pid=_dead_pid(), create_time=1.0)
+    assert pipeline_jobs._acquire_lock('dead')
+
+    assert pipeline_jobs._acquire_lock('next')
+    assert pipeline_jobs._lock_holder() == 'next'
+
+
+def test_lock_without_status_is_broken_after_queue_timeout(jobs_dir):
+    assert pipeline_jobs._acquire_lock('starting')
+    assert not pipeline_jobs._acquire_lock('next')
+
+    old = time.time() - pipeline_jobs.QUEUE_TIMEOUT_SECONDS - 1
+    os.utime(jobs_dir / pipeline_jobs.LOCK_NAME, (old, old))
+    assert pipeline_jobs._acquire_lock('next')
+
+
+def test_get_job_reports_a_dead_process_as_lost(jobs_dir):
+    _job('dead', pid=_dead_pid(), create_time=1.0)
+    _job('live')
+
+    assert pipeline_jobs.get_job('dead')['state'] == 'lost'
+    assert pipeline_jobs.get_job('live')['state'] == 'running'
+    assert pipeline_jobs.get_job('unknown') is None
+
+
+def test_get_job_reports_a_recycled_pid_as_lost(jobs_dir):
+    _job('recycled', create_time=psutil.Process().create_time() - 60)
+
+    assert pipeline_jobs.get_job('recycled')['state'] == 'lost'
+
+
+def test_tail_log_returns_last_lines(jobs_dir, monkeypatch):
+    _job('job', log=''.join(f"line {i}\n" for i in range(1000)))
+
+    assert pipeline_jobs.tail_log('job', lines=3) == ['line 997', 'line 998', 'line 999']
+    assert pipeline_jobs.tail_log('missing') == []
+
+    monkeypatch.setattr(pipeline_jobs, 'TAIL_BYTES', 20)  # reads only the end of the file
+    assert pipeline_jobs.tail_log('job', lines=100)[-2:] == ['line 998', 'line 999']
+    assert len(pipeline_jobs.tail_log('job', lines=100)) <= 3
+
+
+def test_stage_progress_parses_every_result_line(jobs_dir):
+    _job('job', log=(
+        "INFO ✅ FEATURES: Completed in 3.2s\n"
+        "WARNING ⚠️  PREDICTIONS: cached output unreadable, recomputing\n"
+        "ERROR ❌ TRAIN: Failed after 1.0s\n"
+    ))
+
+    assert pipeline_jobs.get_job('job')['stages'] == {
+        'FEATURES': 'SUCCESS', 'PREDICTIONS': 'WARNING', 'TRAIN': 'ERROR'}
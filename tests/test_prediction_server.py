@@ -0,0 +1,127 @@
+# tests/test_prediction_server.py - Request micro-batching and payload parsing of the prediction server
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services import prediction_server
+from services.prediction_server import MicroBatcher, parse_pairs
+
+MODELS = SimpleNamespace(version='v0001')
+
+
+class FakePredictor:
+    """predict_batch stand-in recording the size of every model call"""
+
+    calls = []
+    fail = False
+
+    def __init__(self, models):
+        self.models = models
+
+    def predict_batch(self, pairs):
+        FakePredictor.calls.append(len(pairs))
+        if FakePredictor.fail:
+            raise RuntimeError("model down")
+        result = pd.DataFrame(pairs, columns=['symbol', 'date'])
+        return result.assign(feature_date=result['date'], xgb_proba=0.6, lstm_proba=float('nan'),
+                             ensemble_proba=0.6, signal='UP')
+
+
+@pytest.fixture
+def batcher(monkeypatch):
+    FakePredictor.calls, FakePredictor.fail = [], False
+    monkeypatch.setattr(prediction_server, 'get_models', lambda: MODELS)
+    monkeypatch.setattr(prediction_server, 'MarketPredictor', FakePredictor)
+    created = []
+
+    def make(**kwargs):
+        created.append(MicroBatcher(**kwargs))
+        return created[-1]
+
+    yield make
+    for batcher in created:
+        batcher.stop()
+
+
+def _pairs(*symbols):
+    return [(symbol, pd.Timestamp('2025-01-02')) for symbol in symbols]
+
+
+def test_queued_requests_share_one_model_call(batcher):
+    server = batcher(max_wait_ms=50)
+    futures = [server.submit(_pairs(symbol)) for symbol in ['DJIA', 'GOLD', 'DXY']]
+    server.start()
+
+    results = [future.result(timeout=5) for future in futures]
+
+    assert FakePredictor.calls == [1, 3]     # warm-up, then one batch
+    assert [rows[0]['symbol'] for rows in results] == ['DJIA', 'GOLD', 'DXY']
+    assert results[0][0]['date'] == '2025-01-02' and results[0][0]['lstm_proba'] is None
+    assert server.stats['batches'] == 1 and server.stats['max_batch_seen'] == 3
+
+
+def test_each_caller_gets_its_own_rows(batcher):
+    server = batcher(max_wait_ms=50)
+    first = server.submit(_pairs('DJIA', 'GOLD'))
+    second = server.submit(_pairs('DXY'))
+    server.start()
+
+    assert [row['symbol'] for row in first.result(timeout=5)] == ['DJIA', 'GOLD']
+    assert [row['symbol'] for row in second.result(timeout=5)] == ['DXY']
+
+
+def test_batches_are_capped(batcher):
+    server = batcher(max_batch=2, max_wait_ms=50)
+    futures = [server.submit(_pairs(f'S{i}')) for i in range(5)]
+    server.start()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert FakePredictor.calls[1:] == [2, 2, 1]
+
+
+def test_lone_request_is_not_held_past_the_wait(batcher):
+    server = batcher(max_wait_ms=20).start()
+
+    assert server.submit(_pairs('DJIA')).result(timeout=1)[0]['symbol'] == 'DJIA'
+    assert server.submit(_pairs('GOLD')).result(timeout=1)[0]['symbol'] == 'GOLD'
+    assert FakePredictor.calls[1:] == [1, 1]
+
+
+def test_scoring_failure_reaches_every_caller(batcher):
+    server = batcher(max_wait_ms=50)
+    server.start()
+    FakePredictor.fail = True
+    futures = [server.submit(_pairs(symbol)) for symbol in ['DJIA', 'GOLD']]
+
+    for future in futures:
+        with pytest.raises(RuntimeError):
+            future.result(timeout=5)
+
+
+def test_model_version_reported(batcher):
+    assert batcher().start().model_version == 'v0001'
+
+
+def test_parse_single_request():
+    assert parse_pairs({'symbol': 'djia', 'date': '2025-01-02'}) == [('DJIA', pd.Timestamp('2025-01-02'))]
+
+
+def test_parse_request_list():
+    pairs = parse_pairs({'requests': [{'symbol': 'GOLD', 'date': '2025-01-02'}, {'symbol': 'DXY'}]})
+
+    assert pairs[0] == ('GOLD', pd.Timestamp('2025-01-02'))
+    assert pairs[1] == ('DXY', pd.Timestamp.today().normalize())
+
+
+@pytest.mark.parametrize('payload', [{'requests': []}, {'requests': {'symbol': 'DJIA'}}, {'date': '2025-01-02'},
+                                     {'requests': [{'symbol': ''}]}])
+def test_parse_rejects_bad_payloads(payload):
+    with pytest.raises(ValueError):
+        parse_pairs(payload)
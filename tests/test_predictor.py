@@ -0,0 +1,64 @@
+# tests/test_predictor.py - As-of lookup of feature rows and the predictor's feature matrix
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml import predictor
+from ml.predictor import MarketPredictor, locate_rows
+
+# Rows grouped by symbol, dates ascending within each symbol
+ROW_SYMBOLS = np.array(['DJIA', 'DJIA', 'DJIA', 'GOLD', 'GOLD'])
+ROW_DATES = np.array(['2024-01-02', '2024-01-03', '2024-01-05', '2024-01-02', '2024-01-04'],
+                     dtype='datetime64[ns]')
+
+
+def _locate(symbols, dates):
+    return locate_rows(ROW_SYMBOLS, ROW_DATES, symbols, dates).tolist()
+
+
+def test_exact_dates():
+    assert _locate(['DJIA', 'GOLD'], ['2024-01-03', '2024-01-04']) == [1, 4]
+
+
+def test_gap_uses_latest_earlier_row():
+    assert _locate(['DJIA', 'GOLD'], ['2024-01-04', '2024-01-03']) == [1, 3]
+
+
+def test_after_history_uses_last_row():
+    assert _locate(['DJIA', 'GOLD'], ['2024-02-01', '2024-02-01']) == [2, 4]
+
+
+def test_before_history_is_missing():
+    assert _locate(['DJIA', 'GOLD'], ['2024-01-01', '2023-12-31']) == [-1, -1]
+
+
+def test_unknown_symbol_is_missing():
+    assert _locate(['DXY', 'DJIA'], ['2024-01-03', '2024-01-03']) == [-1, 1]
+
+
+def test_request_order_is_kept():
+    symbols = ['GOLD', 'DJIA', 'GOLD', 'DJIA']
+    dates = ['2024-01-05', '2024-01-02', '2024-01-02', '2024-01-05']
+
+    assert _locate(symbols, dates) == [4, 0, 3, 2]
+
+
+def test_feature_matrix_follows_the_store_version(monkeypatch):
+    store = {'version': 'features-v1', 'rows': 3}
+    monkeypatch.setattr(predictor, 'feature_store_version', lambda: store['version'])
+    monkeypatch.setattr(predictor, 'training_matrix', lambda: (
+        np.zeros((store['rows'], 2)), None, np.arange(store['rows']).astype('datetime64[D]'), ['a', 'b'], 'key'))
+    monkeypatch.setattr(predictor, 'load_cached_symbols', lambda key: np.full(store['rows'], 'DJIA'))
+    model = MarketPredictor(SimpleNamespace(feature_cols=None, version='v0001'))
+
+    first = model._feature_matrix()
+    assert model._feature_matrix() is first
+
+    store.update(version='features-v2', rows=4)
+    X, dates, symbols = model._feature_matrix()
+    assert len(X) == len(dates) == len(symbols) == 4
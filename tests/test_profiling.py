@@ -0,0 +1,83 @@
+# tests/test_profiling.py - Stage metrics history and regression detection
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import profiling
+from utils.profiling import StageProfiler, append_history, regressions
+
+
+def _run(**durations):
+    return {'stages': {name: {'duration_seconds': seconds} for name, seconds in durations.items()}}
+
+
+HISTORY = [_run(FEATURES=10.0, TRAIN=100.0), _run(FEATURES=12.0, TRAIN=90.0), _run(FEATURES=11.0, TRAIN=110.0)]
+
+
+def test_slow_stage_flagged():
+    current = {'FEATURES': {'duration_seconds': 20.0}, 'TRAIN': {'duration_seconds': 120.0}}
+
+    assert regressions(current, HISTORY) == {'FEATURES': {'value': 20.0, 'median': 11.0, 'runs': 3}}
+
+
+def test_cache_hits_ignored():
+    hit = {'FEATURES': {'duration_seconds': 0.1, 'cache': 'HIT'}}
+    history = HISTORY + [{'stages': hit}] * 5
+
+    # Fast cached runs do not lower the median...
+    assert regressions({'FEATURES': {'duration_seconds': 20.0}}, history)['FEATURES']['median'] == 11.0
+    # ...and a cache hit is never flagged itself
+    assert regressions({'FEATURES': {'duration_seconds': 99.0, 'cache': 'HIT'}}, history) == {}
+
+
+def test_needs_min_runs():
+    current = {'FEATURES': {'duration_seconds': 20.0}}
+
+    assert regressions(current, HISTORY[:2]) == {}
+    assert 'FEATURES' in regressions(current, HISTORY[:2], min_runs=2)
+
+
+def test_new_stage_not_flagged():
+    assert regressions({'PREDICTIONS': {'duration_seconds': 50.0}}, HISTORY) == {}
+
+
+def test_append_history_trims_to_limit(tmp_path):
+    path = tmp_path / 'history.jsonl'
+
+    for i in range(5):
+        earlier = append_history({'run': i}, path, limit=3)
+
+    assert earlier == [{'run': 1}, {'run': 2}, {'run': 3}]
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [{'run': 2}, {'run': 3}, {'run': 4}]
+
+
+def test_profiler_counts_rows_read():
+    with StageProfiler() as profiler:
+        profiling.count_rows_read(120)
+        profiling.count_rows_read(30)
+
+    assert profiler.metrics['rows_in'] == 150
+    assert profiler.metrics['peak_rss_mb'] >= profiler.metrics['rss_start_mb']
+    assert 'hot_functions' not in profiler.metrics
+
+
+def test_profiler_keeps_hot_functions():
+    def busy():
+        return sum(range(200_000))
+
+    with StageProfiler(profile=True, top=5) as profiler:
+        busy()
+
+    functions = profiler.metrics['hot_functions']
+    assert len(functions) <= 5
+    assert any('busy' in row['function'] for row in functions)
+
+
+def test_rows_of_tabular_output():
+    assert profiling.rows_of(pd.DataFrame({'a': range(4)})) == 4
+    assert profiling.rows_of({'status': 'ok'}) is None
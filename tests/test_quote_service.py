@@ -0,0 +1,110 @@
+# tests/test_quote_service.py - Batched quote fetching and the shared quote cache
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.quote_service import QuoteService, FakeQuoteBackend
+
+
+class FailingBackend:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch(self, symbols):
+        self.calls += 1
+        raise RuntimeError("network down")
+
+
+def test_one_backend_call_per_batch():
+    backend = FakeQuoteBackend()
+    quotes = QuoteService(backend).get_quotes(['AAPL', 'MSFT', 'TSLA'])
+
+    assert backend.calls == 1
+    assert list(quotes) == ['AAPL', 'MSFT', 'TSLA']
+    assert all(quote['price'] > 0 for quote in quotes.values())
+
+
+def test_symbols_are_normalized_and_deduplicated():
+    backend = FakeQuoteBackend()
+    quotes = QuoteService(backend).get_quotes([' aapl', 'AAPL', '', 'msft '])
+
+    assert list(quotes) == ['AAPL', 'MSFT']
+
+
+def test_fresh_quotes_are_served_from_cache():
+    backend = FakeQuoteBackend()
+    service = QuoteService(backend, ttl=60)
+    first = service.get_quotes(['AAPL', 'MSFT'])
+    second = service.get_quotes(['MSFT', 'AAPL'])
+
+    assert backend.calls == 1
+    assert second['AAPL'] == first['AAPL']
+    assert service.stats['hits'] == 2
+
+
+def test_only_missing_symbols_are_fetched():
+    backend = FakeQuoteBackend()
+    service = QuoteService(backend, ttl=60)
+    service.get_quotes(['AAPL'])
+    service.get_quotes(['AAPL', 'NVDA'])
+
+    assert backend.calls == 2
+    assert service.stats['fetched'] == 2
+
+
+def test_expired_quotes_are_refetched():
+    backend = FakeQuoteBackend()
+    service = QuoteService(backend, ttl=0)
+    service.get_quotes(['AAPL'])
+    service.get_quotes(['AAPL'])
+
+    assert backend.calls == 2
+
+
+def test_concurrent_requests_share_one_fetch():
+    backend = FakeQuoteBackend(delay=0.2)
+    service = QuoteService(backend)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get_quotes(['AAPL', 'MSFT'])))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.calls == 1
+    assert len(results) == 5
+    assert all(result == results[0] for result in results)
+
+
+def test_unknown_symbols_are_none_and_cached():
+    backend = FakeQuoteBackend(missing={'NOPE'})
+    service = QuoteService(backend, ttl=60)
+    quotes = service.get_quotes(['AAPL', 'NOPE'])
+    again = service.get_quotes(['NOPE'])
+
+    assert quotes['NOPE'] is None and quotes['AAPL'] is not None
+    assert again['NOPE'] is None
+    assert backend.calls == 1
+
+
+def test_failed_fetch_serves_last_known_quote():
+    service = QuoteService(FakeQuoteBackend(), ttl=0)
+    before = service.get_quote('AAPL')
+    service.backend = FailingBackend()
+
+    assert service.get_quote('AAPL') == before
+    assert service.get_quote('MSFT') is None
+    assert service.stats['errors'] == 2
+
+
+def test_failed_fetch_is_not_cached():
+    failing = FailingBackend()
+    service = QuoteService(failing, ttl=60)
+    service.get_quotes(['AAPL'])
+    service.get_quotes(['AAPL'])
+
+    assert failing.calls == 2
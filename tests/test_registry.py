@@ -0,0 +1,94 @@
+# tests/test_registry.py - Model versions, the ACTIVE pointer and the process-wide bundle
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml import registry
+from ml.registry import (ARTIFACT_FILES, active_version, get_models, list_versions, load_metadata,
+                         register_models, set_active)
+
+
+class FakeXGBoost:
+    """Stands in for XGBClassifier.save_model"""
+
+    def __init__(self, tag: str):
+        self.tag = tag
+
+    def save_model(self, path):
+        Path(path).write_text(self.tag)
+
+
+@pytest.fixture
+def root(tmp_path):
+    registry._bundle.cache_clear()
+    yield tmp_path / 'registry'
+    registry._bundle.cache_clear()
+
+
+def test_versions_numbered_in_order(root):
+    assert register_models({'target_col': 'crash'}, xgboost=FakeXGBoost('a'), root=root) == 'v0001'
+    assert register_models({'target_col': 'crash'}, xgboost=FakeXGBoost('b'), root=root) == 'v0002'
+
+    # A directory being written (no metadata yet) is skipped by readers but never reused
+    (root / 'v0007').mkdir()
+    assert register_models({}, xgboost=FakeXGBoost('c'), root=root) == 'v0008'
+    assert list_versions(root) == ['v0001', 'v0002', 'v0008']
+
+
+def test_metadata_records_lineage(root):
+    register_models({'feature_cols': ['f0']}, xgboost=FakeXGBoost('a'), root=root)
+    register_models({'feature_cols': ['f0']}, scaler={'mean': np.zeros(3)}, root=root)
+
+    metadata = load_metadata(root=root)
+    assert metadata['version'] == 'v0002' and metadata['parent'] == 'v0001'
+    assert metadata['artifacts'] == ['scaler', 'xgboost']
+    # Artifacts not passed are carried over from the parent
+    assert (root / 'v0002' / ARTIFACT_FILES['xgboost']).read_text() == 'a'
+
+
+def test_active_pointer_switch_and_rollback(root):
+    assert active_version(root) is None
+    register_models({}, xgboost=FakeXGBoost('a'), root=root)
+    register_models({}, xgboost=FakeXGBoost('b'), root=root)
+    assert active_version(root) == 'v0002'
+
+    set_active('v0001', root)
+    assert active_version(root) == 'v0001'
+    assert get_models(root=root).version == 'v0001'
+
+    register_models({}, xgboost=FakeXGBoost('c'), activate=False, root=root)
+    assert active_version(root) == 'v0001'
+
+    with pytest.raises(ValueError):
+        set_active('v0099', root)
+    assert active_version(root) == 'v0001'
+
+
+def test_bundle_shared_until_active_changes(root):
+    register_models({}, scaler={'mean': np.arange(3.0)}, root=root)
+    first = get_models(root=root)
+    assert get_models(root=root) is first
+    assert first.scaler is first.scaler     # loaded once, then kept
+
+    register_models({}, scaler={'mean': np.ones(3)}, root=root)
+    second = get_models(root=root)
+    assert second is not first and second.version == 'v0002'
+    assert second.scaler['mean'].tolist() == [1.0, 1.0, 1.0]
+
+    # Rolling back returns the bundle already loaded for that version
+    set_active('v0001', root)
+    assert get_models(root=root) is first
+    assert get_models('v0002', root=root) is second
+
+
+def test_empty_registry_uses_legacy_files(root):
+    bundle = get_models(root=root)
+
+    assert bundle.version is None
+    assert bundle.path('scaler') == registry.LEGACY_FILES['scaler']
+    assert bundle.metadata == {}
@@ -0,0 +1,104 @@
+# tests/test_stage_cache.py - When a pipeline stage's previous outputs can be reused
+
+import importlib
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import stage_cache
+
+
+def _stage(tmp_path):
+    output = tmp_path / 'events.parquet'
+    output.write_bytes(b'events')
+    cache = tmp_path / '_stage_cache.json'
+    digest = stage_cache.fingerprint({'stage': 'EVENTS', 'inputs': {'year': 2025}})
+    stage_cache.record('EVENTS', digest, [output], path=cache)
+    return output, cache, digest
+
+
+def test_unchanged_stage_is_current(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+
+    assert stage_cache.is_current('EVENTS', digest, [output], path=cache)
+
+
+def test_never_recorded_is_not_current(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+
+    assert not stage_cache.is_current('TRAIN', digest, [output], path=cache)
+    assert not stage_cache.is_current('EVENTS', digest, [output], path=tmp_path / 'missing.json')
+
+
+def test_changed_inputs_are_not_current(tmp_path):
+    output, cache, _ = _stage(tmp_path)
+    digest = stage_cache.fingerprint({'stage': 'EVENTS', 'inputs': {'year': 2026}})
+
+    assert not stage_cache.is_current('EVENTS', digest, [output], path=cache)
+
+
+def test_deleted_output_is_not_current(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+    output.unlink()
+
+    assert not stage_cache.is_current('EVENTS', digest, [output], path=cache)
+
+
+def test_rewritten_output_is_not_current(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+    stat = output.stat()
+    output.write_bytes(b'other events')
+    os.utime(output, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert not stage_cache.is_current('EVENTS', digest, [output], path=cache)
+
+
+def test_new_output_is_not_current(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+    extra = tmp_path / 'events.csv'
+    extra.write_text('date,event\n')
+
+    assert not stage_cache.is_current('EVENTS', digest, [output, extra], path=cache)
+
+
+def test_unreadable_cache_is_a_miss(tmp_path):
+    output, cache, digest = _stage(tmp_path)
+    cache.write_text('{not json')
+
+    assert not stage_cache.is_current('EVENTS', digest, [output], path=cache)
+
+
+def test_fingerprint_ignores_key_order():
+    assert stage_cache.fingerprint({'a': 1, 'b': [2]}) == stage_cache.fingerprint({'b': [2], 'a': 1})
+
+
+def _project(tmp_path, monkeypatch):
+    """entry.run -> pkg.a -> pkg.b (plus stdlib and third-party imports that are ignored)"""
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / '__init__.py').write_text('')
+    (tmp_path / 'pkg' / 'a.py').write_text('import json\nfrom pkg import b\n')
+    (tmp_path / 'pkg' / 'b.py').write_text('import numpy as np\nVALUE = 1\n')
+    (tmp_path / 'pkg' / 'unused.py').write_text('')
+    (tmp_path / 'entry.py').write_text('def run():\n    from pkg.a import json\n    return json\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop('entry', None)
+    return importlib.import_module('entry').run
+
+
+def test_code_sources_follow_imports(tmp_path, monkeypatch):
+    run = _project(tmp_path, monkeypatch)
+
+    assert sorted(stage_cache.code_sources(run, tmp_path)) == [
+        'entry.run', 'pkg/__init__.py', 'pkg/a.py', 'pkg/b.py']
+
+
+def test_code_sources_change_with_an_imported_file(tmp_path, monkeypatch):
+    run = _project(tmp_path, monkeypatch)
+    before = stage_cache.code_sources(run, tmp_path)
+    (tmp_path / 'pkg' / 'b.py').write_text('import numpy as np\nVALUE = 2\n')
+    after = stage_cache.code_sources(run, tmp_path)
+
+    assert after['pkg/b.py'] != before['pkg/b.py']
+    assert after['pkg/a.py'] == before['pkg/a.py']
@@ -0,0 +1,72 @@
+# tests/test_tf_dataset.py - Streaming LSTM windows match the in-memory sliding windows
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip('tensorflow')
+
+from sklearn.preprocessing import StandardScaler
+
+from ml.tf_dataset import feature_store_window_dataset, window_dataset
+from ml.windowing import sliding_windows, window_targets
+
+TIMESTEPS = 5
+
+
+def _collect(dataset):
+    batches = list(dataset.as_numpy_iterator())
+    return np.concatenate([b[0] for b in batches]), np.concatenate([b[1] for b in batches])
+
+
+def _matrix(n=47, features=3):
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(n, features)).astype(np.float32), (rng.random(n) > 0.5).astype(np.float32)
+
+
+def test_window_dataset_matches_sliding_windows():
+    X, y = _matrix()
+    windows, targets = _collect(window_dataset(X, y, TIMESTEPS, batch_size=8))
+
+    np.testing.assert_array_equal(windows, sliding_windows(X, TIMESTEPS))
+    np.testing.assert_array_equal(targets, window_targets(y, TIMESTEPS))
+
+
+def test_window_dataset_for_inference():
+    X, _ = _matrix()
+    windows = np.concatenate(list(window_dataset(X, None, TIMESTEPS, batch_size=8).as_numpy_iterator()))
+
+    np.testing.assert_array_equal(windows, sliding_windows(X, TIMESTEPS))
+
+
+def test_block_shuffle_keeps_windows_inside_blocks():
+    X, y = _matrix()
+    windows, targets = _collect(window_dataset(X, y, TIMESTEPS, batch_size=8, shuffle_block=10))
+    expected = sliding_windows(X, TIMESTEPS)
+
+    starts = [int(np.flatnonzero((expected == w).all(axis=(1, 2)))[0]) for w in windows]
+    assert sorted(starts) == list(range(len(expected)))
+    assert all(start // 10 == i // 10 for i, start in enumerate(starts))
+    np.testing.assert_array_equal(targets, window_targets(y, TIMESTEPS)[starts])
+
+
+def test_chunked_windows_match_in_memory_windows():
+    X, y = _matrix()
+    X[[3, 20, 21], 1] = np.nan     # gaps at and after a chunk boundary are forward-filled
+    df = pd.DataFrame(X, columns=['f0', 'f1', 'f2']).assign(target=y)
+    feature_cols = ['f0', 'f1', 'f2']
+    filled = df[feature_cols].ffill().fillna(0).values
+    scaler = StandardScaler().fit(filled)
+
+    chunks = lambda: (df.iloc[start:start + 20] for start in range(0, len(df), 20))
+    windows, targets = _collect(feature_store_window_dataset(chunks, feature_cols, 'target', scaler,
+                                                             TIMESTEPS, batch_size=8))
+
+    expected = sliding_windows(scaler.transform(filled).astype(np.float32), TIMESTEPS)
+    np.testing.assert_allclose(windows, expected, rtol=1e-6)
+    np.testing.assert_array_equal(targets, window_targets(y, TIMESTEPS))
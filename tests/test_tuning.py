@@ -0,0 +1,35 @@
+# tests/test_tuning.py - Successive-halving budgets and trial scoring
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.tuning import rung_budgets, trial_score
+
+
+def test_budgets_grow_by_eta():
+    assert rung_budgets(50, 450) == [50, 150, 450]
+
+
+def test_budgets_stop_below_max():
+    assert rung_budgets(50, 400) == [50, 150]
+    assert rung_budgets(10, 100, eta=2) == [10, 20, 40, 80]
+
+
+def test_single_rung_when_min_is_max():
+    assert rung_budgets(100, 100) == [100]
+
+
+def test_score_is_mean_log_loss():
+    results = [{'log_loss': 0.6, 'accuracy': 0.6}, {'log_loss': 0.7, 'accuracy': 0.5}]
+
+    assert trial_score(results) == pytest.approx(0.65)
+
+
+def test_single_class_fold_scored_by_error_rate():
+    results = [{'log_loss': 0.6, 'accuracy': 0.6}, {'accuracy': 0.8}]
+
+    assert trial_score(results) == pytest.approx(0.4)
@@ -0,0 +1,45 @@
+# tests/test_walk_forward.py - Walk-forward fold boundaries
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.walk_forward import walk_forward_folds
+
+
+def test_expanding_folds_start_at_zero():
+    folds = walk_forward_folds(120, n_folds=5)
+
+    assert len(folds) == 5
+    assert all(train_start == 0 for train_start, _, _, _ in folds)
+    assert [train_end for _, train_end, _, _ in folds] == [20, 40, 60, 80, 100]
+
+
+def test_test_windows_follow_training_without_overlap():
+    folds = walk_forward_folds(120, n_folds=4, test_size=10)
+
+    for train_start, train_end, test_start, test_end in folds:
+        assert train_end == test_start
+        assert test_end - test_start == 10
+    assert folds[-1][3] == 120
+
+
+def test_rolling_folds_keep_a_fixed_window():
+    folds = walk_forward_folds(120, n_folds=5, mode='rolling')
+
+    assert all(train_end - train_start == 20 for train_start, train_end, _, _ in folds)
+    assert [train_start for train_start, _, _, _ in folds] == [0, 20, 40, 60, 80]
+
+
+def test_rolling_window_size_can_be_set():
+    folds = walk_forward_folds(120, n_folds=5, mode='rolling', max_train_size=15)
+
+    assert all(train_end - train_start == 15 for train_start, train_end, _, _ in folds)
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        walk_forward_folds(120, mode='anchored')
@@ -0,0 +1,50 @@
+# tests/test_windowing.py - Alignment of LSTM windows and their targets
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ml.windowing import sliding_windows, window_targets
+
+
+def test_windows_match_the_loop():
+    X = np.arange(30, dtype=float).reshape(10, 3)
+    y = np.arange(10)
+    timesteps = 4
+
+    expected_X = np.array([X[i - timesteps:i] for i in range(timesteps, len(X))])
+    expected_y = np.array([y[i] for i in range(timesteps, len(X))])
+
+    np.testing.assert_array_equal(sliding_windows(X, timesteps), expected_X)
+    np.testing.assert_array_equal(window_targets(y, timesteps), expected_y)
+
+
+def test_windows_and_targets_have_the_same_length():
+    X = np.zeros((25, 2))
+    windows = sliding_windows(X, 5)
+
+    assert windows.shape == (20, 5, 2)
+    assert len(window_targets(np.zeros(25), 5)) == len(windows)
+
+
+def test_windows_are_views():
+    X = np.zeros((10, 2))
+    windows = sliding_windows(X, 3)
+
+    assert np.shares_memory(windows, X)
+    assert not windows.flags.writeable
+
+
+def test_too_short_gives_no_windows():
+    windows = sliding_windows(np.zeros((3, 2)), 3)
+
+    assert windows.shape == (0, 3, 2)
+
+
+def test_one_dimensional_input_rejected():
+    with pytest.raises(ValueError):
+        sliding_windows(np.zeros(10), 3)
@@ -0,0 +1,102 @@
+# tests/test_xgb_training.py - Training matrices and out-of-core XGBoost fits from the feature store
+
+import sys
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import feature_store
+from utils import partitioned_store
+from ml import xgb_training
+from ml.xgb_training import (DEFAULT_TARGET, external_dmatrix, fit_booster, load_cached_symbols,
+                             matrix_key, quantized_dmatrix, training_matrix)
+
+FEATURE_COLS = ['f0', 'f1', 'f2', 'f3']
+
+
+def _features(days: int = 300) -> pd.DataFrame:
+    """Two symbols over two calendar years, with gaps to forward-fill"""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2023-09-01', periods=days)
+    frames = []
+    for symbol in ['DJIA', 'GOLD']:
+        df = pd.DataFrame(rng.normal(size=(days, len(FEATURE_COLS))), columns=FEATURE_COLS)
+        df.loc[rng.random(days) < 0.1, 'f1'] = np.nan
+        df[DEFAULT_TARGET] = (df['f0'] + rng.normal(0, 0.5, days) > 0).astype(float)
+        frames.append(df.assign(date=dates, symbol=symbol))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Feature store reads pointed at a partitioned store under tmp_path"""
+    root = tmp_path / 'processed'
+    for name in ['dataset_exists', 'load_manifest', 'select_partitions', 'select_partition_files']:
+        monkeypatch.setattr(feature_store, name, partial(getattr(partitioned_store, name), root=root))
+    partitioned_store.write_partitions(_features(), 'features', root=root)
+    return root
+
+
+def test_external_memory_fit_matches_in_memory(store, tmp_path):
+    X, y, _, feature_cols, key = training_matrix(root=tmp_path / 'cache')
+    params = {'n_estimators': 20}
+    assert feature_cols == FEATURE_COLS
+
+    in_memory = fit_booster(quantized_dmatrix(X, y, key=key), params)
+    streamed = fit_booster(external_dmatrix(feature_cols, batch_rows=128), params)
+
+    dtest = quantized_dmatrix(X, y)
+    np.testing.assert_allclose(streamed.predict(dtest), in_memory.predict(dtest), atol=1e-6)
+
+
+def test_external_memory_row_range(store, tmp_path):
+    X, y, _, feature_cols, _ = training_matrix(root=tmp_path / 'cache')
+    dtrain = external_dmatrix(feature_cols, row_start=100, row_end=400, batch_rows=64)
+
+    assert dtrain.num_row() == 300
+    np.testing.assert_array_equal(dtrain.get_label(), y[100:400])
+
+
+def test_second_call_is_a_cache_hit(store, tmp_path, monkeypatch):
+    X, y, dates, _, key = training_matrix(root=tmp_path / 'cache')
+    monkeypatch.setattr(xgb_training, 'read_model_frame', None)     # a miss would fail
+
+    cached_X, cached_y, cached_dates, feature_cols, cached_key = training_matrix(root=tmp_path / 'cache')
+
+    assert cached_key == key and feature_cols == FEATURE_COLS
+    assert isinstance(cached_X, np.memmap)
+    np.testing.assert_array_equal(cached_X, X)
+    np.testing.assert_array_equal(cached_y, y)
+    assert set(load_cached_symbols(key, tmp_path / 'cache')) == {'DJIA', 'GOLD'}
+
+
+def test_new_store_version_invalidates(store, tmp_path):
+    cache = tmp_path / 'cache'
+    X, _, _, _, old_key = training_matrix(root=cache)
+
+    more = _features(days=310).groupby('symbol').tail(10)
+    partitioned_store.write_partitions(more, 'features', root=store)
+    new_X, _, _, _, new_key = training_matrix(root=cache)
+
+    assert new_key != old_key
+    assert len(new_X) == len(X) + len(more)
+    assert not (cache / old_key).exists()
+
+
+def test_incomplete_entry_is_rebuilt(store, tmp_path):
+    cache = tmp_path / 'cache'
+    key = matrix_key()
+    # Entry of the older layout: no symbols.npy
+    (cache / key).mkdir(parents=True)
+    (cache / key / 'meta.json').write_text('{"feature_cols": [], "store_version": "old"}')
+
+    X, _, _, feature_cols, returned_key = training_matrix(root=cache)
+
+    assert returned_key == key and feature_cols == FEATURE_COLS
+    assert len(X) == 600
+    assert (cache / key / 'symbols.npy').exists()
@@ -0,0 +1,153 @@
+# utils/artifacts.py - Typed Parquet hand-off between pipeline stages + Arrow IPC publishing
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+from pathlib import Path
+import logging
+import os
+import uuid
+
+from utils.profiling import count_rows_read
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+
+# Artifact name -> file stem in data/processed
+ARTIFACTS = {
+    'planetary_positions': 'planetary_positions',
+    'planetary_events': 'planetary_events_calendar',
+    'predictions_future_90d': 'predictions_future_90d',
+}
+
+DATE_COLUMNS = ['date']
+
+
+def artifact_path(name: str, suffix: str = '.parquet', root=DATA_PROCESSED) -> Path:
+    """Location of an artifact ('.parquet' primary, '.arrow' published, '.csv' side-output)"""
+    return Path(root) / f"{ARTIFACTS[name]}{suffix}"
+
+
+def _with_native_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """Store date columns as timestamps so readers never re-parse strings"""
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df = df.assign(**{col: pd.to_datetime(df[col])})
+    return df
+
+
+def write_artifact(df: pd.DataFrame, name: str, export_csv: bool = False,
+                   publish: bool = True, root=DATA_PROCESSED) -> Path:
+    """
+    Write a stage output as Parquet (atomic rename), optionally with a CSV copy
+
+    Args:
+        df: Stage output
+        name: Artifact name (key of ARTIFACTS)
+        export_csv: Also write the legacy CSV side-output
+        publish: Also publish the memory-mappable Arrow IPC copy for the dashboard
+
+    Returns:
+        Path of the Parquet file
+    """
+    output_path = artifact_path(name, root=root)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    df = _with_native_dates(df)
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, output_path)
+    logger.info(f"✓ Saved to: {output_path}")
+
+    if publish:
+        publish_ipc(df, name, root=root)
+
+    if export_csv:
+        csv_path = artifact_path(name, '.csv', root)
+        df.to_csv(csv_path, index=False)
+        logger.info(f"✓ CSV export: {csv_path}")
+
+    return output_path
+
+
+def read_artifact(name: str, columns=None, root=DATA_PROCESSED) -> pd.DataFrame:
+    """
+    Read a stage output with its native types
+
+    Falls back to parsing a legacy CSV when the Parquet file has not been
+    produced yet (scripts/partition_processed_data.py converts those once).
+
+    Raises:
+        FileNotFoundError: Neither Parquet nor CSV exists
+    """
+    parquet_path = artifact_path(name, root=root)
+    if parquet_path.exists():
+        df = pd.read_parquet(parquet_path, columns=columns)
+        count_rows_read(len(df))
+        return df
+
+    csv_path = artifact_path(name, '.csv', root)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"No artifact found for '{name}' in {Path(root)}")
+
+    df = _with_native_dates(pd.read_csv(csv_path))
+    count_rows_read(len(df))
+    return df[columns] if columns is not None else df
+
+
+def upgrade_legacy_csv(root=DATA_PROCESSED) -> list:
+    """Convert legacy CSV artifacts without a Parquet twin (one-time migration); returns the names converted"""
+    upgraded = []
+    for name in ARTIFACTS:
+        csv_path = artifact_path(name, '.csv', root)
+        if csv_path.exists() and not artifact_path(name, root=root).exists():
+            write_artifact(_with_native_dates(pd.read_csv(csv_path)), name, root=root)
+            upgraded.append(name)
+    return upgraded
+
+
+def publish_ipc(df: pd.DataFrame, name: str, root=DATA_PROCESSED) -> Path:
+    """
+    Publish an uncompressed Arrow IPC file that readers can memory-map
+
+    The file is swapped in with an atomic rename, so processes that already
+    mapped the previous version keep a consistent view until they reopen.
+    """
+    output_path = artifact_path(name, '.arrow', root)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(_with_native_dates(df), preserve_index=False)
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, output_path)
+    logger.info(f"✓ Published: {output_path}")
+
+    return output_path
+
+
+def open_ipc(name: str, root=DATA_PROCESSED) -> pa.Table:
+    """Memory-map a published artifact; buffers live in the shared page cache"""
+    source = pa.memory_map(str(artifact_path(name, '.arrow', root)), 'r')
+    return ipc.open_file(source).read_all()
+
+
+def read_published(name: str, root=DATA_PROCESSED) -> pd.DataFrame:
+    """
+    Read a published artifact zero-copy where the column types allow it
+
+    Numeric and timestamp columns stay views over the mapped file; only
+    string columns are materialized. Falls back to read_artifact when the
+    pipeline has not published an IPC file yet.
+    """
+    if not artifact_path(name, '.arrow', root).exists():
+        return read_artifact(name, root=root)
+
+    # split_blocks avoids consolidating columns into a freshly allocated 2-D block
+    df = open_ipc(name, root).to_pandas(split_blocks=True)
+    count_rows_read(len(df))
+    return df
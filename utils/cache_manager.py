@@ -3,30 +3,36 @@ import streamlit as st
 import pandas as pd
 from pathlib import Path
 
+from services.data_service import get_data_service
+from ml.registry import get_models
+
 def initialize_cache():
     """Initialize caching system"""
     # Clear old cache
     st.cache_data.clear()
     return True
 
-@st.cache_data(ttl=300)  # 5 minutes
+def load_ml_models():
+    """Active model bundle, loaded lazily and shared process-wide (no per-session copies)"""
+    return get_models()
+
 def load_predictions():
-    """Load predictions with caching"""
+    """Load predictions (the data service reloads them when the pipeline republishes)"""
     try:
-        df = pd.read_csv('predictions_future_90d.csv')
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        return get_data_service().predictions()
     except FileNotFoundError:
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)  # 1 minute
 def load_crash_score():
-    """Load crash score with caching"""
+    """Load crash score, cached until the events are republished or the day changes"""
+    from datetime import datetime
+    return _load_crash_score(get_data_service().version('planetary_events'), datetime.now().date())
+
+@st.cache_data(max_entries=8)
+def _load_crash_score(events_version, day):
+    """Crash score for one version of the events calendar"""
     try:
-        # Try to load from CSV if exists
-        import pandas as pd
-        events_df = pd.read_csv('planetary_events_calendar.csv')
-        events_df['date'] = pd.to_datetime(events_df['date'])
+        events_df = get_data_service().events()
         
         from datetime import datetime, timedelta
         today = datetime.now()
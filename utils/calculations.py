@@ -3,12 +3,18 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 
-@st.cache_data(ttl=60)
+from services.data_service import get_data_service
+from services.quote_service import get_quote_service
+
 def get_crash_score():
-    """Calculate crash risk score"""
+    """Crash risk score, recomputed only when the events are republished or the day changes"""
+    return _crash_score(get_data_service().version('planetary_events'), datetime.now().date())
+
+@st.cache_data(max_entries=8)
+def _crash_score(events_version, day):
+    """Calculate crash risk score (cache keyed on the events version and the day)"""
     try:
-        events_df = pd.read_csv('planetary_events_calendar.csv')
-        events_df['date'] = pd.to_datetime(events_df['date'])
+        events_df = get_data_service().events()
         
         today = datetime.now()
         upcoming = events_df[
@@ -36,47 +42,43 @@ def get_crash_score():
     except:
         return 0
 
-@st.cache_data(ttl=300)
 def get_predictions():
-    """Load predictions"""
+    """Load predictions (shared frame from the data service, reloaded when republished)"""
     try:
-        df = pd.read_csv('predictions_future_90d.csv')
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+        return get_data_service().predictions()
     except:
         return pd.DataFrame()
 
-def get_stock_prediction(symbol):
-    """Get prediction for stock"""
+def _signal(crash_score):
+    """(direction, confidence) for a crash score"""
+    if crash_score >= 15:
+        return "SELL", 0.85
+    elif crash_score >= 10:
+        return "HOLD", 0.70
+    return "BUY", 0.75
+
+def get_watchlist_predictions(symbols):
+    """Predictions for many stocks: one batched quote fetch and one crash score for all ({} on failure)"""
     try:
-        import yfinance as yf
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period="30d")
-        
-        if hist.empty:
-            return None
-        
-        current_price = float(hist['Close'].iloc[-1])
-        change_30d = ((current_price - float(hist['Close'].iloc[0])) / float(hist['Close'].iloc[0])) * 100
-        
-        crash_score = get_crash_score()
-        
-        if crash_score >= 15:
-            direction = "SELL"
-            confidence = 0.85
-        elif crash_score >= 10:
-            direction = "HOLD"
-            confidence = 0.70
-        else:
-            direction = "BUY"
-            confidence = 0.75
-        
-        return {
+        quotes = get_quote_service().get_quotes(symbols)
+        direction, confidence = _signal(get_crash_score())
+    except Exception:
+        return {}
+    
+    predictions = {}
+    for symbol, quote in quotes.items():
+        if quote is None:
+            predictions[symbol] = None
+            continue
+        predictions[symbol] = {
             'symbol': symbol,
-            'price': current_price,
-            'change': change_30d,
+            'price': quote['price'],
+            'change': quote['change'],
             'signal': direction,
             'confidence': confidence
         }
-    except:
-        return None
+    return predictions
+
+def get_stock_prediction(symbol):
+    """Get prediction for stock"""
+    return get_watchlist_predictions([symbol]).get(symbol.strip().upper())
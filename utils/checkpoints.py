@@ -0,0 +1,164 @@
+# utils/checkpoints.py - Durable chunk checkpoints for long-running backfills
+
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+import os
+import shutil
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+CHECKPOINT_DIR = PROJECT_ROOT / 'data' / 'checkpoints'
+
+STATE_NAME = '_state.json'
+
+
+def _fsync_replace(tmp_path: Path, path: Path):
+    """Flush a finished temp file to disk, then rename it into place"""
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _chunk_file(key: str) -> str:
+    return f"{key.replace('/', '_').replace(':', '_')}.parquet"
+
+
+class Checkpoint:
+    """
+    Completed chunks of one backfill job, kept on disk until the job finishes
+
+    A chunk counts as done only after its frame has been fsynced and the
+    state file naming it has been swapped in, so a crash at any point leaves
+    either the previous state or the new one, never a half-written chunk.
+    """
+
+    def __init__(self, job: str, root=CHECKPOINT_DIR):
+        self.job = job
+        self.directory = Path(root) / job
+        self.state_file = self.directory / STATE_NAME
+
+    def load_state(self) -> dict:
+        """{'job', 'chunks': {key: {'file', 'rows', 'completed_at'}}} (empty before the first chunk)"""
+        if not self.state_file.exists():
+            return {'job': self.job, 'chunks': {}}
+        with open(self.state_file, 'r') as f:
+            return json.load(f)
+
+    def _save_state(self, state: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_state = self.directory / f".{STATE_NAME}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_state, 'w') as f:
+            json.dump(state, f, indent=2)
+        _fsync_replace(tmp_state, self.state_file)
+
+    def pin_params(self, params: dict) -> dict:
+        """
+        Job parameters (e.g. date bounds), fixed for the whole job
+
+        The first call stores ``params``; while the job is unfinished every
+        later call returns the stored ones, so a rerun on another day
+        resumes the same chunks instead of starting a shifted job.
+        """
+        state = self.load_state()
+        if state.get('params') is None:
+            state['params'] = params
+            self._save_state(state)
+        return state['params']
+
+    def completed(self) -> set:
+        """Keys of the chunks whose files are on disk"""
+        chunks = self.load_state()['chunks']
+        return {key for key, entry in chunks.items() if (self.directory / entry['file']).exists()}
+
+    def save_chunk(self, key: str, df: pd.DataFrame):
+        """Write a chunk durably and mark it complete"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_name = _chunk_file(key)
+        tmp_path = self.directory / f".{file_name}.{uuid.uuid4().hex}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        _fsync_replace(tmp_path, self.directory / file_name)
+
+        state = self.load_state()
+        state['chunks'][key] = {
+            'file': file_name,
+            'rows': int(len(df)),
+            'completed_at': datetime.now().isoformat(),
+        }
+        self._save_state(state)
+
+    def load_chunk(self, key: str) -> pd.DataFrame:
+        return pd.read_parquet(self.directory / self.load_state()['chunks'][key]['file'])
+
+    def clear(self):
+        """Drop the job's checkpoints (after its output has been stored for good)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def job_params(job: str, params: dict, resume: bool = True, root=CHECKPOINT_DIR) -> dict:
+    """Parameters of an interrupted run of ``job`` if there is one (and ``resume``), else ``params``"""
+    checkpoint = Checkpoint(job, root)
+    if not resume:
+        checkpoint.clear()
+    pinned = checkpoint.pin_params(params)
+    if pinned != params:
+        logger.info(f"↻ {job}: resuming with the parameters of the interrupted run: {pinned}")
+    return pinned
+
+
+def run_chunked(job: str, chunks: list, process, resume: bool = True, clear_on_success: bool = True,
+                root=CHECKPOINT_DIR) -> pd.DataFrame:
+    """
+    Run ``process(chunk)`` for every chunk, checkpointing each result
+
+    Chunks completed by an earlier, interrupted run of the same job are read
+    back instead of being processed again, so a failure late in the job only
+    costs the chunk that failed. ``process`` should include any side effect
+    that must happen once per chunk (e.g. a database insert): a chunk is only
+    marked done after it returns.
+
+    Args:
+        job: Job name (checkpoint directory)
+        chunks: Chunk keys in processing order (strings, stable across runs:
+            derive them from job_params, not from the current date)
+        process: chunk key -> DataFrame
+        resume: Reuse completed chunks (False starts over)
+        clear_on_success: Remove the checkpoints once every chunk is done
+
+    Returns:
+        All chunks concatenated in order
+
+    Raises:
+        The first exception raised by ``process``; completed chunks are kept
+    """
+    checkpoint = Checkpoint(job, root)
+    if not resume:
+        checkpoint.clear()
+    done = checkpoint.completed()
+    if done:
+        logger.info(f"↻ {job}: resuming, {len(done & set(chunks))}/{len(chunks)} chunks already complete")
+
+    frames = []
+    for i, key in enumerate(chunks, 1):
+        if key in done:
+            frames.append(checkpoint.load_chunk(key))
+            continue
+        try:
+            df = process(key)
+        except Exception as e:
+            logger.error(f"✗ {job}: chunk {key} failed ({i - 1} of {len(chunks)} complete, "
+                         f"rerun to resume): {e}")
+            raise
+        checkpoint.save_chunk(key, df)
+        frames.append(df)
+        logger.info(f"✓ {job}: chunk {key} done ({i}/{len(chunks)}, {len(df):,} rows)")
+
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if clear_on_success:
+        checkpoint.clear()
+    return result
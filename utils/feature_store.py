@@ -0,0 +1,196 @@
+# utils/feature_store.py - Column-pruned, predicate-pushdown feature reads
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pathlib import Path
+import logging
+
+from utils.partitioned_store import (
+    dataset_exists, load_manifest, select_partitions, select_partition_files, write_partitions
+)
+from utils.profiling import count_rows_read
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+FEATURES_FILE = DATA_PROCESSED / 'features_selected.parquet'
+FEATURES_FULL_FILE = DATA_PROCESSED / 'features_full.parquet'
+FEATURES_DATASET = 'features'
+
+# Small row groups keep min/max statistics tight enough to skip on date/symbol
+ROW_GROUP_SIZE = 2_000
+
+DEFAULT_TARGET = 'djia_fwd_direction_5d'
+TARGET_PREFIXES = ('dxy_fwd', 'djia_fwd', 'gold_fwd')
+METADATA_COLS = ['date', 'symbol']
+
+
+def _feature_sources(start_date=None, end_date=None, symbols=None, path=None):
+    """Partition files for the slice if the partitioned store exists, else the legacy file"""
+    if path is not None:
+        return path
+    if dataset_exists(FEATURES_DATASET):
+        return select_partition_files(FEATURES_DATASET, start_date, end_date, symbols)
+    return FEATURES_FILE
+
+
+def feature_store_version() -> str:
+    """Identifier that changes whenever the stored feature data changes"""
+    if dataset_exists(FEATURES_DATASET):
+        manifest = load_manifest(FEATURES_DATASET)
+        return f"{FEATURES_DATASET}-v{manifest['version']}-{manifest['updated_at']}"
+    stat = FEATURES_FILE.stat()
+    return f"{FEATURES_FILE.name}-{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def feature_schema(path=None) -> pa.Schema:
+    """Read the feature schema from a parquet footer (no data pages)"""
+    sources = _feature_sources(path=path)
+    if isinstance(sources, list):
+        if not sources:
+            raise FileNotFoundError(f"Feature dataset '{FEATURES_DATASET}' has no partitions")
+        sources = sources[0]
+    return pq.read_schema(sources)
+
+
+def select_feature_columns(schema: pa.Schema, target_col: str = DEFAULT_TARGET) -> list:
+    """Numeric model inputs: everything except forward-looking targets and metadata"""
+    return [
+        field.name for field in schema
+        if (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+        and not field.name.startswith(TARGET_PREFIXES)
+        and field.name != target_col
+    ]
+
+
+def build_filter(start_date=None, end_date=None, symbols=None):
+    """Build a dataset filter expression for a date window and symbol set"""
+    expr = None
+
+    def _and(left, right):
+        return right if left is None else left & right
+
+    if start_date is not None:
+        expr = _and(expr, ds.field('date') >= pd.Timestamp(start_date).to_pydatetime())
+    if end_date is not None:
+        expr = _and(expr, ds.field('date') <= pd.Timestamp(end_date).to_pydatetime())
+    if symbols is not None:
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        expr = _and(expr, ds.field('symbol').isin(list(symbols)))
+
+    return expr
+
+
+def read_features(columns=None, start_date=None, end_date=None, symbols=None,
+                  path=None) -> pd.DataFrame:
+    """
+    Read feature rows with column projection and filter pushdown
+
+    Partitions outside the date/symbol range are pruned from the manifest,
+    only the requested columns are decoded, and row groups whose statistics
+    fall outside the filter are skipped without being read.
+
+    Args:
+        columns: Columns to load (None = all)
+        start_date: Inclusive lower date bound
+        end_date: Inclusive upper date bound
+        symbols: Symbol or list of symbols to keep
+        path: Explicit parquet file (default: partitioned store, then legacy file)
+
+    Returns:
+        DataFrame sorted by date
+    """
+    sources = _feature_sources(start_date, end_date, symbols, path)
+    if isinstance(sources, list) and not sources:
+        return pd.DataFrame(columns=columns)
+    dataset = ds.dataset(sources, format='parquet')
+
+    if columns is not None:
+        # Filter columns must not be projected away before sorting
+        columns = list(dict.fromkeys(list(columns) + ['date']))
+
+    table = dataset.to_table(
+        columns=columns,
+        filter=build_filter(start_date, end_date, symbols)
+    )
+    df = table.to_pandas()
+
+    n_files = len(sources) if isinstance(sources, list) else 1
+    logger.info(f"✓ Read {len(df):,} rows × {len(df.columns):,} columns from {n_files} file(s)")
+    count_rows_read(len(df))
+
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def read_model_frame(start_date=None, end_date=None, symbols=None, target_col: str = DEFAULT_TARGET):
+    """Model inputs + target + date/symbol for a window, resolved from the footer and pushed down"""
+    schema = feature_schema()
+    feature_cols = select_feature_columns(schema, target_col)
+    metadata = [col for col in METADATA_COLS if col in schema.names]
+    df = read_features(feature_cols + [target_col] + metadata, start_date, end_date, symbols)
+    return df, feature_cols
+
+
+def write_features(df: pd.DataFrame, path=FEATURES_FILE):
+    """Write features sorted by symbol/date in small row groups for pruning"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    sort_cols = [col for col in ['symbol', 'date'] if col in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols, kind='stable')
+
+    df.to_parquet(path, index=False, row_group_size=ROW_GROUP_SIZE)
+    logger.info(f"✓ Saved {path.name} ({len(df):,} rows)")
+    return path
+
+
+def write_feature_partitions(df: pd.DataFrame, mode: str = 'append') -> dict:
+    """Write features into the year/symbol partitioned store"""
+    return write_partitions(df, FEATURES_DATASET, mode=mode)
+
+
+def iter_feature_chunks(columns=None, start_date=None, end_date=None, symbols=None):
+    """
+    Stream feature rows in date order, one year partition at a time
+
+    Memory is bounded by the largest year rather than the full history. The
+    legacy single-file layout is yielded as one chunk.
+    """
+    if not dataset_exists(FEATURES_DATASET):
+        yield read_features(columns, start_date, end_date, symbols)
+        return
+
+    # Group partition files by year so each chunk can be date-sorted on its own
+    by_year = {}
+    for entry in select_partitions(FEATURES_DATASET, start_date, end_date, symbols):
+        by_year.setdefault(entry['values']['year'], []).append(entry['path'])
+
+    for year in sorted(by_year):
+        yield read_features(columns, start_date, end_date, symbols, path=by_year[year])
+
+
+def forward_filled(chunks, feature_cols: list):
+    """
+    Forward-fill feature columns across a stream of date-ordered chunks
+
+    Each chunk's fill is seeded with the previous chunk's last row, so the
+    result matches ``ffill`` over the concatenated frame. Yields the chunk
+    with its feature columns filled (remaining gaps left as NaN).
+    """
+    last_row = None
+    for df in chunks:
+        if df.empty:
+            continue
+        features = df[feature_cols]
+        if last_row is not None:
+            features = pd.concat([last_row.to_frame().T, features]).ffill().iloc[1:]
+        else:
+            features = features.ffill()
+        last_row = features.iloc[-1]
+        yield df.assign(**{col: features[col].values for col in feature_cols})
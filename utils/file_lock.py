@@ -0,0 +1,65 @@
+# utils/file_lock.py - Cross-process exclusive locks that die with their holder
+
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+import json
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(fd: int) -> bool:
+    """Non-blocking exclusive OS lock on an open file"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(lock_file, timeout: float):
+    """
+    Exclusive lock on ``lock_file`` (flock / msvcrt), waiting up to ``timeout`` seconds
+
+    The OS drops the lock when its holder exits, so a process that crashed
+    never blocks later ones. The file stays in place and records the
+    holder's pid and lock time for diagnostics only.
+
+    Raises:
+        TimeoutError: Still held by another process after ``timeout``
+    """
+    lock_file = Path(lock_file)
+    fd = os.open(lock_file, os.O_CREAT | os.O_RDWR)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_file}")
+            time.sleep(0.05)
+        try:
+            os.ftruncate(fd, 0)
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.write(fd, json.dumps({'pid': os.getpid(), 'locked_at': datetime.now().isoformat()}).encode())
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,241 @@
+# utils/partitioned_store.py - Year/symbol partitioned parquet datasets with a manifest
+
+import pandas as pd
+from pathlib import Path
+from datetime import datetime
+import json
+import logging
+import os
+import time
+import uuid
+
+from utils.file_lock import file_lock
+from utils.profiling import count_rows_read
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+
+MANIFEST_NAME = '_manifest.json'
+LOCK_NAME = '_manifest.lock'
+LOCK_TIMEOUT_SECONDS = 60
+SUPERSEDED_GRACE_SECONDS = 600  # replaced partition files kept for readers of the previous manifest
+
+# Dataset layouts: partition keys and the columns that identify a row
+# (events and forecasts: each stage run appends its snapshot, later runs win per key)
+DATASETS = {
+    'features': {'partition_by': ['year', 'symbol'], 'keys': ['date', 'symbol']},
+    'planetary_positions': {'partition_by': ['year'], 'keys': ['date']},
+    'planetary_events': {'partition_by': ['year'], 'keys': ['date', 'event']},
+    'predictions_future_90d': {'partition_by': ['year'], 'keys': ['date']},
+}
+
+
+def dataset_dir(name: str, root=DATA_PROCESSED) -> Path:
+    """Directory holding a partitioned dataset"""
+    return Path(root) / name
+
+
+def dataset_exists(name: str, root=DATA_PROCESSED) -> bool:
+    """True once a dataset has a committed manifest"""
+    return (dataset_dir(name, root) / MANIFEST_NAME).exists()
+
+
+def load_manifest(name: str, root=DATA_PROCESSED) -> dict:
+    """Load the dataset manifest (empty manifest if nothing was written yet)"""
+    manifest_file = dataset_dir(name, root) / MANIFEST_NAME
+    if not manifest_file.exists():
+        return {
+            'dataset': name,
+            'partition_by': DATASETS[name]['partition_by'],
+            'version': 0,
+            'updated_at': None,
+            'partitions': {}
+        }
+    with open(manifest_file, 'r') as f:
+        return json.load(f)
+
+
+def _atomic_write_json(path: Path, payload: dict):
+    """Write JSON via temp file + rename so readers never see a partial file"""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _manifest_lock(directory: Path):
+    """Writer lock of a dataset (released by the OS if the writer crashes)"""
+    return file_lock(directory / LOCK_NAME, LOCK_TIMEOUT_SECONDS)
+
+
+def _remove_expired(directory: Path, superseded: list, grace_seconds: float) -> list:
+    """Delete superseded files older than the grace period; returns the ones still kept"""
+    now = time.time()
+    kept = []
+    for entry in superseded:
+        if now - entry['superseded_at'] < grace_seconds:
+            kept.append(entry)
+            continue
+        try:
+            (directory / entry['file']).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove superseded partition {entry['file']}: {e}")
+            kept.append(entry)
+    return kept
+
+
+def _partition_values(df: pd.DataFrame, partition_by: list) -> pd.DataFrame:
+    """Derive partition key columns (year comes from the date column)"""
+    keys = pd.DataFrame(index=df.index)
+    for col in partition_by:
+        if col == 'year':
+            keys[col] = pd.to_datetime(df['date']).dt.year.astype(str)
+        else:
+            keys[col] = df[col].astype(str)
+    return keys
+
+
+def _partition_key(partition_by: list, values: tuple) -> str:
+    """Hive-style relative path for one partition, e.g. year=2024/symbol=DJIA"""
+    return '/'.join(f"{col}={val}" for col, val in zip(partition_by, values))
+
+
+def write_partitions(df: pd.DataFrame, name: str, mode: str = 'append', root=DATA_PROCESSED) -> dict:
+    """
+    Write a frame into its partitions and commit a new manifest version
+
+    Only partitions present in ``df`` are touched. In ``append`` mode rows are
+    merged with the existing partition (new rows win on duplicate keys); in
+    ``overwrite`` mode the partition is replaced. Each partition is written to a
+    fresh file and becomes visible only when the manifest is swapped in; the
+    files it replaces are deleted by a later write once SUPERSEDED_GRACE_SECONDS
+    have passed, so readers of the previous manifest can still open them.
+
+    Args:
+        df: Rows to write (must contain a ``date`` column)
+        name: Dataset name (key of DATASETS)
+        mode: 'append' or 'overwrite'
+
+    Returns:
+        Committed manifest
+    """
+    if mode not in ('append', 'overwrite'):
+        raise ValueError(f"Unknown write mode: {mode}")
+    if df.empty:
+        return load_manifest(name, root)
+
+    spec = DATASETS[name]
+    partition_by = spec['partition_by']
+    directory = dataset_dir(name, root)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    df = df.copy()
+    df['date'] = pd.to_datetime(df['date'])
+
+    with _manifest_lock(directory):
+        manifest = load_manifest(name, root)
+        # Files replaced by earlier writes go once no reader can still hold their manifest
+        superseded = _remove_expired(directory, manifest.get('superseded', []), SUPERSEDED_GRACE_SECONDS)
+
+        partition_values = _partition_values(df, partition_by)
+        groups = df.groupby([partition_values[col] for col in partition_by], sort=True)
+
+        for values, part_df in groups:
+            key = _partition_key(partition_by, values)
+            entry = manifest['partitions'].get(key)
+
+            if entry is not None and mode == 'append':
+                existing = pd.read_parquet(directory / entry['file'])
+                part_df = pd.concat([existing, part_df], ignore_index=True)
+                keys = [col for col in spec['keys'] if col in part_df.columns]
+                part_df = part_df.drop_duplicates(subset=keys, keep='last')
+
+            part_df = part_df.sort_values('date', kind='stable')
+
+            part_dir = directory / key
+            part_dir.mkdir(parents=True, exist_ok=True)
+            file_name = f"part-{uuid.uuid4().hex}.parquet"
+            tmp_path = part_dir / f".{file_name}.tmp"
+            part_df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, part_dir / file_name)
+
+            if entry is not None:
+                superseded.append({'file': entry['file'], 'superseded_at': time.time()})
+
+            manifest['partitions'][key] = {
+                'file': f"{key}/{file_name}",
+                'rows': int(len(part_df)),
+                'min_date': part_df['date'].min().isoformat(),
+                'max_date': part_df['date'].max().isoformat(),
+                'values': dict(zip(partition_by, values))
+            }
+
+        manifest['version'] += 1
+        manifest['updated_at'] = datetime.now().isoformat()
+        manifest['superseded'] = superseded
+        _atomic_write_json(directory / MANIFEST_NAME, manifest)
+
+    logger.info(f"✓ Committed {name} v{manifest['version']} ({len(df):,} rows)")
+    return manifest
+
+
+def select_partitions(name: str, start_date=None, end_date=None, symbols=None,
+                      root=DATA_PROCESSED) -> list:
+    """Manifest entries (plus absolute ``path``) overlapping the date range / symbol set"""
+    manifest = load_manifest(name, root)
+    directory = dataset_dir(name, root)
+
+    start = pd.Timestamp(start_date) if start_date is not None else None
+    end = pd.Timestamp(end_date) if end_date is not None else None
+    if isinstance(symbols, str):
+        symbols = [symbols]
+
+    selected = []
+    for key in sorted(manifest['partitions']):
+        entry = manifest['partitions'][key]
+        if start is not None and pd.Timestamp(entry['max_date']) < start:
+            continue
+        if end is not None and pd.Timestamp(entry['min_date']) > end:
+            continue
+        symbol = entry['values'].get('symbol')
+        if symbols is not None and symbol is not None and symbol not in symbols:
+            continue
+        selected.append(dict(entry, path=str(directory / entry['file'])))
+
+    return selected
+
+
+def select_partition_files(name: str, start_date=None, end_date=None, symbols=None,
+                           root=DATA_PROCESSED) -> list:
+    """Partition files overlapping the date range / symbol set (manifest-only pruning)"""
+    return [entry['path'] for entry in select_partitions(name, start_date, end_date, symbols, root)]
+
+
+def read_partitions(name: str, start_date=None, end_date=None, symbols=None,
+                    columns=None, root=DATA_PROCESSED) -> pd.DataFrame:
+    """Read only the partitions overlapping the requested range"""
+    files = select_partition_files(name, start_date, end_date, symbols, root)
+    if columns is not None:
+        columns = list(dict.fromkeys(list(columns) + ['date']))
+    if not files:
+        return pd.DataFrame(columns=columns)
+
+    df = pd.concat([pd.read_parquet(path, columns=columns) for path in files], ignore_index=True)
+    df['date'] = pd.to_datetime(df['date'])
+
+    if start_date is not None:
+        df = df[df['date'] >= pd.Timestamp(start_date)]
+    if end_date is not None:
+        df = df[df['date'] <= pd.Timestamp(end_date)]
+    if symbols is not None and 'symbol' in df.columns:
+        df = df[df['symbol'].isin([symbols] if isinstance(symbols, str) else list(symbols))]
+
+    count_rows_read(len(df))
+    return df.sort_values('date', kind='stable').reset_index(drop=True)
@@ -0,0 +1,173 @@
+# utils/profiling.py - Per-stage resource instrumentation (time, memory, I/O, rows, hot functions)
+
+import pandas as pd
+from pathlib import Path
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import uuid
+
+import psutil
+
+from utils.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+RSS_SAMPLE_SECONDS = 0.05
+HOT_FUNCTIONS = 15          # entries kept from a cProfile run
+HISTORY_LIMIT = 200         # runs kept in the rolling history file
+HISTORY_LOCK_TIMEOUT = 30
+
+# Rows returned by the storage readers in this process (utils.artifacts,
+# utils.partitioned_store, utils.feature_store); stages run one at a time per
+# process, so a before/after difference is that stage's rows in
+_rows_read = 0
+
+
+def count_rows_read(n: int):
+    """Called by the storage readers with the size of every frame they return"""
+    global _rows_read
+    _rows_read += int(n)
+
+
+def rows_of(output):
+    """Row count of a stage output (None when it is not tabular)"""
+    return int(len(output)) if isinstance(output, pd.DataFrame) else None
+
+
+def _io_bytes(process) -> tuple:
+    """(read, written) bytes so far, including page-cache hits where the OS reports them"""
+    try:
+        counters = process.io_counters()
+    except (AttributeError, psutil.Error):
+        return None, None     # not available on macOS
+    return (getattr(counters, 'read_chars', counters.read_bytes),
+            getattr(counters, 'write_chars', counters.write_bytes))
+
+
+def _mb(n_bytes) -> float:
+    return round(n_bytes / 1024**2, 1)
+
+
+class StageProfiler:
+    """
+    Context manager measuring one stage in the current process
+
+    Peak RSS is sampled from a background thread (the OS only keeps a
+    lifetime peak, which a reused pool worker would carry over from earlier
+    stages). With ``profile=True`` the stage also runs under cProfile and
+    the top functions by cumulative time are kept.
+
+    After the block, ``metrics`` holds wall/CPU seconds, RSS at start and
+    peak, rows read, bytes read/written and, when profiled, hot_functions.
+    """
+
+    def __init__(self, profile: bool = False, top: int = HOT_FUNCTIONS):
+        self.profile = profile
+        self.top = top
+        self.metrics = {}
+        self._process = psutil.Process(os.getpid())
+        self._stop = threading.Event()
+
+    def _sample_rss(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            self._peak_rss = max(self._peak_rss, self._process.memory_info().rss)
+
+    def __enter__(self):
+        self._rows_start = _rows_read
+        self._read_start, self._write_start = _io_bytes(self._process)
+        self._rss_start = self._peak_rss = self._process.memory_info().rss
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
+
+        self._profiler = cProfile.Profile() if self.profile else None
+        self._wall_start, self._cpu_start = time.perf_counter(), time.process_time()
+        if self._profiler:
+            self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self._profiler:
+            self._profiler.disable()
+        wall, cpu = time.perf_counter() - self._wall_start, time.process_time() - self._cpu_start
+        self._stop.set()
+        self._sampler.join()
+        self._peak_rss = max(self._peak_rss, self._process.memory_info().rss)
+        read_end, write_end = _io_bytes(self._process)
+
+        self.metrics = {
+            'duration_seconds': round(wall, 3),
+            'cpu_seconds': round(cpu, 3),
+            'rss_start_mb': _mb(self._rss_start),
+            'peak_rss_mb': _mb(self._peak_rss),
+            'rows_in': _rows_read - self._rows_start,
+            'bytes_read': None if read_end is None else read_end - self._read_start,
+            'bytes_written': None if write_end is None else write_end - self._write_start,
+        }
+        if self._profiler:
+            self.metrics['hot_functions'] = hot_functions(self._profiler, self.top)
+        return False
+
+
+def hot_functions(profiler: cProfile.Profile, top: int = HOT_FUNCTIONS) -> list:
+    """Top functions by cumulative time: [{'function', 'calls', 'own_seconds', 'cumulative_seconds'}]"""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{Path(filename).name}:{line}({name})",
+            'calls': calls,
+            'own_seconds': round(own, 4),
+            'cumulative_seconds': round(cumulative, 4),
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:top]
+
+
+def append_history(entry: dict, path, limit: int = HISTORY_LIMIT) -> list:
+    """
+    Append a run to a JSON-lines history, keeping the last ``limit`` runs; returns the earlier runs
+
+    Concurrent runs (a dashboard job and a CLI orchestrate) take turns on a
+    lock file, so neither rewrite drops the other's line.
+    """
+    path = Path(path)
+    with file_lock(path.with_name(f".{path.name}.lock"), HISTORY_LOCK_TIMEOUT):
+        history = []
+        if path.exists():
+            with open(path, 'r') as f:
+                history = [json.loads(line) for line in f if line.strip()]
+        kept = (history + [entry])[-limit:]
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        with open(tmp_path, 'w') as f:
+            f.writelines(json.dumps(run) + '\n' for run in kept)
+        os.replace(tmp_path, path)
+    return history
+
+
+def regressions(stages: dict, history: list, metric: str = 'duration_seconds',
+                factor: float = 1.5, min_runs: int = 3) -> dict:
+    """
+    Stages whose metric exceeds ``factor`` × their median over earlier runs
+
+    Only runs that actually executed the stage (no cache hits) are compared.
+    Returns {stage: {'value', 'median', 'runs'}}.
+    """
+    flagged = {}
+    for name, current in stages.items():
+        if current.get('cache') == 'HIT' or current.get(metric) is None:
+            continue
+        past = [run['stages'][name][metric] for run in history
+                if name in run.get('stages', {}) and run['stages'][name].get('cache') != 'HIT'
+                and run['stages'][name].get(metric) is not None]
+        if len(past) < min_runs:
+            continue
+        median = float(pd.Series(past).median())
+        if median > 0 and current[metric] > factor * median:
+            flagged[name] = {'value': current[metric], 'median': round(median, 3), 'runs': len(past)}
+    return flagged
@@ -0,0 +1,140 @@
+# utils/stage_cache.py - Input fingerprints of pipeline stages and the outputs they produced
+
+from pathlib import Path
+from datetime import datetime
+import ast
+import hashlib
+import inspect
+import json
+import logging
+import os
+import textwrap
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Paths
+PROJECT_ROOT = Path(__file__).parent.parent
+DATA_PROCESSED = PROJECT_ROOT / 'data' / 'processed'
+CACHE_FILE = DATA_PROCESSED / '_stage_cache.json'
+
+
+def file_digest(path) -> str:
+    """sha256 of a file's contents (None if it does not exist)"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def fingerprint(inputs: dict) -> str:
+    """Stable hash of a stage's inputs (any JSON-serializable dict)"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _module_file(module: str, root: Path) -> Path:
+    """Project file of a dotted module name (None for stdlib and third-party modules)"""
+    base = root.joinpath(*module.split('.'))
+    for path in (base.with_suffix('.py'), base / '__init__.py'):
+        if path.is_file():
+            return path
+    return None
+
+
+def _imports(tree: ast.AST, root: Path) -> set:
+    """Project files imported anywhere in a syntax tree (also inside functions)"""
+    files = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            candidates = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            # ``from utils import stage_cache`` imports a module, ``from utils.x import f`` a name
+            candidates = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for module in candidates:
+            # Importing a.b.c also runs the a and a.b package __init__ files
+            parts = module.split('.')
+            for depth in range(1, len(parts) + 1):
+                path = _module_file('.'.join(parts[:depth]), root)
+                if path is not None:
+                    files.add(path)
+    return files
+
+
+def code_sources(func, root=PROJECT_ROOT) -> dict:
+    """
+    Digest of every project file ``func`` runs, found by following imports
+
+    Starts from the imports in the function's own source and walks the
+    project modules they import, transitively, so a stage is invalidated by
+    any code it can reach without keeping a hand-written file list. The
+    function's own source is included under its qualified name.
+    """
+    root = Path(root)
+    source = textwrap.dedent(inspect.getsource(func))
+    digests = {f"{func.__module__}.{func.__qualname__}": hashlib.sha256(source.encode()).hexdigest()}
+
+    pending, seen = _imports(ast.parse(source), root), set()
+    while pending:
+        path = pending.pop()
+        seen.add(path)
+        pending |= _imports(ast.parse(path.read_bytes(), filename=str(path)), root) - seen
+    for path in sorted(seen):
+        digests[path.relative_to(root).as_posix()] = file_digest(path)
+    return digests
+
+
+def _output_stats(outputs) -> dict:
+    """path -> [mtime_ns, size] of the outputs that exist"""
+    stats = {}
+    for path in outputs:
+        path = Path(path)
+        if path.exists():
+            stat = path.stat()
+            stats[str(path)] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def load_cache(path=CACHE_FILE) -> dict:
+    """Stage name -> last successful run entry (empty if nothing was cached yet)"""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"⚠️  Ignoring unreadable stage cache {path.name}: {e}")
+        return {}
+
+
+def is_current(name: str, stage_fingerprint: str, outputs, path=CACHE_FILE) -> bool:
+    """
+    True when the stage last succeeded with the same inputs and its outputs are untouched
+
+    Outputs that were deleted or rewritten since (different mtime/size)
+    invalidate the entry, so a hit always has a matching output on disk.
+    """
+    entry = load_cache(path).get(name)
+    if not entry or entry.get('fingerprint') != stage_fingerprint:
+        return False
+    stats = _output_stats(outputs)
+    return len(stats) == len(outputs) and stats == entry.get('outputs')
+
+
+def record(name: str, stage_fingerprint: str, outputs, path=CACHE_FILE):
+    """Remember a successful run (temp file + rename, readers never see a partial file)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cache = load_cache(path)
+    cache[name] = {
+        'fingerprint': stage_fingerprint,
+        'outputs': _output_stats(outputs),
+        'recorded_at': datetime.now().isoformat(),
+    }
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, path)